@@ -1,3 +1,39 @@
-from .autogen import *
-from .analyze import *
+import importlib
+from typing import Any
 from .models import *
+from . import analyze
+
+# the generation modules are only imported on first use (see `__getattr__`), so that a
+# run where everything is up to date does not load Jinja nor libclang
+_LAZY_ATTRIBUTES: dict[str, str] = {
+    "Autogen": ".autogen",
+    "Watch": ".watch",
+}
+
+__all__ = [
+    "Template",
+    "Binding",
+    "BindingFilter",
+    "Settings",
+    "ParseCacheSettings",
+    "JinjaSettings",
+    *_LAZY_ATTRIBUTES,
+    *analyze.__all__,
+]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+    elif name in analyze.__all__:
+        module = analyze
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -1,9 +1,44 @@
+import threading
 from typing import Any
+from .utils import DependencyScanCache
 
 class Autogen:
     def __init__(
         self,
         tempFolder: str = "temp",
         baseDir: str | None = None,
+        scanCache: DependencyScanCache | None = None,
+        jobs: int | None = None,
         **kwargs: Any,
     ) -> None: ...
+    @classmethod
+    def Load(
+        cls,
+        tempFolder: str = "temp",
+        baseDir: str | None = None,
+        scanCache: DependencyScanCache | None = None,
+        jobs: int | None = None,
+        **kwargs: Any,
+    ) -> "Autogen": ...
+    @property
+    def SettingFile(self) -> str: ...
+    def Reload(self) -> None: ...
+    def Run(self, entryKeys: set[str] | None = None) -> None: ...
+    def FindEntries(self, filePaths: list[str]) -> set[str]: ...
+    def FindStaleEntries(self) -> set[str]: ...
+    def ExplainStaleEntries(
+        self, entryKeys: set[str] | None = None
+    ) -> dict[str, str]: ...
+    def MatchEntries(self, patterns: list[str]) -> set[str]: ...
+
+def Watch(
+    tempFolder: str = "temp",
+    baseDir: str | None = None,
+    scanCache: DependencyScanCache | None = None,
+    jobs: int | None = None,
+    debounce: float = 0.2,
+    pollInterval: float = 1.0,
+    polling: bool = False,
+    stopEvent: threading.Event | None = None,
+    **kwargs: Any,
+) -> None: ...
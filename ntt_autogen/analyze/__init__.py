@@ -1,2 +1,41 @@
-from .parser import *
-from .py_struct import *
+import importlib
+from typing import Any
+
+# the modules load libclang, they are only imported on first use (see `__getattr__`)
+_LAZY_ATTRIBUTES: dict[str, str] = {
+    "Parser": ".parser",
+    "PARSE_OPTIONS": ".parser",
+    "UNITY_FILE_NAME": ".parser",
+    "ParseOptionsFromNames": ".parser",
+    "PyStruct": ".py_struct",
+    "PyEnum": ".py_enum",
+    "PyEnumConstant": ".py_enum_constant",
+    "PyTypedef": ".py_typedef",
+    "PyFunction": ".py_function",
+    "PyField": ".py_field",
+    "PyObject": ".py_object",
+    "ParseCache": ".parse_cache",
+    "PARSE_CACHE_VERSION": ".parse_cache",
+    "PARSE_CACHE_EXTENSION": ".parse_cache",
+    "GetClangVersion": ".parse_cache",
+    "GetSharedIndex": ".precompiled_header",
+    "BuildPrecompiledHeader": ".precompiled_header",
+    "PCH_EXTENSION": ".precompiled_header",
+    "PCH_INCLUDES_EXTENSION": ".precompiled_header",
+    "DeclarationFilter": ".declaration_filter",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_LAZY_ATTRIBUTES])
@@ -0,0 +1,79 @@
+import re
+import clang.cindex as cindex  # type: ignore
+from dataclasses import dataclass, field
+
+
+@dataclass
+class DeclarationFilter:
+    """
+    Selects the top-level declarations which `Parser.Parse` turns into Python objects. The
+        rejected declarations are skipped while walking the translation unit.
+
+    Attributes
+    ----------
+    annotation : str | None
+        Only keep the declarations annotated with `__attribute__((annotate(...)))` of this
+        value. Defaults to None (no requirement).
+
+    mainFileOnly : bool
+        Only keep the declarations of the parsed header itself, not the ones of the headers
+        it includes. Defaults to False.
+
+    namePattern : str | None
+        Only keep the declarations whose whole name matches this regular expression.
+        Defaults to None (any name).
+    """
+
+    annotation: str | None = None
+    mainFileOnly: bool = False
+    namePattern: str | None = None
+    _nameRegex: re.Pattern[str] | None = field(
+        default=None,
+        init=False,
+        repr=False,
+        compare=False,
+    )
+
+    def __post_init__(self) -> None:
+        if self.namePattern is not None:
+            self._nameRegex = re.compile(self.namePattern)
+
+    def Accepts(self, cursor: cindex.Cursor, checkMainFile: bool = True) -> bool:
+        """
+        Check if a top-level declaration passes the filter.
+
+        Arguments
+        ---------
+        cursor : cindex.Cursor
+            The cursor of the declaration.
+        checkMainFile : bool
+            Whether `mainFileOnly` is checked against the main file of the translation unit.
+            `Parser.ParseTogether` attributes the declarations to their headers itself and
+            disables it. Defaults to True.
+
+        Returns
+        -------
+        bool
+            True if the declaration should be kept, False otherwise.
+        """
+
+        if (
+            checkMainFile
+            and self.mainFileOnly
+            and not cindex.conf.lib.clang_Location_isFromMainFile(cursor.location)
+        ):
+            return False
+
+        if self._nameRegex is not None and not self._nameRegex.fullmatch(
+            cursor.spelling
+        ):
+            return False
+
+        if self.annotation is not None:
+            return any(
+                child.kind == cindex.CursorKind.ANNOTATE_ATTR
+                and child.displayname == self.annotation
+                for child in cursor.get_children()
+            )
+
+        return True
@@ -0,0 +1,224 @@
+import os
+import json
+import hashlib
+from typing import Any, TYPE_CHECKING
+from ..utils import logger, HashFile
+
+if TYPE_CHECKING:
+    from .declaration_filter import DeclarationFilter
+
+PARSE_CACHE_VERSION = 1
+PARSE_CACHE_EXTENSION = ".json"
+
+_clangVersion: str | None = None
+
+
+def GetClangVersion() -> str:
+    """
+    Get the version of the loaded libclang library (cached after the first call).
+
+    Returns
+    -------
+    str
+        The libclang version string.
+    """
+    global _clangVersion
+
+    if _clangVersion is None:
+        import clang.cindex as cindex  # type: ignore
+
+        try:
+            getClangVersion = cindex.conf.lib.clang_getClangVersion
+            getClangVersion.restype = cindex._CXString  # type: ignore
+            getClangVersion.errcheck = cindex._CXString.from_result  # type: ignore
+            _clangVersion = str(getClangVersion())
+        except Exception:
+            from importlib import metadata
+
+            _clangVersion = f"libclang {metadata.version('libclang')}"
+
+    return _clangVersion
+
+
+class ParseCache:
+    """
+    Stores the results of `Parser.Parse` on disk so that an unchanged header is not parsed
+        by libclang again.
+
+    An entry is keyed by the header path and content, the clang arguments, options and
+    declaration filter and the libclang version. It also records the hash of every file
+    the translation unit included, and is only used while all of them are unchanged. The
+    least recently used entries are evicted once the cache holds more than `maxEntries`
+    entries or `maxBytes` bytes.
+
+    Arguments
+    ---------
+    folder : str
+        The folder storing the cache entries.
+
+    maxEntries : int, optional
+        The maximum number of entries. Defaults to 64.
+
+    maxBytes : int, optional
+        The maximum total size of the entries in bytes. Defaults to 64 MiB.
+    """
+
+    def __init__(
+        self,
+        folder: str,
+        maxEntries: int = 64,
+        maxBytes: int = 64 * 1024 * 1024,
+    ) -> None:
+        self._folder = folder
+        self._maxEntries = maxEntries
+        self._maxBytes = maxBytes
+
+    def _EntryPath(
+        self,
+        filePath: str,
+        args: list[str],
+        options: int,
+        declarationFilter: "DeclarationFilter | None",
+    ) -> str:
+        key = json.dumps(
+            [
+                os.path.abspath(filePath),
+                HashFile(filePath),
+                args,
+                options,
+                repr(declarationFilter),
+                GetClangVersion(),
+                PARSE_CACHE_VERSION,
+            ]
+        )
+        fileName = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+        return os.path.join(self._folder, fileName + PARSE_CACHE_EXTENSION)
+
+    def Load(
+        self,
+        filePath: str,
+        args: list[str],
+        options: int,
+        declarationFilter: "DeclarationFilter | None" = None,
+    ) -> tuple[dict[str, Any], list[str]] | None:
+        """
+        Get the cached parse result of a header.
+
+        Arguments
+        ---------
+        filePath : str
+            The path to the header file.
+
+        args : list[str]
+            The clang arguments of the parse.
+
+        options : int
+            The libclang options of the parse.
+
+        declarationFilter : DeclarationFilter, optional
+            The declaration filter of the parse.
+
+        Returns
+        -------
+        tuple[dict[str, Any], list[str]] | None
+            The declarations and the includes stored by `Store`, or None if there is no
+            valid entry.
+        """
+
+        entryPath = self._EntryPath(filePath, args, options, declarationFilter)
+
+        try:
+            with open(entryPath, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        for includePath, includeHash in entry["includes"].items():
+            try:
+                if HashFile(includePath) != includeHash:
+                    return None
+            except OSError:
+                return None
+
+        # mark as recently used for the eviction
+        try:
+            os.utime(entryPath)
+        except FileNotFoundError:
+            pass  # evicted by another process, the loaded entry is still valid
+        logger.debug('Using cached parse result of "%s".', filePath)
+        return entry["declarations"], list(entry["includes"])
+
+    def Store(
+        self,
+        filePath: str,
+        args: list[str],
+        options: int,
+        declarationFilter: "DeclarationFilter | None",
+        includes: list[str],
+        declarations: dict[str, Any],
+    ) -> None:
+        """
+        Store the parse result of a header, then evict the least recently used entries.
+
+        Arguments
+        ---------
+        filePath : str
+            The path to the header file.
+
+        args : list[str]
+            The clang arguments of the parse.
+
+        options : int
+            The libclang options of the parse.
+
+        declarationFilter : DeclarationFilter | None
+            The declaration filter of the parse.
+
+        includes : list[str]
+            The paths of all files included (directly or not) by the header.
+
+        declarations : dict[str, Any]
+            The serialized declarations of the parse.
+        """
+
+        entryPath = self._EntryPath(filePath, args, options, declarationFilter)
+        entry = {
+            "includes": {
+                includePath: HashFile(includePath) for includePath in includes
+            },
+            "declarations": declarations,
+        }
+
+        os.makedirs(self._folder, exist_ok=True)
+        # the worker processes of a run may store the same header concurrently
+        tempEntryPath = f"{entryPath}.{os.getpid()}.tmp"
+        with open(tempEntryPath, "w", encoding="utf-8") as f:
+            json.dump(entry, f, separators=(",", ":"))
+        os.replace(tempEntryPath, entryPath)
+
+        self._Evict()
+
+    def _Evict(self) -> None:
+        entries: list[tuple[int, int, str]] = []
+        with os.scandir(self._folder) as folderEntries:
+            for folderEntry in folderEntries:
+                if folderEntry.name.endswith(PARSE_CACHE_EXTENSION):
+                    try:
+                        stat = folderEntry.stat()
+                    except FileNotFoundError:
+                        continue  # evicted by another process meanwhile
+                    entries.append((stat.st_mtime_ns, stat.st_size, folderEntry.path))
+
+        entries.sort()
+        totalBytes = sum(size for _, size, _ in entries)
+
+        while entries and (
+            len(entries) > self._maxEntries or totalBytes > self._maxBytes
+        ):
+            _, size, entryPath = entries.pop(0)
+            totalBytes -= size
+            try:
+                os.remove(entryPath)
+            except OSError:
+                pass
+            logger.debug('Evicted parse cache entry "%s".', entryPath)
@@ -1,8 +1,63 @@
+import os
+import copy
 import clang.cindex as cindex  # type: ignore
+from typing import Any, Mapping
+from .parse_cache import ParseCache
+from .declaration_filter import DeclarationFilter
+from .precompiled_header import GetSharedIndex
 from .py_struct import PyStruct
 from .py_enum import PyEnum
 from .py_typedef import PyTypedef
 from .py_function import PyFunction
+from ..utils import metrics
+
+PARSE_OPTIONS: dict[str, int] = {
+    "skipFunctionBodies": cindex.TranslationUnit.PARSE_SKIP_FUNCTION_BODIES,
+    "incomplete": cindex.TranslationUnit.PARSE_INCOMPLETE,
+    "detailedPreprocessingRecord": cindex.TranslationUnit.PARSE_DETAILED_PROCESSING_RECORD,
+    "keepGoing": 0x200,  # CXTranslationUnit_KeepGoing, not exposed by the bindings
+}
+
+UNITY_FILE_NAME = "__unity__.h"
+
+_DECLARATION_KINDS = frozenset(
+    [
+        cindex.CursorKind.STRUCT_DECL,
+        cindex.CursorKind.ENUM_DECL,
+        cindex.CursorKind.TYPEDEF_DECL,
+        cindex.CursorKind.FUNCTION_DECL,
+    ]
+)
+
+
+def _NormalizePath(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+def ParseOptionsFromNames(names: list[str]) -> int:
+    """
+    Combine named libclang parse options (see `PARSE_OPTIONS`) into the options flags.
+
+    Arguments
+    ---------
+    names : list[str]
+        The option names, e.g. ["skipFunctionBodies", "incomplete"].
+
+    Returns
+    -------
+    int
+        The combined flags, to be passed as `Parser(options=...)`.
+    """
+
+    options = 0
+    for name in names:
+        if name not in PARSE_OPTIONS:
+            raise ValueError(
+                f'Unknown parse option "{name}", expected one of {list(PARSE_OPTIONS)}.'
+            )
+        options |= PARSE_OPTIONS[name]
+
+    return options
 
 
 class Parser:
@@ -15,58 +70,342 @@ class Parser:
         The content of the C header file.
     filePath : str | None
         The path to the C header file.
+    args : list[str] | None
+        The clang arguments. Defaults to `DEFAULT_CLANG_ARGS`.
+    cache : ParseCache | None
+        The cache of the parse results. Only used with `filePath`. Defaults to None.
+    index : cindex.Index | None
+        The clang index to parse with. Defaults to None, in which case a new index is
+        created for this parser. Use `GetSharedIndex()` to share one index between parses.
+    pch : str | None
+        The precompiled header (see `BuildPrecompiledHeader`) included before the header.
+        Defaults to None.
+    options : int | None
+        The libclang parse options (see `ParseOptionsFromNames`). Defaults to
+        `DEFAULT_PARSE_OPTIONS`, which skips the function bodies and the detailed
+        preprocessing record since only the declarations are extracted.
+    declarationFilter : DeclarationFilter | None
+        The filter applied to the top-level declarations before they are turned into Python
+        objects. Defaults to None (keep every declaration).
 
     Notes
     -----
     If both content and filePath are provided, content will be used.
     If neither is provided, raise an exception.
+    The header is only parsed by libclang in `Parse`, which is skipped on a cache hit.
     """
 
+    DEFAULT_CLANG_ARGS = ["-x", "c", "-std=c17"]
+    DEFAULT_PARSE_OPTIONS = (
+        cindex.TranslationUnit.PARSE_SKIP_FUNCTION_BODIES
+        | cindex.TranslationUnit.PARSE_INCOMPLETE
+    )
+
     def __init__(
         self,
         content: str | None = None,
         filePath: str | None = None,
+        args: list[str] | None = None,
+        cache: ParseCache | None = None,
+        index: cindex.Index | None = None,
+        pch: str | None = None,
+        options: int | None = None,
+        declarationFilter: DeclarationFilter | None = None,
     ) -> None:
-        index = cindex.Index.create()
-
-        if content is not None:
-            translationUnit: cindex.TranslationUnit = index.parse(  # type: ignore
-                "tmp.h",
-                args=["-x", "c", "-std=c17"],
-                unsaved_files=[("tmp.h", content)],
-                options=0,
-            )
-        elif filePath is not None:
-            translationUnit = index.parse(
-                filePath,
-                args=["-x", "c", "-std=c17"],
-            )
-        else:
+        if content is None and filePath is None:
             raise ValueError("Either content or filePath must be provided.")
-        self._cursor: cindex.Cursor = translationUnit.cursor
+
+        self._content = content
+        self._filePath = filePath
+        self._args = args if args is not None else Parser.DEFAULT_CLANG_ARGS
+        self._cache = cache if content is None else None
+        self._index = index
+        self._pch = pch
+        self._options = options if options is not None else Parser.DEFAULT_PARSE_OPTIONS
+
+        self._declarationFilter = declarationFilter
+
+        if pch is not None:
+            self._args = [*self._args, "-include-pch", pch]
 
         self._pyStructs: list[PyStruct] = []
         self._pyEnums: list[PyEnum] = []
         self._pyTypedefs: list[PyTypedef] = []
         self._pyFunctions: list[PyFunction] = []
+        self._customTypes: dict[str, str] = {}
+        self._includes: list[str] = []
+
+    def _ParseTranslationUnit(self) -> cindex.TranslationUnit:
+        index = self._index if self._index is not None else cindex.Index.create()
+
+        if self._content is not None:
+            return index.parse(  # type: ignore
+                "tmp.h",
+                args=self._args,
+                unsaved_files=[("tmp.h", self._content)],
+                options=self._options,
+            )
+
+        return index.parse(  # type: ignore
+            self._filePath,
+            args=self._args,
+            options=self._options,
+        )
 
     def Parse(self) -> None:
         """
         The main method of of the parser whereas it extracts the structures from the C header file content.
         """
-        for child in self._cursor.get_children():
-            if child.kind == cindex.CursorKind.STRUCT_DECL:
-                pyStruct = PyStruct(child)
-                self._pyStructs.append(pyStruct)
-            elif child.kind == cindex.CursorKind.ENUM_DECL:
-                pyEnum = PyEnum(child)
-                self._pyEnums.append(pyEnum)
-            elif child.kind == cindex.CursorKind.TYPEDEF_DECL:
-                pyTypedef = PyTypedef(child)
-                self._pyTypedefs.append(pyTypedef)
-            elif child.kind == cindex.CursorKind.FUNCTION_DECL:
-                pyFunction = PyFunction(child)
-                self._pyFunctions.append(pyFunction)
+        if self._LoadFromCache():
+            self._IndexCustomTypes()
+            return
+
+        metrics.Count("parse.runs")
+        translationUnit = self._ParseDeclarations()
+
+        self._IndexCustomTypes()
+        self._CollectIncludes(translationUnit)
+        self._StoreToCache()
+
+    def _ParseDeclarations(self) -> cindex.TranslationUnit:
+        with metrics.Phase("parse", self._filePath):
+            translationUnit = self._ParseTranslationUnit()
+
+            for child in translationUnit.cursor.get_children():
+                kind = child.kind
+                if kind not in _DECLARATION_KINDS:
+                    continue
+
+                if (
+                    self._declarationFilter is not None
+                    and not self._declarationFilter.Accepts(child)
+                ):
+                    continue
+
+                self._AddDeclaration(child, kind)
+
+        return translationUnit
+
+    def LoadComments(self) -> None:
+        """
+        Read the comments of the declarations loaded from the parse cache without them:
+            the header is parsed again, then the cache entry is stored with the comments
+            so that the next runs read them from the cache.
+
+        Notes
+        -----
+        The parse cache only stores the comments which have been read, a header whose
+            comments are never rendered is only parsed once.
+        """
+
+        reparsed = copy.copy(self)
+        reparsed._pyStructs = []
+        reparsed._pyEnums = []
+        reparsed._pyTypedefs = []
+        reparsed._pyFunctions = []
+
+        metrics.Count("parse.commentRuns")
+        reparsed._ParseDeclarations()
+
+        for declarations, reparsedDeclarations in (
+            (self._pyStructs, reparsed._pyStructs),
+            (self._pyEnums, reparsed._pyEnums),
+            (self._pyTypedefs, reparsed._pyTypedefs),
+            (self._pyFunctions, reparsed._pyFunctions),
+        ):
+            for declaration, reparsedDeclaration in zip(
+                declarations, reparsedDeclarations, strict=True
+            ):
+                declaration._CopyComments(reparsedDeclaration)
+
+        self._StoreToCache(comments=True)
+
+    @staticmethod
+    def ParseTogether(parsers: list["Parser"]) -> None:
+        """
+        Parse several header files at once: the headers missing from their parse cache are
+            included by a single unity translation unit, so that the headers they share are
+            only parsed once, then the declarations are split back per header by their source
+            location.
+
+        Arguments
+        ---------
+        parsers : list[Parser]
+            The parsers of the header files, all created with a `filePath`. The clang
+            arguments, index, precompiled header and parse options of the first parser are
+            used for the unity translation unit.
+
+        Notes
+        -----
+        A parser only receives the declarations written in its own header, which is the
+            behaviour of `DeclarationFilter(mainFileOnly=True)`: every parser must have such a
+            filter, so that its parse cache entries match the ones of a standalone parse.
+        The custom types of all the headers are shared between the parsers, so that a
+            header can refer to the types bound by another header of the group.
+        """
+
+        pending: dict[str, Parser] = {}
+        for parser in parsers:
+            assert (
+                parser._filePath is not None
+            ), "Only header files can be parsed together."
+            assert (
+                parser._declarationFilter is not None
+                and parser._declarationFilter.mainFileOnly
+            ), "Headers parsed together must only keep their own declarations."
+
+            if not parser._LoadFromCache():
+                pending[_NormalizePath(parser._filePath)] = parser
+
+        if pending:
+            first = next(iter(pending.values()))
+            unityPath = os.path.join(
+                os.path.dirname(os.path.abspath(first._filePath)),  # type: ignore
+                UNITY_FILE_NAME,
+            )
+            unityContent = "".join(f'#include "{path}"\n' for path in pending)
+
+            index = first._index if first._index is not None else cindex.Index.create()
+            metrics.Count("parse.runs")
+            metrics.Count("parse.unityHeaders", len(pending))
+            with metrics.Phase("parse", unityPath):
+                translationUnit = index.parse(
+                    unityPath,
+                    args=first._args,
+                    unsaved_files=[(unityPath, unityContent)],
+                    options=first._options,
+                )
+
+            currentFileName: str | None = None
+            currentParser: Parser | None = None
+            for child in translationUnit.cursor.get_children():
+                kind = child.kind
+                if kind not in _DECLARATION_KINDS:
+                    continue
+
+                location = child.location.file
+                if location is None:
+                    continue
+
+                # consecutive declarations mostly come from the same file
+                if location.name != currentFileName:
+                    currentFileName = location.name
+                    currentParser = pending.get(_NormalizePath(currentFileName))
+
+                if currentParser is None:
+                    continue
+
+                if not currentParser._declarationFilter.Accepts(  # type: ignore
+                    child, checkMainFile=False
+                ):
+                    continue
+
+                currentParser._AddDeclaration(child, kind)
+
+            # the includes of the whole unit, a superset of the ones of each header
+            for parser in pending.values():
+                parser._CollectIncludes(translationUnit)
+                parser._StoreToCache()
+
+        customTypes: dict[str, str] = {}
+        for parser in parsers:
+            parser._IndexCustomTypes()
+            for name, kind in parser._customTypes.items():
+                customTypes.setdefault(name, kind)
+
+        for parser in parsers:
+            parser._customTypes = customTypes
+
+    def _AddDeclaration(self, cursor: cindex.Cursor, kind: cindex.CursorKind) -> None:
+        if kind == cindex.CursorKind.STRUCT_DECL:
+            pyStruct = PyStruct(cursor)
+            self._pyStructs.append(pyStruct)
+        elif kind == cindex.CursorKind.ENUM_DECL:
+            pyEnum = PyEnum(cursor)
+            self._pyEnums.append(pyEnum)
+        elif kind == cindex.CursorKind.TYPEDEF_DECL:
+            pyTypedef = PyTypedef(cursor)
+            self._pyTypedefs.append(pyTypedef)
+        elif kind == cindex.CursorKind.FUNCTION_DECL:
+            pyFunction = PyFunction(cursor)
+            self._pyFunctions.append(pyFunction)
+
+    def _LoadFromCache(self) -> bool:
+        if self._cache is None:
+            return False
+
+        assert self._filePath is not None
+        cached = self._cache.Load(
+            self._filePath,
+            self._args,
+            self._options,
+            self._declarationFilter,
+        )
+
+        if cached is None:
+            return False
+
+        declarations, self._includes = cached
+        self._LoadDeclarations(declarations)
+        metrics.Count("parse.cacheHits")
+        return True
+
+    def _CollectIncludes(self, translationUnit: cindex.TranslationUnit) -> None:
+        includes = {include.include.name for include in translationUnit.get_includes()}
+        if self._pch is not None:
+            includes.add(self._pch)
+
+        self._includes = sorted(includes)
+
+    def _StoreToCache(self, comments: bool = False) -> None:
+        if self._cache is None:
+            return
+
+        assert self._filePath is not None
+        self._cache.Store(
+            self._filePath,
+            self._args,
+            self._options,
+            self._declarationFilter,
+            self._includes,
+            self._DumpDeclarations(comments),
+        )
+
+    def _IndexCustomTypes(self) -> None:
+        customTypes: dict[str, str] = {}
+        for kind, pyObjects in (
+            ("struct", self._pyStructs),
+            ("enum", self._pyEnums),
+            ("typedef", self._pyTypedefs),
+        ):
+            for pyObject in pyObjects:
+                if "binding" in pyObject.annotations:
+                    customTypes.setdefault(pyObject.name, kind)
+
+        self._customTypes = customTypes
+
+    def _DumpDeclarations(self, comments: bool = True) -> dict[str, Any]:
+        return {
+            "structs": [pyStruct.ToDict(comments) for pyStruct in self._pyStructs],
+            "enums": [pyEnum.ToDict(comments) for pyEnum in self._pyEnums],
+            "typedefs": [pyTypedef.ToDict(comments) for pyTypedef in self._pyTypedefs],
+            "functions": [
+                pyFunction.ToDict(comments) for pyFunction in self._pyFunctions
+            ],
+        }
+
+    def _LoadDeclarations(self, declarations: dict[str, Any]) -> None:
+        # the comments missing from the cache are read by `LoadComments`
+        self._pyStructs = [
+            PyStruct.FromDict(data, self) for data in declarations["structs"]
+        ]
+        self._pyEnums = [PyEnum.FromDict(data, self) for data in declarations["enums"]]
+        self._pyTypedefs = [
+            PyTypedef.FromDict(data, self) for data in declarations["typedefs"]
+        ]
+        self._pyFunctions = [
+            PyFunction.FromDict(data, self) for data in declarations["functions"]
+        ]
 
     @property
     def Structs(self) -> list[PyStruct]:
@@ -116,6 +455,30 @@ class Parser:
         """
         return self._pyFunctions
 
+    @property
+    def CustomTypes(self) -> Mapping[str, str]:
+        """
+        Returns the index of the custom types (annotated with "binding"), built once by `Parse`.
+
+        Returns
+        -------
+        Mapping[str, str]
+            The kind ("struct", "enum" or "typedef") of each custom type, keyed by its name.
+        """
+        return self._customTypes
+
+    @property
+    def Includes(self) -> list[str]:
+        """
+        Returns the files included (directly or not) by the parsed header, found by `Parse`.
+
+        Returns
+        -------
+        list[str]
+            The sorted paths of the included files, with the precompiled header if any.
+        """
+        return self._includes
+
     @property
     def AllCustomTypes(self) -> list[str]:
         """
@@ -126,17 +489,7 @@ class Parser:
         list[str]
             The list of all custom types.
         """
-        customTypes: list[str] = []
-        for struct in self._pyStructs:
-            if "binding" in struct.annotations:
-                customTypes.append(struct.name)
-        for enum in self._pyEnums:
-            if "binding" in enum.annotations:
-                customTypes.append(enum.name)
-        for typedef in self._pyTypedefs:
-            if "binding" in typedef.annotations:
-                customTypes.append(typedef.name)
-        return customTypes
+        return list(self._customTypes)
 
     @staticmethod
     def SetupClangLibraryPath(libPath: str) -> None:
@@ -0,0 +1,113 @@
+import os
+import json
+import hashlib
+import clang.cindex as cindex  # type: ignore
+from ..utils import logger, HashFile
+from .parse_cache import GetClangVersion
+
+PCH_EXTENSION = ".pch"
+PCH_INCLUDES_EXTENSION = ".includes.json"
+
+_sharedIndex: cindex.Index | None = None
+
+
+def GetSharedIndex() -> cindex.Index:
+    """
+    Get the clang index shared by all parses of the process (created on the first call).
+
+    Returns
+    -------
+    cindex.Index
+        The shared index.
+    """
+    global _sharedIndex
+
+    if _sharedIndex is None:
+        _sharedIndex = cindex.Index.create()
+
+    return _sharedIndex
+
+
+def _IsPrecompiledHeaderValid(pchPath: str) -> bool:
+    try:
+        with open(pchPath + PCH_INCLUDES_EXTENSION, "r", encoding="utf-8") as f:
+            includes: dict[str, str] = json.load(f)
+    except (OSError, ValueError):
+        return False
+
+    if not os.path.exists(pchPath):
+        return False
+
+    for includePath, includeHash in includes.items():
+        try:
+            if HashFile(includePath) != includeHash:
+                return False
+        except OSError:
+            return False
+
+    return True
+
+
+def BuildPrecompiledHeader(
+    preludePath: str,
+    folder: str,
+    args: list[str],
+    index: cindex.Index | None = None,
+) -> str:
+    """
+    Build the precompiled header of a prelude header, or reuse the one built by a previous
+        call while the prelude and the files it includes are unchanged.
+
+    Arguments
+    ---------
+    preludePath : str
+        The path to the prelude header.
+
+    folder : str
+        The folder storing the precompiled headers.
+
+    args : list[str]
+        The clang arguments, which must be the same as the ones of the parses using the
+        precompiled header.
+
+    index : cindex.Index, optional
+        The clang index to parse the prelude with. Defaults to the shared index.
+
+    Returns
+    -------
+    str
+        The path to the precompiled header, to be passed with `-include-pch`.
+    """
+
+    key = json.dumps(
+        [os.path.abspath(preludePath), HashFile(preludePath), args, GetClangVersion()]
+    )
+    fileName = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+    pchPath = os.path.join(folder, fileName + PCH_EXTENSION)
+
+    if _IsPrecompiledHeaderValid(pchPath):
+        return pchPath
+
+    logger.debug('Building precompiled header of "%s"...', preludePath)
+    index = index if index is not None else GetSharedIndex()
+    translationUnit = index.parse(
+        preludePath,
+        args=[*args, "-x", "c-header"],
+        options=cindex.TranslationUnit.PARSE_INCOMPLETE,
+    )
+
+    os.makedirs(folder, exist_ok=True)
+    tempPchPath = f"{pchPath}.{os.getpid()}.tmp"
+    translationUnit.save(tempPchPath)
+    os.replace(tempPchPath, pchPath)
+
+    includes = {preludePath: HashFile(preludePath)}
+    for include in translationUnit.get_includes():
+        includes[include.include.name] = HashFile(include.include.name)
+
+    tempIncludesPath = f"{pchPath}{PCH_INCLUDES_EXTENSION}.{os.getpid()}.tmp"
+    with open(tempIncludesPath, "w", encoding="utf-8") as f:
+        json.dump(includes, f)
+    os.replace(tempIncludesPath, pchPath + PCH_INCLUDES_EXTENSION)
+
+    return pchPath
@@ -1,13 +1,32 @@
 import clang.cindex as cindex  # type: ignore
+from typing import Any
 from .py_object import PyObject
 from .py_enum_constant import PyEnumConstant
 
 
 class PyEnum(PyObject):
+    __slots__ = ("constants",)
+
     def __init__(self, cursor: cindex.Cursor):
-        super().__init__(cursor)
         self.constants: list[PyEnumConstant] = []
+        super().__init__(cursor)
+
+    def _VisitChild(self, child: cindex.Cursor) -> None:
+        if child.kind == cindex.CursorKind.ENUM_CONSTANT_DECL:
+            self.constants.append(PyEnumConstant(child))
+
+    def _Children(self) -> list[PyEnumConstant]:
+        return self.constants
+
+    def ToDict(self, comments: bool = True) -> dict[str, Any]:
+        return {
+            **super().ToDict(comments),
+            "constants": [constant.ToDict(comments) for constant in self.constants],
+        }
 
-        for child in cursor.get_children():
-            if child.kind == cindex.CursorKind.ENUM_CONSTANT_DECL:
-                self.constants.append(PyEnumConstant(child))
+    def _LoadDict(self, data: dict[str, Any]) -> None:
+        super()._LoadDict(data)
+        self.constants = [
+            PyEnumConstant.FromDict(constant, self._commentSource)
+            for constant in data["constants"]
+        ]
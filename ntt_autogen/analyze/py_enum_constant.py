@@ -1,8 +1,18 @@
 import clang.cindex as cindex  # type: ignore
+from typing import Any
 from .py_object import PyObject
 
 
 class PyEnumConstant(PyObject):
+    __slots__ = ("value",)
+
     def __init__(self, cursor: cindex.Cursor):
         super().__init__(cursor)
         self.value = cursor.enum_value
+
+    def ToDict(self, comments: bool = True) -> dict[str, Any]:
+        return {**super().ToDict(comments), "value": self.value}
+
+    def _LoadDict(self, data: dict[str, Any]) -> None:
+        super()._LoadDict(data)
+        self.value = data["value"]
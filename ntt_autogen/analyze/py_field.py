@@ -1,8 +1,18 @@
 import clang.cindex as cindex  # type: ignore
+from typing import Any
 from .py_object import PyObject
 
 
 class PyField(PyObject):
+    __slots__ = ("type",)
+
     def __init__(self, cursor: cindex.Cursor):
         super().__init__(cursor)
         self.type = cursor.type.spelling
+
+    def ToDict(self, comments: bool = True) -> dict[str, Any]:
+        return {**super().ToDict(comments), "type": self.type}
+
+    def _LoadDict(self, data: dict[str, Any]) -> None:
+        super()._LoadDict(data)
+        self.type = data["type"]
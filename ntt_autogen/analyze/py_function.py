@@ -1,4 +1,5 @@
 import clang.cindex as cindex  # type: ignore
+from typing import Any
 from .py_object import PyObject
 from .py_field import PyField
 from typing import TypeAlias
@@ -7,11 +8,31 @@ PyArgument: TypeAlias = PyField
 
 
 class PyFunction(PyObject):
+    __slots__ = ("arguments", "returnType")
+
     def __init__(self, cursor: cindex.Cursor):
-        super().__init__(cursor)
         self.arguments: list[PyArgument] = []
+        super().__init__(cursor)
         self.returnType = cursor.result_type.spelling
 
-        for child in cursor.get_children():
-            if child.kind == cindex.CursorKind.PARM_DECL:
-                self.arguments.append(PyArgument(child))
+    def _VisitChild(self, child: cindex.Cursor) -> None:
+        if child.kind == cindex.CursorKind.PARM_DECL:
+            self.arguments.append(PyArgument(child))
+
+    def _Children(self) -> list[PyArgument]:
+        return self.arguments
+
+    def ToDict(self, comments: bool = True) -> dict[str, Any]:
+        return {
+            **super().ToDict(comments),
+            "arguments": [argument.ToDict(comments) for argument in self.arguments],
+            "returnType": self.returnType,
+        }
+
+    def _LoadDict(self, data: dict[str, Any]) -> None:
+        super()._LoadDict(data)
+        self.arguments = [
+            PyArgument.FromDict(argument, self._commentSource)
+            for argument in data["arguments"]
+        ]
+        self.returnType = data["returnType"]
@@ -1,13 +1,155 @@
 import clang.cindex as cindex  # type: ignore
+from typing import Any, ClassVar, Iterable, Self
+
+_NOT_LOADED: Any = object()
 
 
 class PyObject:
+    """
+    The base of the parsed declarations.
+
+    The children of the cursor are walked once: the annotations are collected here and
+    every other child is passed to `_VisitChild`, so the subclasses must initialize their
+    own attributes before calling this constructor. The comments are only read on first
+    access, from a compact copy of the cursor which keeps the translation unit alive until
+    they have been read. The objects loaded from the parse cache without their comments
+    ask their comment source (the `Parser`) to read them, which parses the header again.
+    """
+
+    __slots__ = (
+        "name",
+        "annotations",
+        "_cursorData",
+        "_translationUnit",
+        "_commentSource",
+        "_comment",
+        "_rawComent",
+    )
+
+    # the number of comments read, to find out whether a render depends on them
+    _commentReads: ClassVar[int] = 0
+
     def __init__(self, cursor: cindex.Cursor):
         self.name: str = cursor.spelling
         self.annotations: list[str] = []
-        self.comment: str | None = cursor.brief_comment or None
-        self.rawComent: str | None = cursor.raw_comment or None
+        self._cursorData: bytes | None = bytes(cursor)  # type: ignore
+        self._translationUnit: cindex.TranslationUnit | None = cursor.translation_unit
+        self._commentSource: Any = None
+        self._comment: str | None = _NOT_LOADED
+        self._rawComent: str | None = _NOT_LOADED
+
+        for child in cursor.get_children():
+            if child.kind == cindex.CursorKind.ANNOTATE_ATTR:
+                self.annotations.append(child.displayname)
+            else:
+                self._VisitChild(child)
+
+    def _VisitChild(self, child: cindex.Cursor) -> None:
+        pass
+
+    def _Children(self) -> Iterable["PyObject"]:
+        return ()
+
+    def _LoadComments(self) -> None:
+        if self._cursorData is None:
+            assert (
+                self._commentSource is not None
+            ), f'The comments of "{self.name}" were not serialized.'
+            self._commentSource.LoadComments()
+            return
+
+        cursor = cindex.Cursor.from_buffer_copy(self._cursorData)
+        cursor._tu = self._translationUnit  # type: ignore
+        self._comment = cursor.brief_comment or None
+        self._rawComent = cursor.raw_comment or None
+        self._cursorData = None
+        self._translationUnit = None
+
+    def _CopyComments(self, other: "PyObject") -> None:
+        assert (
+            self.name == other.name
+        ), f'Cannot copy the comments of "{other.name}" to "{self.name}".'
+
+        self._comment = other.comment
+        self._rawComent = other.rawComent
+        for child, otherChild in zip(self._Children(), other._Children(), strict=True):
+            child._CopyComments(otherChild)
+
+    @staticmethod
+    def CommentReads() -> int:
+        """
+        The number of comments read so far, by all the objects.
+        """
+        return PyObject._commentReads
+
+    @property
+    def comment(self) -> str | None:
+        PyObject._commentReads += 1
+        if self._comment is _NOT_LOADED:
+            self._LoadComments()
+        return self._comment
+
+    @comment.setter
+    def comment(self, comment: str | None) -> None:
+        if self._comment is _NOT_LOADED:
+            self._LoadComments()
+        self._comment = comment
+
+    @property
+    def rawComent(self) -> str | None:
+        PyObject._commentReads += 1
+        if self._rawComent is _NOT_LOADED:
+            self._LoadComments()
+        return self._rawComent
+
+    @rawComent.setter
+    def rawComent(self, rawComent: str | None) -> None:
+        if self._rawComent is _NOT_LOADED:
+            self._LoadComments()
+        self._rawComent = rawComent
+
+    def ToDict(self, comments: bool = True) -> dict[str, Any]:
+        """
+        Serialize the object into JSON compatible data (see `FromDict`).
+
+        Arguments
+        ---------
+        comments : bool, optional
+            Whether the comments are serialized, which reads them. Defaults to True.
+        """
+        if not comments:
+            return {"name": self.name, "annotations": self.annotations}
+
+        return {
+            "name": self.name,
+            "annotations": self.annotations,
+            "comment": self.comment,
+            "rawComent": self.rawComent,
+        }
+
+    @classmethod
+    def FromDict(cls, data: dict[str, Any], commentSource: Any = None) -> Self:
+        """
+        Rebuild an object serialized by `ToDict` without any clang cursor.
+
+        Arguments
+        ---------
+        data : dict[str, Any]
+            The serialized object.
+
+        commentSource : Any, optional
+            The object whose `LoadComments` method reads the comments missing from the
+            data. Defaults to None (the comments must be serialized).
+        """
+        pyObject = cls.__new__(cls)
+        pyObject._cursorData = None
+        pyObject._translationUnit = None
+        pyObject._commentSource = commentSource
+        pyObject._LoadDict(data)
+        return pyObject
 
-        for cursor in cursor.get_children():
-            if cursor.kind == cindex.CursorKind.ANNOTATE_ATTR:
-                self.annotations.append(cursor.displayname)
+    def _LoadDict(self, data: dict[str, Any]) -> None:
+        self.name = data["name"]
+        self.annotations = data["annotations"]
+        self._comment = data.get("comment", _NOT_LOADED)
+        self._rawComent = data.get("rawComent", _NOT_LOADED)
@@ -1,16 +1,34 @@
 import clang.cindex as cindex  # type: ignore
+from typing import Any
 from .py_field import PyField
 from .py_object import PyObject
 
 
 class PyStruct(PyObject):
+    __slots__ = ("fields",)
+
     def __init__(self, cursor: cindex.Cursor):
-        super().__init__(cursor)
         self.fields: list[PyField] = []
+        super().__init__(cursor)
+
+    def _VisitChild(self, child: cindex.Cursor) -> None:
+        if child.kind == cindex.CursorKind.FIELD_DECL:
+            self.fields.append(PyField(child))
+
+    def _Children(self) -> list[PyField]:
+        return self.fields
+
+    def ToDict(self, comments: bool = True) -> dict[str, Any]:
+        return {
+            **super().ToDict(comments),
+            "fields": [field.ToDict(comments) for field in self.fields],
+        }
 
-        for child in cursor.get_children():
-            if child.kind == cindex.CursorKind.FIELD_DECL:
-                self.fields.append(PyField(child))
+    def _LoadDict(self, data: dict[str, Any]) -> None:
+        super()._LoadDict(data)
+        self.fields = [
+            PyField.FromDict(field, self._commentSource) for field in data["fields"]
+        ]
 
     def __repr__(self) -> str:
         return f'<PyStruct name="{self.name}" />'
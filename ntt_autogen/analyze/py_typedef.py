@@ -1,11 +1,21 @@
 import clang.cindex as cindex  # type: ignore
+from typing import Any
 from .py_object import PyObject
 
 
 class PyTypedef(PyObject):
+    __slots__ = ("underlyingType",)
+
     def __init__(self, cursor: cindex.Cursor):
         super().__init__(cursor)
         self.underlyingType = cursor.underlying_typedef_type.spelling
 
+    def ToDict(self, comments: bool = True) -> dict[str, Any]:
+        return {**super().ToDict(comments), "underlyingType": self.underlyingType}
+
+    def _LoadDict(self, data: dict[str, Any]) -> None:
+        super()._LoadDict(data)
+        self.underlyingType = data["underlyingType"]
+
     def __repr__(self) -> str:
         return f'<PyTypedef name="{self.name}" underlyingType="{self.underlyingType}">'
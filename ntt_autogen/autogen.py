@@ -1,15 +1,228 @@
 SETTING_FILE = "autogen-settings.json"
+PARSE_CACHE_FOLDER = "parse-cache"
 import os
 import json
-from typing import Any
+import fnmatch
+from typing import Any, Callable, TYPE_CHECKING
+from dataclasses import dataclass
 
-from .binding import GenerateBindings
-from .template_gen import GenerateTemplate
-from .utils import UpdateFileStamp
-from .models import Settings
+from .analyze.parse_cache import ParseCache
+from .binding import (
+    GenerateBindings,
+    BindingGroups,
+    BindingEntryKey,
+    BindingRenderContext,
+)
+from .template_gen import (
+    GenerateTemplate,
+    TemplateEntryKey,
+    TemplateOutputs,
+    TemplateRenderContext,
+)
+from .utils import (
+    logger,
+    ManifestUpdates,
+    StampManifest,
+    DependencyFile,
+    ScanDependencies,
+    DependencyScanCache,
+    OutputWriter,
+    RelativeToBaseDir,
+    metrics,
+    MetricsData,
+    BackgroundLogging,
+    ForegroundLogging,
+    IOPool,
+    RenderContext,
+)
+from .models import Settings, Template, Binding, JinjaSettings
+from .type_mapper import ResetTypeWarnings
 from dataclasses import asdict
 from dacite import from_dict
 
+# Jinja and the worker processes are only set up once an entry is actually generated, a
+# run where everything is up to date only loads the settings and the stamp manifest
+if TYPE_CHECKING:
+    from jinja2 import Environment
+
+# the entries whose outputs may be written in the background at once
+PENDING_WRITES_LIMIT = 64
+
+
+@dataclass
+class _EntryResult:
+    """
+    What a worker process sends back to the parent after generating one entry.
+    """
+
+    stamps: ManifestUpdates
+    writtenOutputs: int
+    unchangedOutputs: int
+
+
+# the Jinja environment of a worker process, created by `_GetWorkerEnvironment`
+_workerEnvironment: "Environment | None" = None
+_workerEnvironmentArgs: tuple[str, str, JinjaSettings] | None = None
+
+
+def _InitializeWorker(
+    baseDir: str, tempFolder: str, settings: JinjaSettings, trace: bool
+) -> None:
+    global _workerEnvironment, _workerEnvironmentArgs
+    _workerEnvironment = None
+    _workerEnvironmentArgs = (baseDir, tempFolder, settings)
+
+    # a forked worker starts with a copy of the parent's metrics
+    metrics.Reset(trace=trace)
+
+
+def _GetWorkerEnvironment() -> "Environment":
+    global _workerEnvironment
+    if _workerEnvironment is None:
+        from .jinja_environment import CreateEnvironment
+
+        assert _workerEnvironmentArgs is not None, "The worker is not initialized."
+        _workerEnvironment = CreateEnvironment(*_workerEnvironmentArgs)
+    return _workerEnvironment
+
+
+def _EntryName(entry: Template | Binding) -> str:
+    if isinstance(entry, Template):
+        return f'template "{entry.file}"'
+    return f'binding "{entry.output}"'
+
+
+def _EntryKey(entry: Template | Binding) -> str:
+    if isinstance(entry, Template):
+        return TemplateEntryKey(entry)
+    return BindingEntryKey(entry)
+
+
+def _EntryRenderContext(
+    entry: Template | Binding,
+    kwargs: dict[str, Any],
+    typeMap: dict[str, str],
+) -> RenderContext:
+    if isinstance(entry, Template):
+        return TemplateRenderContext(entry, kwargs)
+    return BindingRenderContext(entry, kwargs, typeMap)
+
+
+def _EntryOutputs(entry: Template | Binding) -> list[str]:
+    if isinstance(entry, Template):
+        return TemplateOutputs(entry)
+    return [entry.output]
+
+
+def _IsInDependencies(template: Template | Binding, relativePaths: set[str]) -> bool:
+    if template.dependencies is None or template.extensions is None:
+        return False
+
+    folders = [os.path.normpath(dependency) for dependency in template.dependencies]
+    extensions = tuple(template.extensions)
+    for relativePath in relativePaths:
+        if not relativePath.endswith(extensions):
+            continue
+        for folder in folders:
+            if folder == os.curdir or relativePath.startswith(folder + os.sep):
+                return True
+
+    return False
+
+
+def _GenerateEntry(
+    entry: Template | Binding,
+    baseDir: str,
+    tempFolder: str,
+    scanCache: DependencyScanCache,
+    manifest: StampManifest,
+    parseCache: ParseCache | None,
+    typeMap: dict[str, str],
+    bindingGroups: BindingGroups,
+    environment: "Environment | Callable[[], Environment] | None",
+    outputWriter: OutputWriter,
+    kwargs: dict[str, Any],
+) -> ManifestUpdates:
+    """
+    Generate a single template or binding, used as the task of the worker processes.
+        Returns the stamps recorded for the entry.
+    """
+
+    with metrics.Phase("entry", _EntryKey(entry)):
+        if isinstance(entry, Template):
+            GenerateTemplate(
+                entry,
+                baseDir,
+                tempFolder=tempFolder,
+                scanCache=scanCache,
+                manifest=manifest,
+                environment=environment,
+                returnContent=False,
+                outputWriter=outputWriter,
+                renderData=kwargs,
+            )
+        else:
+            GenerateBindings(
+                entry,
+                baseDir,
+                tempFolder=tempFolder,
+                systemData=kwargs,
+                manifest=manifest,
+                parseCache=parseCache,
+                typeMap=typeMap,
+                bindingGroups=bindingGroups,
+                environment=environment,
+                returnContent=False,
+                outputWriter=outputWriter,
+            )
+
+    return manifest.TakeUpdates()
+
+
+def _GenerateEntries(
+    entries: list[Template | Binding],
+    baseDir: str,
+    tempFolder: str,
+    scanCache: DependencyScanCache,
+    manifest: StampManifest,
+    parseCache: ParseCache | None,
+    typeMap: dict[str, str],
+    bindingGroups: BindingGroups,
+    kwargs: dict[str, Any],
+) -> tuple[list[_EntryResult | Exception], MetricsData]:
+    """
+    Generate several entries in the same worker process (the bindings of a group share
+        one parse), the failure of one entry is returned in place of its result. The
+        metrics of the worker are returned along with the results.
+    """
+
+    results: list[_EntryResult | Exception] = []
+    for entry in entries:
+        # each worker is a process of its own, its outputs are written right away
+        outputWriter = OutputWriter()
+        try:
+            stamps = _GenerateEntry(
+                entry,
+                baseDir,
+                tempFolder,
+                scanCache,
+                manifest,
+                parseCache,
+                typeMap,
+                bindingGroups,
+                _GetWorkerEnvironment,
+                outputWriter,
+                kwargs,
+            )
+            results.append(
+                _EntryResult(stamps, outputWriter.written, outputWriter.unchanged)
+            )
+        except Exception as e:
+            manifest.TakeUpdates()  # drop the stamps of the failed entry
+            results.append(e)
+
+    return results, metrics.Take()
+
 
 class Autogen:
     """
@@ -26,19 +239,92 @@ class Autogen:
         baseDir: str, optional
             The base directory for resolving relative paths. Defaults to None. If None,
             the current working directory is used.
+
+        scanCache: DependencyScanCache, optional
+            The memo of the dependency folder scans. Defaults to None, in which case a new
+            memo is used for this run only. Pass the same instance to several runs to reuse
+            the scans (call `Invalidate` on it whenever the dependency folders change).
+
+        jobs: int, optional
+            The number of worker processes generating the templates and bindings. Defaults
+            to None, in which case the `jobs` value of the settings file is used. With more
+            than one job, the entries are generated in parallel and the stamps are written
+            by this process once all of them have finished.
     """
 
     def __init__(
         self,
         tempFolder: str = "temp",
         baseDir: str | None = None,
+        scanCache: DependencyScanCache | None = None,
+        jobs: int | None = None,
         **kwargs: Any,
+    ) -> None:
+        self._Setup(tempFolder, baseDir, scanCache, jobs, kwargs)
+        self.Run()
+
+    @classmethod
+    def Load(
+        cls,
+        tempFolder: str = "temp",
+        baseDir: str | None = None,
+        scanCache: DependencyScanCache | None = None,
+        jobs: int | None = None,
+        **kwargs: Any,
+    ) -> "Autogen":
+        """
+        Load the settings without generating anything, e.g. to keep the loaded state in
+            memory and call `Run` several times.
+
+        Arguments
+        ---------
+        The same as `Autogen`.
+
+        Returns
+        -------
+        Autogen
+            The loaded instance.
+        """
+
+        autogen = cls.__new__(cls)
+        autogen._Setup(tempFolder, baseDir, scanCache, jobs, kwargs)
+        return autogen
+
+    def _Setup(
+        self,
+        tempFolder: str,
+        baseDir: str | None,
+        scanCache: DependencyScanCache | None,
+        jobs: int | None,
+        kwargs: dict[str, Any],
     ) -> None:
         self._baseDir = baseDir if baseDir else os.getcwd()
         self._tempFolder = tempFolder
+        self._scanCache = scanCache if scanCache is not None else DependencyScanCache()
+        self._requestedJobs = jobs
+        self._kwargs = kwargs
+        self.Reload()
+
+    @property
+    def SettingFile(self) -> str:
+        """
+        Returns the path to the settings file.
+
+        Returns
+        -------
+        str
+            The path to the settings file of the base directory.
+        """
+        return os.path.join(self._baseDir, SETTING_FILE)
+
+    def Reload(self) -> None:
+        """
+        Load the settings file again (it is created if missing), along with the stamp
+            manifest, the caches and the Jinja environment which depend on it.
+        """
 
         # create setting files if not exist
-        settingFile = os.path.join(self._baseDir, SETTING_FILE)
+        settingFile = self.SettingFile
 
         if not os.path.exists(settingFile):
             settings = Settings()
@@ -49,29 +335,544 @@ class Autogen:
             settingFile
         ), f'Setting file "{SETTING_FILE}" does not exist.'
 
-        dependencies: set[str] = set()
-        with open(settingFile, "r", encoding="utf-8") as f:
-            settings = from_dict(data_class=Settings, data=json.load(f))
+        with metrics.Phase("load", settingFile):
+            with open(settingFile, "r", encoding="utf-8") as f:
+                settings = from_dict(data_class=Settings, data=json.load(f))
 
-        for template in settings.templates:
-            _, deps = GenerateTemplate(
-                template,
+            self._settings = settings
+            self._manifest = StampManifest.Load(
                 self._baseDir,
-                tempFolder=self._tempFolder,
-                **kwargs,
+                self._tempFolder,
+                settings.cacheMode,
+            )
+
+        self._parseCache: ParseCache | None = None
+        if settings.parseCache.enabled:
+            self._parseCache = ParseCache(
+                os.path.join(self._baseDir, self._tempFolder, PARSE_CACHE_FOLDER),
+                maxEntries=settings.parseCache.maxEntries,
+                maxBytes=settings.parseCache.maxBytes,
+            )
+
+        self._typeMap = settings.typeMap
+        self._jinjaSettings = settings.jinja
+        self._environment: "Environment | None" = None
+
+        self._jobs = (
+            self._requestedJobs if self._requestedJobs is not None else settings.jobs
+        )
+        assert (
+            self._jobs >= 1
+        ), f"The number of jobs must be at least 1, got {self._jobs}."
+        assert (
+            settings.ioWorkers >= 0
+        ), f"The number of I/O workers cannot be negative, got {settings.ioWorkers}."
+
+        self._entries: list[Template | Binding] = [
+            *settings.templates,
+            *settings.bindings,
+        ]
+
+    def Run(self, entryKeys: set[str] | None = None) -> None:
+        """
+        Generate the templates and bindings which are out of date.
+
+        Arguments
+        ---------
+        entryKeys : set[str], optional
+            Only consider the entries of these keys (see `FindEntries`). Defaults to None
+            (all the entries).
+        """
+
+        # the listings of the folders are reused across runs, not the stats of the files
+        self._scanCache.NewRun()
+        scanHits = self._scanCache.hits
+        scanMisses = self._scanCache.misses
+
+        entries = [
+            entry
+            for entry in self._entries
+            if entryKeys is None or _EntryKey(entry) in entryKeys
+        ]
+
+        # the group parses are only shared within a run, the headers may change
+        self._bindingGroups = BindingGroups(self._settings.bindings)
+        self._writtenOutputs = 0
+        self._unchangedOutputs = 0
+        ResetTypeWarnings()
+
+        # the console is written by another thread during the run
+        with BackgroundLogging(), metrics.Phase("run"):
+            ioPool = (
+                IOPool(self._settings.ioWorkers)
+                if self._settings.ioWorkers > 0
+                else None
+            )
+            try:
+                if ioPool is not None:
+                    self._PrefetchInputs(entries, ioPool)
+
+                if self._jobs > 1 and len(entries) > 1:
+                    # the worker processes must not be forked while the I/O threads run
+                    if ioPool is not None:
+                        ioPool.Close()
+                        ioPool = None
+                    self._GenerateParallel(
+                        entries, self._manifest, self._jobs, self._kwargs
+                    )
+                else:
+                    self._GenerateSequential(
+                        entries, self._manifest, self._kwargs, ioPool
+                    )
+            finally:
+                if ioPool is not None:
+                    ioPool.Close()
+                self._manifest.ClearPrefetched()
+
+        logger.info(
+            "Dependency scans: {} hit(s), {} miss(es).".format(
+                self._scanCache.hits - scanHits,
+                self._scanCache.misses - scanMisses,
+            )
+        )
+        logger.info(
+            "Outputs: {} written, {} unchanged.".format(
+                self._writtenOutputs,
+                self._unchangedOutputs,
             )
-            for dep in deps:
-                dependencies.add(dep)
+        )
+
+    def FindEntries(self, filePaths: list[str]) -> set[str]:
+        """
+        Find the entries which may be affected by changed files, and forget the scans of
+            the dependency folders holding them.
+
+        Arguments
+        ---------
+        filePaths : list[str]
+            The paths of the created, modified or deleted files (absolute or relative to
+            the base directory).
+
+        Returns
+        -------
+        set[str]
+            The keys of the entries reading one of the files, declaring a dependency
+            folder which holds one of them or writing one of them, plus the entries which
+            have never been generated.
+        """
+
+        relativePaths: set[str] = set()
+        for filePath in filePaths:
+            self._scanCache.Invalidate(os.path.join(self._baseDir, filePath))
+            relativePaths.add(RelativeToBaseDir(filePath, self._baseDir))
+
+        entryKeys = self._manifest.FindEntries(relativePaths)
+
+        for entry in self._entries:
+            entryKey = _EntryKey(entry)
+            if entryKey in entryKeys:
+                continue
+
+            if (
+                not self._manifest.HasEntry(entryKey)
+                or any(
+                    not os.path.exists(os.path.join(self._baseDir, output))
+                    and output in relativePaths
+                    for output in _EntryOutputs(entry)
+                )
+                or (
+                    isinstance(entry, Template)
+                    and _IsInDependencies(entry, relativePaths)
+                )
+            ):
+                entryKeys.add(entryKey)
+
+        return entryKeys
+
+    def FindStaleEntries(self) -> set[str]:
+        """
+        Find the entries whose recorded inputs changed or whose outputs are missing,
+            checking the files themselves instead of relying on change events.
+
+        Returns
+        -------
+        set[str]
+            The keys of the stale entries.
+        """
+
+        return set(self.ExplainStaleEntries())
+
+    def ExplainStaleEntries(self, entryKeys: set[str] | None = None) -> dict[str, str]:
+        """
+        Find the stale entries (see `FindStaleEntries`) along with the reason why each
+            of them would be generated again.
+
+        Arguments
+        ---------
+        entryKeys : set[str], optional
+            Only consider the entries of these keys. Defaults to None (all the entries).
+
+        Returns
+        -------
+        dict[str, str]
+            The reasons of the stale entries by key, in the order of the settings.
+        """
+
+        self._scanCache.Invalidate()
+
+        reasons: dict[str, str] = {}
+        for entry in self._entries:
+            entryKey = _EntryKey(entry)
+            if entryKeys is not None and entryKey not in entryKeys:
+                continue
+
+            declared: list[DependencyFile | str] = []
+            if isinstance(entry, Template):
+                if not os.path.exists(os.path.join(self._baseDir, entry.file)):
+                    continue
 
-        for binding in settings.bindings:
-            _, deps = GenerateBindings(
-                binding,
+                declared.append(entry.file)
+                if entry.dependencies is not None and entry.extensions is not None:
+                    declared.extend(
+                        ScanDependencies(
+                            entry.dependencies,
+                            entry.extensions,
+                            self._baseDir,
+                            self._scanCache,
+                        )
+                    )
+
+            reason = self._manifest.ExplainEntry(
+                entryKey,
+                declared,
+                _EntryRenderContext(entry, self._kwargs, self._typeMap),
+            )
+            if reason is None:
+                for output in _EntryOutputs(entry):
+                    if not os.path.exists(os.path.join(self._baseDir, output)):
+                        reason = f'output "{output}" is missing'
+                        break
+
+            if reason is not None:
+                reasons[entryKey] = reason
+
+        return reasons
+
+    def MatchEntries(self, patterns: list[str]) -> set[str]:
+        """
+        Find the entries matching shell-style patterns (e.g. `*.h.in` or `binding:src/*`).
+
+        Arguments
+        ---------
+        patterns : list[str]
+            The patterns, matched against the key of each entry, the template file and
+            the output files.
+
+        Returns
+        -------
+        set[str]
+            The keys of the entries matching at least one of the patterns.
+        """
+
+        entryKeys: set[str] = set()
+        for entry in self._entries:
+            entryKey = _EntryKey(entry)
+            names = [entryKey, *_EntryOutputs(entry)]
+            if isinstance(entry, Template):
+                names.append(entry.file)
+
+            if any(
+                fnmatch.fnmatchcase(name, pattern)
+                for name in names
+                for pattern in patterns
+            ):
+                entryKeys.add(entryKey)
+
+        return entryKeys
+
+    def _GetEnvironment(self) -> "Environment":
+        # created on the first render and kept until the settings are reloaded
+        if self._environment is None:
+            from .jinja_environment import CreateEnvironment
+
+            self._environment = CreateEnvironment(
                 self._baseDir,
-                tempFolder=self._tempFolder,
-                systemData=kwargs,
+                self._tempFolder,
+                self._jinjaSettings,
             )
-            for dep in deps:
-                dependencies.add(dep)
+        return self._environment
+
+    def _PrefetchInputs(
+        self,
+        entries: list[Template | Binding],
+        ioPool: IOPool,
+    ) -> None:
+        # the outputs written by the run are checked once written, they are not prefetched
+        outputs = {
+            RelativeToBaseDir(output, self._baseDir)
+            for entry in entries
+            for output in _EntryOutputs(entry)
+        }
+
+        inputs: set[str] = set()
+        for entry in entries:
+            inputs.update(self._manifest.GetEntryInputs(_EntryKey(entry)))
+            if isinstance(entry, Template):
+                inputs.add(RelativeToBaseDir(entry.file, self._baseDir))
+
+        self._manifest.Prefetch(inputs.difference(outputs), ioPool)
 
-        for dependency in dependencies:
-            UpdateFileStamp(dependency, self._baseDir, self._tempFolder)
+    def _PrefetchTemplates(
+        self,
+        entries: list[Template | Binding],
+        manifest: StampManifest,
+        ioPool: IOPool,
+    ) -> None:
+        # only the templates of the entries which will likely be generated are read, an up
+        # to date run does not even create the environment
+        outputs = {
+            RelativeToBaseDir(output, self._baseDir)
+            for entry in entries
+            for output in _EntryOutputs(entry)
+        }
+
+        files: list[str] = []
+        for entry in entries:
+            entryKey = _EntryKey(entry)
+            file = entry.file if isinstance(entry, Template) else entry.template
+            if RelativeToBaseDir(file, self._baseDir) in outputs:
+                continue
+
+            if self._IsStale(entry, manifest):
+                files.append(file)
+
+        if files:
+            from .jinja_environment import PrefetchTemplates
+
+            PrefetchTemplates(self._GetEnvironment(), self._baseDir, files, ioPool)
+
+    def _IsStale(self, entry: Template | Binding, manifest: StampManifest) -> bool:
+        entryKey = _EntryKey(entry)
+        return not manifest.HasEntry(entryKey) or manifest.IsEntryModified(
+            entryKey,
+            context=_EntryRenderContext(entry, self._kwargs, self._typeMap),
+        )
+
+    def _ReadsAny(self, entry: Template | Binding, relativePaths: set[str]) -> bool:
+        # the inputs recorded by the last generation, or the declared ones
+        if not relativePaths.isdisjoint(
+            self._manifest.GetEntryInputs(_EntryKey(entry))
+        ):
+            return True
+
+        declared = (
+            [entry.file]
+            if isinstance(entry, Template)
+            else [entry.file, entry.template, entry.prelude]
+        )
+        return any(
+            file is not None and RelativeToBaseDir(file, self._baseDir) in relativePaths
+            for file in declared
+        ) or _IsInDependencies(entry, relativePaths)
+
+    def _FlushWrites(
+        self,
+        pending: list[tuple[Template | Binding, OutputWriter]],
+        manifest: StampManifest,
+        count: int | None = None,
+    ) -> None:
+        # waits for the oldest entries first, so that the outputs are counted, logged and
+        # recorded in the order of the entries
+        error: Exception | None = None
+        while pending and (count is None or count > 0):
+            entry, outputWriter = pending.pop(0)
+            try:
+                outputWriter.Flush()
+            except Exception as e:
+                # the outputs are not all written, the entry is generated again next run
+                manifest.ForgetEntry(_EntryKey(entry))
+                error = error or e
+            self._writtenOutputs += outputWriter.written
+            self._unchangedOutputs += outputWriter.unchanged
+            if count is not None:
+                count -= 1
+
+        if error is not None:
+            raise error
+
+    def _GenerateSequential(
+        self,
+        entries: list[Template | Binding],
+        manifest: StampManifest,
+        kwargs: dict[str, Any],
+        ioPool: IOPool | None = None,
+    ) -> None:
+        # the outputs of an entry are replaced in the I/O pool while the next entries are
+        # rendered, an entry reading one of them waits for it to be written first. A
+        # binding to parse may include any output (e.g. a generated header), so it always
+        # waits for all of them
+        pending: list[tuple[Template | Binding, OutputWriter]] = []
+
+        # the inputs are recorded per entry, the ones of the entries done are kept
+        try:
+            if ioPool is not None:
+                self._PrefetchTemplates(entries, manifest, ioPool)
+
+            for entry in entries:
+                if len(pending) >= PENDING_WRITES_LIMIT:
+                    self._FlushWrites(pending, manifest, 1)
+                if pending and (
+                    (isinstance(entry, Binding) and self._IsStale(entry, manifest))
+                    or self._ReadsAny(
+                        entry,
+                        {
+                            RelativeToBaseDir(output, self._baseDir)
+                            for pendingEntry, _ in pending
+                            for output in _EntryOutputs(pendingEntry)
+                        },
+                    )
+                ):
+                    self._FlushWrites(pending, manifest)
+
+                outputWriter = OutputWriter(ioPool)
+                _GenerateEntry(
+                    entry,
+                    self._baseDir,
+                    self._tempFolder,
+                    self._scanCache,
+                    manifest,
+                    self._parseCache,
+                    self._typeMap,
+                    self._bindingGroups,
+                    self._GetEnvironment,
+                    outputWriter,
+                    kwargs,
+                )
+                pending.append((entry, outputWriter))
+
+            self._FlushWrites(pending, manifest)
+        except BaseException:
+            # the outputs already rendered are still written, the first error is raised
+            try:
+                self._FlushWrites(pending, manifest)
+            except Exception:
+                pass
+            raise
+        finally:
+            if self._environment is not None and ioPool is not None:
+                from .jinja_environment import PrefetchTemplates
+
+                PrefetchTemplates(self._environment, self._baseDir, [], None)
+            manifest.Save()
+
+    def _GenerateParallel(
+        self,
+        entries: list[Template | Binding],
+        manifest: StampManifest,
+        jobs: int,
+        kwargs: dict[str, Any],
+    ) -> None:
+        from concurrent.futures import ProcessPoolExecutor
+
+        # scan once in this process, the workers then get the filled memo
+        for entry in entries:
+            if (
+                isinstance(entry, Template)
+                and entry.dependencies is not None
+                and entry.extensions is not None
+            ):
+                ScanDependencies(
+                    entry.dependencies,
+                    entry.extensions,
+                    self._baseDir,
+                    self._scanCache,
+                )
+
+        # the bindings of a group go to the same worker to be parsed together
+        tasks: list[list[int]] = []
+        groupTasks: dict[str, list[int]] = {}
+        for i, entry in enumerate(entries):
+            if isinstance(entry, Binding) and entry.group is not None:
+                if entry.group in groupTasks:
+                    groupTasks[entry.group].append(i)
+                    continue
+                groupTasks[entry.group] = [i]
+                tasks.append(groupTasks[entry.group])
+            else:
+                tasks.append([i])
+
+        results: list[_EntryResult | None] = [None] * len(entries)
+        failedEntries: list[str] = []
+
+        # the worker processes are forked while no thread writes the console
+        with ForegroundLogging():
+            # each worker compiles the templates once with its own environment
+            with ProcessPoolExecutor(
+                max_workers=min(jobs, len(tasks)),
+                initializer=_InitializeWorker,
+                initargs=(
+                    self._baseDir,
+                    self._tempFolder,
+                    self._jinjaSettings,
+                    metrics.tracing,
+                ),
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        _GenerateEntries,
+                        [entries[i] for i in task],
+                        self._baseDir,
+                        self._tempFolder,
+                        self._scanCache,
+                        manifest,
+                        self._parseCache,
+                        self._typeMap,
+                        self._bindingGroups,
+                        kwargs,
+                    )
+                    for task in tasks
+                ]
+
+                taskResults: list[list[_EntryResult | Exception]] = []
+                for task, future in zip(tasks, futures):
+                    try:
+                        taskResult, workerMetrics = future.result()
+                    except Exception as e:
+                        taskResults.append([e] * len(task))
+                        continue
+
+                    taskResults.append(taskResult)
+                    metrics.Merge(workerMetrics)
+
+        # reported in the order of the entries, whatever the grouping
+        errors: dict[int, Exception] = {}
+        for task, taskResult in zip(tasks, taskResults):
+            for i, result in zip(task, taskResult):
+                if isinstance(result, Exception):
+                    errors[i] = result
+                else:
+                    results[i] = result
+
+        for i, entry in enumerate(entries):
+            if i in errors:
+                logger.error(f"Failed to generate {_EntryName(entry)}: {errors[i]!r}")
+                failedEntries.append(_EntryName(entry))
+
+        # a failed entry has no new record, so it stays stale for its next run
+        for result in results:
+            if result is None:
+                continue
+
+            manifest.Merge(result.stamps)
+            self._writtenOutputs += result.writtenOutputs
+            self._unchangedOutputs += result.unchangedOutputs
+        manifest.Save()
+
+        if failedEntries:
+            raise RuntimeError(
+                "Failed to generate {} entr{}: {}".format(
+                    len(failedEntries),
+                    "y" if len(failedEntries) == 1 else "ies",
+                    ", ".join(failedEntries),
+                )
+            )
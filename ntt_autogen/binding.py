@@ -1,84 +1,40 @@
 import os
-from typing import Any
-from pathlib import Path
-from .analyze import Parser
-from .models import Binding
-from jinja2 import Environment
-from jinja2 import FileSystemLoader
-from .analyze.py_function import PyFunction, PyObject
-from .utils import IsFileModified, logger, AllDependenciesFiles
-
-parser: Parser | None = None
-
-
-def _CTypeConvert(cType: str) -> str:
+from typing import Any, Callable, TYPE_CHECKING
+from functools import partial
+from dataclasses import asdict
+from .models import Binding, BindingFilter
+from .type_mapper import TypeMapper
+from .utils import (
+    logger,
+    StampManifest,
+    OutputWriter,
+    RelativeToBaseDir,
+    metrics,
+    HashFile,
+    Fingerprint,
+    FragmentCache,
+    FRAGMENT_CACHE_FOLDER,
+    RenderContext,
+)
+
+# libclang and Jinja are only imported once a binding is actually generated
+if TYPE_CHECKING:
+    from jinja2 import Environment
+    from .analyze import Parser, ParseCache, PyFunction, PyObject
+
+PCH_FOLDER = "pch"
+
+
+def _RenderFragment(macro: Callable[[Any], Any], declaration: Any) -> Any:
     """
-    Convert a C type to a Python type.
-
-    Arguments
-    ---------
-    cType : str
-        The C type to convert.
-
-    Returns
-    -------
-    str
-        The converted Python type.
+    Render a declaration with a macro, the `fragment` helper of the templates when the
+        fragments are not cached.
     """
 
-    cType = cType.strip()
-
-    if cType.startswith("enum "):
-        cType = cType[5:].strip()
-
-    if cType.startswith("struct "):
-        cType = cType[7:].strip()
-
-    global parser
-    assert parser is not None, "Parser is not initialized."
-
-    if cType in [
-        "unsigned int",
-        "uint32_t",
-        "uint16_t",
-        "uint8_t",
-        "int",
-        "short",
-        "long",
-        "unsigned short",
-        "unsigned long",
-        "int32_t",
-        "int16_t",
-        "int8_t",
-        "long long",
-        "unsigned long long",
-        "int64_t",
-        "uint64_t",
-        "unsigned char",
-        "char",
-        "signed char",
-        "size_t",
-    ]:
-        return "int"
-    elif cType in ["float", "double", "long double", "float32_t", "float64_t"]:
-        return "float"
-    elif cType in [
-        "const char *",
-        "char *",
-    ]:
-        return "str"
-    elif cType == "void":
-        return "None"
-    elif cType in parser.AllCustomTypes:
-        return cType
-    elif cType == "void *":
-        return "Any"
-    else:
-        logger.warning(f'Unknown C type "{cType}", mapping to "Any".')
-        return "Any"
+    return macro(declaration)
 
 
-def _GetFunctionParameters(function: PyFunction) -> str:
+def _GetFunctionParameters(function: "PyFunction", typeMapper: TypeMapper) -> str:
     """
     Get the function parameters as a string.
 
@@ -87,6 +43,9 @@ def _GetFunctionParameters(function: PyFunction) -> str:
     function : PyFunction
         The function to get the parameters from.
 
+    typeMapper : TypeMapper
+        The converter of the C types of the parameters.
+
     Returns
     -------
     str
@@ -95,13 +54,13 @@ def _GetFunctionParameters(function: PyFunction) -> str:
 
     params: list[str] = []
     for argument in function.arguments:
-        paramType = _CTypeConvert(argument.type)
+        paramType = typeMapper.Convert(argument.type)
         params.append(f"{argument.name}: {paramType}")
 
     return ", ".join(params)
 
 
-def _ConvertRawCCommentToPythonDocstring(pyObject: PyObject) -> str:
+def _ConvertRawCCommentToPythonDocstring(pyObject: "PyObject") -> str:
     """
     Convert a raw C comment to a Python docstring.
 
@@ -145,7 +104,7 @@ def _ConvertRawCCommentToPythonDocstring(pyObject: PyObject) -> str:
     return f'\t"""\n\t' + f"\n\t".join(transferredLines) + f'\n\t"""\n'
 
 
-def _ConvertRawCCommentToPythonComment(pyObject: PyObject) -> str:
+def _ConvertRawCCommentToPythonComment(pyObject: "PyObject") -> str:
     """
     Convert a raw C comment to a Python comment.
 
@@ -188,12 +147,212 @@ def _ConvertRawCCommentToPythonComment(pyObject: PyObject) -> str:
     return "\n".join(transferredLines) + "\n"
 
 
+def _CreateParser(
+    binding: Binding,
+    baseDir: str,
+    tempFolder: str,
+    parseCache: "ParseCache | None",
+    testContent: str | None = None,
+    mainFileOnly: bool = False,
+) -> "Parser":
+    from .analyze import (
+        Parser,
+        GetSharedIndex,
+        BuildPrecompiledHeader,
+        ParseOptionsFromNames,
+        DeclarationFilter,
+    )
+
+    clangArgs = (
+        binding.clangArgs
+        if binding.clangArgs is not None
+        else Parser.DEFAULT_CLANG_ARGS
+    )
+    index = GetSharedIndex() if binding.shareIndex else None
+
+    pch: str | None = None
+    if binding.prelude is not None:
+        pch = BuildPrecompiledHeader(
+            os.path.join(baseDir, binding.prelude),
+            os.path.join(baseDir, tempFolder, PCH_FOLDER),
+            clangArgs,
+            index,
+        )
+
+    bindingFilter = binding.filter if binding.filter is not None else BindingFilter()
+    declarationFilter: DeclarationFilter | None = None
+    if binding.filter is not None or mainFileOnly:
+        declarationFilter = DeclarationFilter(
+            annotation=bindingFilter.annotation,
+            mainFileOnly=bindingFilter.mainFileOnly or mainFileOnly,
+            namePattern=bindingFilter.namePattern,
+        )
+
+    return Parser(
+        filePath=os.path.join(baseDir, binding.file),
+        content=testContent,
+        args=clangArgs,
+        cache=parseCache,
+        index=index,
+        pch=pch,
+        options=(
+            ParseOptionsFromNames(binding.parseOptions)
+            if binding.parseOptions is not None
+            else None
+        ),
+        declarationFilter=declarationFilter,
+    )
+
+
+class BindingGroups:
+    """
+    Parses the header files of the bindings sharing the same `group` together (see
+        `Parser.ParseTogether`), the first time one of these bindings is generated.
+
+    Arguments
+    ---------
+    bindings : list[Binding]
+        All the bindings of the run.
+
+    Notes
+    -----
+    The bindings of a group must use the same clang arguments, index sharing, prelude and
+        parse options, since their headers are parsed by a single translation unit.
+    Only the declarations written in the header of a binding are kept for it, as with the
+        `mainFileOnly` filter.
+    """
+
+    def __init__(self, bindings: list[Binding]) -> None:
+        self._groups: dict[str, list[Binding]] = {}
+        for binding in bindings:
+            if binding.group is None:
+                continue
+
+            members = self._groups.setdefault(binding.group, [])
+            if members:
+                first = members[0]
+                assert (
+                    binding.clangArgs == first.clangArgs
+                    and binding.shareIndex == first.shareIndex
+                    and binding.prelude == first.prelude
+                    and binding.parseOptions == first.parseOptions
+                ), f'Binding "{binding.file}" does not use the same parse settings as the other bindings of group "{binding.group}".'
+            members.append(binding)
+
+        self._parsers: dict[str, "Parser"] = {}
+
+    def GetParser(
+        self,
+        binding: Binding,
+        baseDir: str,
+        tempFolder: str,
+        parseCache: "ParseCache | None" = None,
+    ) -> "Parser":
+        """
+        Get the parsed header of a binding, parsing its whole group if needed.
+
+        Arguments
+        ---------
+        binding : Binding
+            The binding, which must have a `group`.
+        baseDir : str
+            The base directory for resolving relative paths.
+        tempFolder : str
+            The temporary folder of the run.
+        parseCache : ParseCache | None
+            The cache of the header parse results. Defaults to None (always parse).
+
+        Returns
+        -------
+        Parser
+            The parser of the binding's header, already parsed.
+        """
+
+        from .analyze import Parser
+
+        assert binding.group is not None
+        if binding.output not in self._parsers:
+            members = self._groups.get(binding.group, [binding])
+            if binding not in members:
+                members = [binding]
+
+            parsers = [
+                _CreateParser(
+                    member, baseDir, tempFolder, parseCache, mainFileOnly=True
+                )
+                for member in members
+            ]
+            Parser.ParseTogether(parsers)
+
+            for member, parser in zip(members, parsers):
+                self._parsers[member.output] = parser
+
+        # handed out once, so the translation units are released with their bindings
+        return self._parsers.pop(binding.output)
+
+
+def BindingEntryKey(binding: Binding) -> str:
+    """
+    Get the key of a binding in the stamp manifest (see `StampManifest.UpdateEntry`).
+
+    Arguments
+    ---------
+    binding : Binding
+        The binding configuration.
+
+    Returns
+    -------
+    str
+        The key of the binding.
+    """
+
+    return f"binding:{binding.output}"
+
+
+def BindingRenderContext(
+    binding: Binding,
+    systemData: dict[str, Any] | None,
+    typeMap: dict[str, str] | None,
+) -> RenderContext:
+    """
+    Get the render context of a binding, whose change makes it stale.
+
+    Arguments
+    ---------
+    binding : Binding
+        The binding configuration.
+
+    systemData : dict[str, Any] | None
+        The additional data passed to the template.
+
+    typeMap : dict[str, str] | None
+        The user-defined mappings from C types to Python types.
+
+    Returns
+    -------
+    RenderContext
+        The settings of the binding and the type map, along with the render data.
+    """
+
+    return RenderContext(
+        {"binding": asdict(binding), "typeMap": typeMap or {}},
+        systemData or {},
+    )
+
+
 def GenerateBindings(
     binding: Binding,
     baseDir: str,
     tempFolder: str,
     testContent: str | None = None,
     systemData: dict[str, Any] | None = None,
+    manifest: StampManifest | None = None,
+    parseCache: "ParseCache | None" = None,
+    typeMap: dict[str, str] | None = None,
+    bindingGroups: "BindingGroups | None" = None,
+    environment: "Environment | Callable[[], Environment] | None" = None,
+    returnContent: bool = True,
+    outputWriter: OutputWriter | None = None,
 ) -> tuple[str, list[str]]:
     """
     The tools creating the binding files.
@@ -209,6 +368,48 @@ def GenerateBindings(
     baseDir: str, optional
         The base directory for resolving relative paths. Defaults to None. If None,
         the current working directory is used.
+
+    manifest: StampManifest, optional
+        The stamp manifest of the run, only updated in memory. Defaults to None, in which
+        case the manifest of the temporary folder is loaded and saved by this call.
+
+    parseCache: ParseCache, optional
+        The cache of the header parse results. Defaults to None (always parse).
+
+    typeMap: dict[str, str], optional
+        The user-defined mappings from C types to Python types used by `cTypeConvert`.
+
+    bindingGroups: BindingGroups, optional
+        The parses of the binding groups of the run. Defaults to None, in which case the
+        header of the binding is parsed alone even if the binding has a `group`.
+
+    environment: Environment | Callable[[], Environment], optional
+        The Jinja environment shared by all entries of a run (see `CreateEnvironment`), or
+        a function returning it, only called if the output has to be rendered. Defaults to
+        None, in which case an environment is created for this call.
+
+    returnContent: bool, optional
+        Whether the generated content is returned. Defaults to True. Without it, the
+        binding is streamed to its output and an empty string is returned, so the whole
+        content is never held in memory.
+
+    outputWriter: OutputWriter, optional
+        The writer of the outputs, which counts the outputs written and left unchanged
+        during a run. Defaults to None, in which case a writer is created for this call.
+
+    Notes
+    -----
+    The binding is regenerated when one of the files read by its last generation changed:
+        the header and all the files it includes (as reported by libclang), the template
+        and the templates it references, and the prelude. The `dependencies` folders of
+        the binding are not needed to track its headers anymore.
+
+    A template can render each declaration through `{{ fragment(macro, declaration) }}`:
+        the fragments are kept in the temporary folder, so that only the declarations
+        which changed are rendered again (see `FragmentCache`).
+
+    The names of the variables given to the templates by the bindings (`structs`,
+        `cTypeConvert`, `fragment`...) cannot be used by the `systemData`.
     """
     baseDir = baseDir if baseDir else os.getcwd()
 
@@ -222,81 +423,137 @@ def GenerateBindings(
             binding.extensions is not None
         ), f'Binding "{binding.file}" has dependencies but no extensions specified.'
 
-    if testContent is None and binding.dependencies is not None:
-        assert binding.extensions is not None
-
-        dependenciesFiles = AllDependenciesFiles(
-            binding.dependencies,
-            binding.extensions,
-            baseDir,
-        )
+    entryKey = BindingEntryKey(binding)
+    context = BindingRenderContext(binding, systemData, typeMap)
+    ownsManifest = False
 
-        logger.debug(
-            'All dependency files for binding "{}": \n{}'.format(
-                binding.file,
-                str(dependenciesFiles)
-                .replace(", ", ",\n\t")
-                .replace("[", "[\n\t")
-                .replace("]", "\n]"),
-            )
-        )
-
-        hasModified = False
+    if testContent is None:
+        ownsManifest = manifest is None
+        if manifest is None:
+            manifest = StampManifest.Load(baseDir, tempFolder)
 
-        for depFile in dependenciesFiles:
-            if IsFileModified(depFile, baseDir, tempFolder):
-                hasModified = True
-                break
+        # the inputs are the files actually read by the last generation, see below
+        with metrics.Phase("stamps", binding.output):
+            isUpToDate = not manifest.IsEntryModified(
+                entryKey, context=context
+            ) and os.path.exists(outputPath)
 
-        if (
-            not hasModified
-            and not IsFileModified(binding.template, baseDir, tempFolder)
-            and os.path.exists(outputPath)
-        ):
+        if isUpToDate:
             logger.debug(
-                f'Binding file "{binding.file}" and its dependencies have not been modified, skipping...'
+                'Binding file "%s" and its dependencies have not been modified, skipping...',
+                binding.file,
             )
+            metrics.Count("bindings.skipped")
             return ("", [])
 
+    metrics.Count("bindings.generated")
+
+    from .jinja_environment import (
+        CreateEnvironment,
+        LoadTemplate,
+        FindTemplateReferences,
+    )
+
     assert os.path.exists(filePath), f'Binding file "{filePath}" does not exist.'
     assert os.path.exists(
         templatePath
     ), f'Template path "{templatePath}" does not exist.'
 
-    logger.debug(f'Analysing binding file "{binding.file}"...')
-    global parser
-    parser = Parser(filePath=filePath, content=testContent)
-    parser.Parse()
-
-    logger.debug(f'Generating binding file "{binding.output}"...')
-    with open(templatePath, "r") as f:
-        templateContent = f.read()
+    logger.debug('Analysing binding file "%s"...', binding.file)
+    if testContent is None and binding.group is not None and bindingGroups is not None:
+        parser = bindingGroups.GetParser(binding, baseDir, tempFolder, parseCache)
+    else:
+        parser = _CreateParser(binding, baseDir, tempFolder, parseCache, testContent)
+        parser.Parse()
 
-    env = Environment(loader=FileSystemLoader(baseDir))
-    template = env.from_string(templateContent)
+    logger.debug('Generating binding file "%s"...', binding.output)
+    if environment is None:
+        environment = CreateEnvironment(baseDir, tempFolder)
+    elif callable(environment):
+        environment = environment()
+    template = LoadTemplate(environment, baseDir, binding.template)
 
     systemData = systemData if systemData else {}
+    typeMapper = TypeMapper(parser.CustomTypes, typeMap)
 
-    content = template.render(
+    # the `fragment` helper renders directly, unless the fragments are cached below
+    renderData: dict[str, Any] = dict(
         structs=parser.Structs,
         enums=parser.Enums,
         typedefs=parser.Typedefs,
         functions=parser.Functions,
-        cTypeConvert=_CTypeConvert,
-        getFunctionParameters=_GetFunctionParameters,
+        cTypeConvert=typeMapper.Convert,
+        getFunctionParameters=partial(_GetFunctionParameters, typeMapper=typeMapper),
         convertRawCCommentToPythonDocstring=_ConvertRawCCommentToPythonDocstring,
         convertRawCCommentToPythonComment=_ConvertRawCCommentToPythonComment,
-        **systemData,
+        fragment=_RenderFragment,
     )
+    reserved = sorted(renderData.keys() & systemData.keys())
+    assert (
+        not reserved
+    ), f"Render variables reserved by the bindings: {', '.join(reserved)}."
+    renderData.update(systemData)
 
     if testContent is None:
-        outputFolder = os.path.dirname(outputPath)
-        Path(outputFolder).mkdir(parents=True, exist_ok=True)
+        if outputWriter is None:
+            outputWriter = OutputWriter()
 
-        with open(outputPath, "w") as f:
-            f.write(content)
+        templateDependencies, variables = FindTemplateReferences(
+            environment, baseDir, binding.template
+        )
+
+        # the fragments are reused while the templates and the context are unchanged
+        fragmentCache: FragmentCache | None = None
+        if variables is None or "fragment" in variables:
+            fragmentCache = FragmentCache(
+                os.path.join(
+                    baseDir,
+                    tempFolder,
+                    FRAGMENT_CACHE_FOLDER,
+                    Fingerprint(entryKey) + ".json",
+                ),
+                Fingerprint(
+                    {
+                        "templates": {
+                            file: HashFile(os.path.join(baseDir, file))
+                            for file in [binding.template, *templateDependencies]
+                        },
+                        "customTypes": dict(parser.CustomTypes),
+                        "context": context.Fingerprint(variables),
+                        "jinja": [
+                            environment.trim_blocks,
+                            environment.lstrip_blocks,
+                            environment.keep_trailing_newline,
+                        ],
+                    }
+                ),
+            )
+            renderData["fragment"] = fragmentCache.Render
 
-        dependenciesFiles.append(binding.template)
+        writtenContent = outputWriter.Write(
+            template.generate(**renderData),
+            [outputPath],
+            keepContent=returnContent,
+        )
+        content = writtenContent if writtenContent is not None else ""
+        if fragmentCache is not None:
+            fragmentCache.Save()
+
+        assert manifest is not None
+        dependenciesFiles = [
+            binding.file,
+            binding.template,
+            *templateDependencies,
+            *[RelativeToBaseDir(include, baseDir) for include in parser.Includes],
+        ]
+        if binding.prelude is not None:
+            dependenciesFiles.append(binding.prelude)
+
+        manifest.UpdateEntry(entryKey, dependenciesFiles, context.Record(variables))
+        if ownsManifest:
+            manifest.Save()
+    else:
+        content = template.render(**renderData)
 
     logger.info(
         f'Generated binding file "{binding.output}" from "{binding.file}" using template "{binding.template}".'
@@ -0,0 +1,229 @@
+import sys
+import json
+import argparse
+from typing import Any
+from .autogen import Autogen
+from .utils import logger, metrics, SetLogLevel
+
+# the parameters of `Autogen` and `Watch`, which the variables are passed along with
+_RESERVED_NAMES = {
+    "tempFolder",
+    "baseDir",
+    "scanCache",
+    "jobs",
+    "debounce",
+    "pollInterval",
+    "polling",
+    "stopEvent",
+}
+
+
+def _CreateParser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="ntt-autogen",
+        description="Generate the templates and bindings of autogen-settings.json.",
+    )
+    parser.add_argument(
+        "-C",
+        "--base-dir",
+        default=None,
+        help="the folder holding autogen-settings.json (default: current directory)",
+    )
+    parser.add_argument(
+        "--temp-folder",
+        default="temp",
+        help="the temporary folder, relative to the base folder (default: temp)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        metavar="N",
+        help="the number of worker processes (default: the jobs of the settings)",
+    )
+    parser.add_argument(
+        "--only",
+        action="append",
+        default=None,
+        metavar="PATTERN",
+        help=(
+            "only consider the entries whose key, template file or output matches the "
+            "shell-style pattern (can be repeated)"
+        ),
+    )
+    parser.add_argument(
+        "-n",
+        "--dry-run",
+        action="store_true",
+        help="list the entries which would be generated, without generating them",
+    )
+    parser.add_argument(
+        "--explain",
+        action="store_true",
+        help="print which input made each entry stale",
+    )
+    parser.add_argument(
+        "-D",
+        "--define",
+        action="append",
+        default=None,
+        metavar="NAME=VALUE",
+        help=(
+            "pass a string variable to the templates, like the keyword arguments of "
+            "Autogen (can be repeated, overrides --variables)"
+        ),
+    )
+    parser.add_argument(
+        "--variables",
+        default=None,
+        metavar="FILE",
+        help="pass the variables of a JSON object to the templates",
+    )
+    parser.add_argument(
+        "--report",
+        default=None,
+        metavar="FILE",
+        help="write the phase timings and counters of the run as JSON",
+    )
+    parser.add_argument(
+        "--trace",
+        default=None,
+        metavar="FILE",
+        help="write the phases of the run in the Chrome trace event format",
+    )
+    parser.add_argument(
+        "--log-level",
+        type=str.upper,
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        default=None,
+        help="the level of the logged records (default: INFO, or NTT_AUTOGEN_LOG_LEVEL)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="keep regenerating the entries affected by file changes",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    The `ntt-autogen` command.
+
+    Arguments
+    ---------
+    argv : list[str], optional
+        The command-line arguments, without the program name. Defaults to None
+        (`sys.argv[1:]`).
+
+    Returns
+    -------
+    int
+        The exit code, 0 on success, 1 if some entries failed and 2 on wrong arguments.
+    """
+
+    parser = _CreateParser()
+    args = parser.parse_args(argv)
+
+    if args.jobs is not None and args.jobs < 1:
+        parser.error(f"--jobs must be at least 1, got {args.jobs}")
+    if args.watch and (
+        args.only or args.dry_run or args.explain or args.report or args.trace
+    ):
+        parser.error(
+            "--watch cannot be combined with --only, --dry-run, --explain, --report "
+            "or --trace"
+        )
+
+    variables = _ReadVariables(parser, args)
+
+    if args.log_level is not None:
+        SetLogLevel(args.log_level)
+
+    if args.watch:
+        from .watch import Watch
+
+        try:
+            Watch(args.temp_folder, args.base_dir, jobs=args.jobs, **variables)
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    metrics.Reset(trace=args.trace is not None)
+    try:
+        return _Generate(args, variables)
+    finally:
+        if args.report is not None:
+            metrics.WriteReport(args.report)
+        if args.trace is not None:
+            metrics.WriteTrace(args.trace)
+
+
+def _ReadVariables(
+    parser: argparse.ArgumentParser, args: argparse.Namespace
+) -> dict[str, Any]:
+    # the render variables must be the same as those of the library runs, otherwise the
+    # entries are seen as stale and generated without them
+    variables: dict[str, Any] = {}
+    if args.variables is not None:
+        try:
+            with open(args.variables, "r", encoding="utf-8") as f:
+                variables = json.load(f)
+        except (OSError, ValueError) as e:
+            parser.error(f"cannot read --variables {args.variables}: {e}")
+        if not isinstance(variables, dict):
+            parser.error(f"--variables {args.variables} must hold a JSON object")
+
+    for definition in args.define or []:
+        name, separator, value = definition.partition("=")
+        if not separator or not name.isidentifier():
+            parser.error(f"--define expects NAME=VALUE, got {definition!r}")
+        variables[name] = value
+
+    for name in variables:
+        if name in _RESERVED_NAMES or not name.isidentifier():
+            parser.error(f"{name!r} cannot be used as a variable name")
+    return variables
+
+
+def _Generate(args: argparse.Namespace, variables: dict[str, Any]) -> int:
+    try:
+        autogen = Autogen.Load(
+            args.temp_folder, args.base_dir, jobs=args.jobs, **variables
+        )
+    except Exception as e:
+        logger.error(f"Cannot load the settings: {e!r}")
+        return 1
+
+    entryKeys: set[str] | None = None
+    if args.only:
+        entryKeys = autogen.MatchEntries(args.only)
+        if not entryKeys:
+            logger.warning(f"No entry matches {', '.join(args.only)}.")
+            return 0
+
+    if args.dry_run or args.explain:
+        reasons = autogen.ExplainStaleEntries(entryKeys)
+        for entryKey, reason in reasons.items():
+            print(f"{entryKey}: {reason}" if args.explain else entryKey)
+
+        if args.dry_run:
+            return 0
+
+        # the up to date entries would only be checked again
+        entryKeys = set(reasons)
+        if not entryKeys:
+            return 0
+
+    try:
+        autogen.Run(entryKeys)
+    except Exception as e:
+        logger.error(f"{e}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
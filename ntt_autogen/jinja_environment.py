@@ -0,0 +1,250 @@
+import os
+from pathlib import Path
+from typing import Callable, TYPE_CHECKING
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
+from jinja2 import TemplateNotFound, meta
+from jinja2 import Template as JinjaTemplate
+from .models import JinjaSettings
+from .utils import logger, metrics
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+    from .utils import IOPool
+
+BYTECODE_CACHE_FOLDER = "jinja-cache"
+
+_TemplateSource = tuple[str, str | None, Callable[[], bool] | None]
+
+
+class PrefetchingLoader(FileSystemLoader):
+    """
+    A `FileSystemLoader` whose template sources can be read ahead in an I/O pool, while the
+        previous templates are rendered (see `PrefetchTemplates`).
+    """
+
+    def __init__(self, searchpath: str) -> None:
+        super().__init__(searchpath)
+        self._prefetched: dict[str, "Future[_TemplateSource]"] = {}
+
+    def Prefetch(
+        self,
+        environment: Environment,
+        names: list[str],
+        ioPool: "IOPool | None",
+    ) -> None:
+        """
+        Start reading the sources of templates, replacing the ones prefetched before.
+
+        Arguments
+        ---------
+        environment : Environment
+            The environment of the loader.
+        names : list[str]
+            The names of the templates.
+        ioPool : IOPool | None
+            The pool reading the sources. None when `names` is empty.
+        """
+
+        readSource = super().get_source
+        self._prefetched = {}
+        for name in names:
+            assert ioPool is not None, "Prefetching templates needs an I/O pool."
+            self._prefetched[name] = ioPool.Submit(readSource, environment, name)
+
+    def get_source(self, environment: Environment, template: str) -> _TemplateSource:
+        # a source is prefetched for a single load, the next ones read the file again
+        future = self._prefetched.pop(template, None)
+        if future is not None:
+            try:
+                return future.result()
+            except Exception:
+                pass  # e.g. a missing file, read again to raise the usual error
+
+        return super().get_source(environment, template)
+
+
+def CreateEnvironment(
+    baseDir: str,
+    tempFolder: str,
+    settings: JinjaSettings | None = None,
+) -> Environment:
+    """
+    Create the Jinja environment shared by all the templates and bindings of a run, which
+        loads the templates by their name relative to the base directory so that the
+        compiled templates are reused.
+
+    Arguments
+    ---------
+    baseDir : str
+        The base directory, root of the template names.
+    tempFolder : str
+        The temporary folder (relative to `baseDir`) which holds the bytecode cache.
+    settings : JinjaSettings | None
+        The options of the environment. Defaults to None (the default `JinjaSettings`).
+
+    Returns
+    -------
+    Environment
+        The Jinja environment.
+    """
+
+    settings = settings if settings is not None else JinjaSettings()
+
+    bytecodeCache: FileSystemBytecodeCache | None = None
+    if settings.bytecodeCache:
+        cacheFolder = os.path.join(baseDir, tempFolder, BYTECODE_CACHE_FOLDER)
+        os.makedirs(cacheFolder, exist_ok=True)
+        bytecodeCache = FileSystemBytecodeCache(cacheFolder)
+
+    return Environment(
+        loader=PrefetchingLoader(baseDir),
+        bytecode_cache=bytecodeCache,
+        auto_reload=settings.autoReload,
+        cache_size=settings.cacheSize,
+        trim_blocks=settings.trimBlocks,
+        lstrip_blocks=settings.lstripBlocks,
+        keep_trailing_newline=settings.keepTrailingNewline,
+    )
+
+
+def PrefetchTemplates(
+    environment: Environment,
+    baseDir: str,
+    files: list[str],
+    ioPool: "IOPool | None",
+) -> None:
+    """
+    Read the sources of template files in an I/O pool, ahead of their `LoadTemplate`.
+
+    Arguments
+    ---------
+    environment : Environment
+        The environment created by `CreateEnvironment`.
+    baseDir : str
+        The base directory of the environment.
+    files : list[str]
+        The paths of the template files, relative to `baseDir` or absolute. The files
+        written before being loaded (e.g. the outputs of other entries) must not be
+        prefetched.
+    ioPool : IOPool | None
+        The pool reading the sources. None when `files` is empty.
+
+    Notes
+    -----
+    The sources prefetched before are forgotten, call it with no files once done.
+    """
+
+    if not isinstance(environment.loader, PrefetchingLoader):
+        return
+
+    names: list[str] = []
+    for file in files:
+        relativePath = os.path.relpath(os.path.join(baseDir, file), baseDir)
+        if relativePath != ".." and not relativePath.startswith(".." + os.sep):
+            names.append(Path(relativePath).as_posix())
+
+    environment.loader.Prefetch(environment, names, ioPool)
+
+
+def LoadTemplate(environment: Environment, baseDir: str, file: str) -> JinjaTemplate:
+    """
+    Load a template file through the environment.
+
+    Arguments
+    ---------
+    environment : Environment
+        The environment created by `CreateEnvironment`.
+    baseDir : str
+        The base directory of the environment.
+    file : str
+        The path of the template file, relative to `baseDir` or absolute.
+
+    Returns
+    -------
+    JinjaTemplate
+        The compiled template.
+
+    Notes
+    -----
+    A file outside of the base directory cannot be loaded by name, it is compiled from its
+        content and not cached.
+    """
+
+    relativePath = os.path.relpath(os.path.join(baseDir, file), baseDir)
+
+    # compiled, or loaded from the bytecode cache
+    with metrics.Phase("compile", file):
+        if relativePath == ".." or relativePath.startswith(".." + os.sep):
+            with open(os.path.join(baseDir, file), "r", encoding="utf-8") as f:
+                return environment.from_string(f.read())
+
+        return environment.get_template(Path(relativePath).as_posix())
+
+
+def FindTemplateReferences(
+    environment: Environment,
+    baseDir: str,
+    file: str,
+) -> tuple[list[str], list[str] | None]:
+    """
+    Find the templates referenced (directly or not) by a template file through `include`,
+        `import`, `from` and `extends` tags, and the render variables read by all of them.
+
+    Arguments
+    ---------
+    environment : Environment
+        The environment created by `CreateEnvironment`.
+    baseDir : str
+        The base directory of the environment.
+    file : str
+        The path of the template file, relative to `baseDir` or absolute.
+
+    Returns
+    -------
+    tuple[list[str], list[str] | None]
+        The paths of the referenced templates relative to `baseDir`, sorted, the template
+        file itself not being part of them. Then the names of the variables the templates
+        read without defining them, sorted, or None if a template loads a template
+        computed at render time, whose variables cannot be known.
+
+    Notes
+    -----
+    A reference computed at render time (e.g. `{% include name %}`) cannot be found, the
+        files it may load must be declared as the `dependencies` of the template.
+    """
+
+    with open(os.path.join(baseDir, file), "r", encoding="utf-8") as f:
+        pending = [f.read()]
+
+    dependencies: set[str] = set()
+    variables: set[str] | None = set()
+    while pending:
+        ast = environment.parse(pending.pop())
+        if variables is not None:
+            variables.update(meta.find_undeclared_variables(ast))
+
+        for name in meta.find_referenced_templates(ast):
+            if name is None:
+                logger.debug(
+                    'Template "%s" loads a template computed at render time, which is not tracked.',
+                    file,
+                )
+                variables = None
+                continue
+
+            try:
+                referencedSource, referencedPath, _ = environment.loader.get_source(  # type: ignore
+                    environment, name
+                )
+            except TemplateNotFound:
+                continue
+
+            assert referencedPath is not None
+            relativePath = os.path.relpath(referencedPath, baseDir)
+            if relativePath not in dependencies:
+                dependencies.add(relativePath)
+                pending.append(referencedSource)
+
+    dependencies.discard(os.path.relpath(os.path.join(baseDir, file), baseDir))
+    return sorted(dependencies), sorted(variables) if variables is not None else None
+
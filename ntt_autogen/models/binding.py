@@ -1,6 +1,13 @@
 from dataclasses import dataclass, field
 
 
+@dataclass
+class BindingFilter:
+    annotation: str | None = field(default=None)  # Required annotation
+    mainFileOnly: bool = field(default=False)  # Skip the included headers' declarations
+    namePattern: str | None = field(default=None)  # Regex the whole name must match
+
+
 @dataclass
 class Binding:
     file: str = field(default="")
@@ -8,3 +15,11 @@ class Binding:
     output: str = field(default="")
     dependencies: list[str] | None = field(default=None)
     extensions: list[str] | None = field(default=None)
+    clangArgs: list[str] | None = field(default=None)  # Defaults to Parser's args
+    shareIndex: bool = field(default=True)  # Share one clang index between the parses
+    prelude: str | None = field(default=None)  # Header to precompile and reuse (PCH)
+    parseOptions: list[str] | None = field(default=None)  # See analyze.PARSE_OPTIONS
+    filter: BindingFilter | None = field(default=None)  # Declarations to keep
+    group: str | None = field(
+        default=None
+    )  # Bindings whose headers are parsed together
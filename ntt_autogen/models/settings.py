@@ -3,7 +3,30 @@ from .template import Template
 from dataclasses import dataclass, field
 
 
+@dataclass
+class ParseCacheSettings:
+    enabled: bool = field(default=True)
+    maxEntries: int = field(default=64)
+    maxBytes: int = field(default=64 * 1024 * 1024)
+
+
+@dataclass
+class JinjaSettings:
+    bytecodeCache: bool = field(default=True)  # Keep the compiled templates in temp
+    autoReload: bool = field(default=True)  # Recompile the templates modified on disk
+    cacheSize: int = field(default=400)  # Compiled templates kept in memory
+    trimBlocks: bool = field(default=False)
+    lstripBlocks: bool = field(default=False)
+    keepTrailingNewline: bool = field(default=False)
+
+
 @dataclass
 class Settings:
     bindings: list[Binding] = field(default_factory=list)  # type: ignore
     templates: list[Template] = field(default_factory=list)  # type: ignore
+    cacheMode: str = field(default="mtime")  # "mtime" or "hash" (compare the content)
+    jobs: int = field(default=1)  # Number of worker processes generating the entries
+    ioWorkers: int = field(default=8)  # Threads doing the file I/O, 0 for none
+    typeMap: dict[str, str] = field(default_factory=dict)  # C type -> Python type
+    parseCache: ParseCacheSettings = field(default_factory=ParseCacheSettings)
+    jinja: JinjaSettings = field(default_factory=JinjaSettings)
@@ -1,19 +1,99 @@
 import os
-from typing import Any
+from typing import Any, Callable, TYPE_CHECKING
+from dataclasses import asdict
 from .models import Template
-from jinja2 import Template as JinjaTemplate
 from .utils import (
     logger,
-    IsFileModified,
-    UpdateFileStamp,
-    AllDependenciesFiles,
+    StampManifest,
+    DependencyFile,
+    ScanDependencies,
+    DependencyScanCache,
+    OutputWriter,
+    LazyMessage,
+    RenderContext,
+    metrics,
 )
 
+# Jinja is only imported once a template is actually rendered
+if TYPE_CHECKING:
+    from jinja2 import Environment
+
+
+def TemplateEntryKey(template: Template) -> str:
+    """
+    Get the key of a template in the stamp manifest (see `StampManifest.UpdateEntry`).
+
+    Arguments
+    ---------
+    template : Template
+        The template configuration.
+
+    Returns
+    -------
+    str
+        The key of the template.
+    """
+
+    return f"template:{template.file}"
+
+
+def TemplateRenderContext(template: Template, kwargs: dict[str, Any]) -> RenderContext:
+    """
+    Get the render context of a template, whose change makes it stale.
+
+    Arguments
+    ---------
+    template : Template
+        The template configuration.
+
+    kwargs : dict
+        The data passed to the template.
+
+    Returns
+    -------
+    RenderContext
+        The settings of the template along with its render data.
+    """
+
+    return RenderContext(asdict(template), kwargs)
+
+
+def TemplateOutputs(template: Template) -> list[str]:
+    """
+    Get the output files of a template.
+
+    Arguments
+    ---------
+    template : Template
+        The template configuration.
+
+    Returns
+    -------
+    list[str]
+        The `outputs` of the template, or its file without the ".in" extension.
+    """
+
+    if template.outputs is not None:
+        return template.outputs
+
+    return [template.file[:-3]]  # remove .in extension
+
+
+def _FormatFileList(files: list[DependencyFile]) -> str:
+    return "[\n\t{}\n]".format(",\n\t".join(repr(depFile.path) for depFile in files))
+
 
 def GenerateTemplate(
     template: Template,
     baseDir: str,
     tempFolder: str,
+    *,
+    scanCache: DependencyScanCache | None = None,
+    manifest: StampManifest | None = None,
+    environment: "Environment | Callable[[], Environment] | None" = None,
+    returnContent: bool = True,
+    outputWriter: OutputWriter | None = None,
+    renderData: dict[str, Any] | None = None,
     **kwargs: Any,
 ) -> tuple[str, list[str]]:
     """
@@ -31,83 +111,153 @@ def GenerateTemplate(
     tempFolder: str,
         The temporary folder to store intermediate files.
 
+    scanCache: DependencyScanCache, optional
+        The memo shared by all entries of a run to avoid re-scanning the same dependency
+        folders. Defaults to None (always scan).
+
+    manifest: StampManifest, optional
+        The stamp manifest of the run, only updated in memory. Defaults to None, in which
+        case the manifest of the temporary folder is loaded and saved by this call.
+
+    environment: Environment | Callable[[], Environment], optional
+        The Jinja environment shared by all entries of a run (see `CreateEnvironment`), or
+        a function returning it, only called if the output has to be rendered. Defaults to
+        None, in which case an environment is created for this call.
+
+    returnContent: bool, optional
+        Whether the rendered content is returned. Defaults to True. Without it, the
+        template is streamed to its outputs and an empty string is returned, so the
+        whole content is never held in memory.
+
+    outputWriter: OutputWriter, optional
+        The writer of the outputs, which counts the outputs written and left unchanged
+        during a run. Defaults to None, in which case a writer is created for this call.
+
+    renderData: dict[str, Any], optional
+        The data passed to the template, whatever the names of its variables. The
+        template is generated again when the value of one of the variables it reads
+        changes (see `RenderContext`). Defaults to None.
+
     Keyword Arguments
     -----------------
     kwargs : dict
-        Additional data to pass to the template.
+        Additional data to pass to the template, merged into `renderData`. A variable
+        named like one of the arguments above must be passed through `renderData`.
     """
     baseDir = baseDir if baseDir else os.getcwd()
+
+    duplicates = sorted(kwargs.keys() & (renderData or {}).keys())
+    assert not duplicates, f"Render variables given twice: {', '.join(duplicates)}."
+    renderData = {**(renderData or {}), **kwargs}
     templatePath = os.path.join(baseDir, template.file)
 
-    allDependencies = []
+    ownsManifest = manifest is None
+    if manifest is None:
+        manifest = StampManifest.Load(baseDir, tempFolder)
+
+    allDependencies: list[DependencyFile] = []
 
     if template.dependencies is not None:
         assert (
             template.extensions is not None
         ), f'Template "{template.file}" has dependencies but no extensions specified.'
 
-        allDependencies = AllDependenciesFiles(
+        allDependencies = ScanDependencies(
             template.dependencies,
             template.extensions,
             baseDir,
+            scanCache,
         )
 
+        # only formatted if the debug records are enabled
         logger.debug(
-            'All dependency files for binding "{}": \n{}'.format(
-                template.file,
-                str(allDependencies)
-                .replace(", ", ",\n\t")
-                .replace("[", "[\n\t")
-                .replace("]", "\n]"),
-            )
+            'All dependency files for template "%s": \n%s',
+            template.file,
+            LazyMessage(lambda: _FormatFileList(allDependencies)),
         )
 
     if not os.path.exists(templatePath):
         logger.warning(f'Template file "{template.file}" does not exist, skipping...')
         return "", []
 
-    outputFiles = [template.file[:-3]]  # remove .in extension
-
-    if template.outputs is not None:
-        outputFiles = template.outputs
-
+    outputFiles = TemplateOutputs(template)
     fullOutputPaths = [os.path.join(baseDir, outputFile) for outputFile in outputFiles]
 
-    isAnyDependencyModified = False
-    for depFile in allDependencies:
-        if IsFileModified(depFile, baseDir, tempFolder):
-            isAnyDependencyModified = True
-            break
-
-    if (
-        not isAnyDependencyModified
-        and not IsFileModified(template.file, baseDir, tempFolder)
-        and all(os.path.exists(fullOutputPath) for fullOutputPath in fullOutputPaths)
-    ):
+    entryKey = TemplateEntryKey(template)
+    context = TemplateRenderContext(template, renderData)
+    with metrics.Phase("stamps", template.file):
+        isUpToDate = not manifest.IsEntryModified(
+            entryKey, [template.file, *allDependencies], context
+        ) and all(os.path.exists(fullOutputPath) for fullOutputPath in fullOutputPaths)
+
+    if isUpToDate:
         logger.debug(
-            f'Template file "{template.file}" has not been modified, skipping...'
+            'Template file "%s" has not been modified, skipping...', template.file
         )
+        metrics.Count("templates.skipped")
         return "", []
 
-    with open(templatePath, "r") as f:
-        templateContent = f.read()
-        jinjaTemplate = JinjaTemplate(templateContent)
-        renderedContent = jinjaTemplate.render(**kwargs)
+    metrics.Count("templates.generated")
+
+    from .jinja_environment import (
+        CreateEnvironment,
+        LoadTemplate,
+        FindTemplateReferences,
+    )
+
+    if environment is None:
+        environment = CreateEnvironment(baseDir, tempFolder)
+    elif callable(environment):
+        environment = environment()
+
+    jinjaTemplate = LoadTemplate(environment, baseDir, template.file)
 
+    writtenFiles: list[str] = []
+    writtenPaths: list[str] = []
     for outputFile, fullOutputPath in zip(outputFiles, fullOutputPaths):
         if template.noReload and os.path.exists(fullOutputPath):
             logger.debug(
-                f'Skipping generation of "{outputFile}" from template "{template.file}" as noReload is set and the output file already exists.'
+                'Skipping generation of "%s" from template "%s" as noReload is set and the output file already exists.',
+                outputFile,
+                template.file,
             )
             continue
 
-        os.makedirs(os.path.dirname(fullOutputPath), exist_ok=True)
+        writtenFiles.append(outputFile)
+        writtenPaths.append(fullOutputPath)
+
+    renderedContent = ""
+    if writtenPaths:
+        if outputWriter is None:
+            outputWriter = OutputWriter()
 
-        with open(fullOutputPath, "w") as f:
-            f.write(renderedContent)
+        # one render pass feeds all the outputs
+        content = outputWriter.Write(
+            jinjaTemplate.generate(**renderData),
+            writtenPaths,
+            keepContent=returnContent,
+        )
+        renderedContent = content if content is not None else ""
+    elif returnContent:
+        renderedContent = jinjaTemplate.render(**renderData)
 
+    for outputFile in writtenFiles:
         logger.info(f'Generated file "{outputFile}" from template "{template.file}".')
 
-    UpdateFileStamp(template.file, baseDir, tempFolder)
+    # the declared dependencies are kept since a template may read any of them
+    templateDependencies, variables = FindTemplateReferences(
+        environment, baseDir, template.file
+    )
+    manifest.UpdateEntry(
+        entryKey,
+        [
+            template.file,
+            *templateDependencies,
+            *[depFile.path for depFile in allDependencies],
+        ],
+        context.Record(variables),
+    )
+    if ownsManifest:
+        manifest.Save()
 
-    return renderedContent, allDependencies
+    return renderedContent, [depFile.path for depFile in allDependencies]
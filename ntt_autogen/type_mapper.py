@@ -0,0 +1,136 @@
+from typing import Mapping
+from .utils import logger
+
+_BUILTIN_TYPES: dict[str, str] = {
+    **dict.fromkeys(
+        [
+            "unsigned int",
+            "uint32_t",
+            "uint16_t",
+            "uint8_t",
+            "int",
+            "short",
+            "long",
+            "unsigned short",
+            "unsigned long",
+            "int32_t",
+            "int16_t",
+            "int8_t",
+            "long long",
+            "unsigned long long",
+            "int64_t",
+            "uint64_t",
+            "unsigned char",
+            "char",
+            "signed char",
+            "size_t",
+        ],
+        "int",
+    ),
+    **dict.fromkeys(
+        ["float", "double", "long double", "float32_t", "float64_t"], "float"
+    ),
+    **dict.fromkeys(["const char *", "char *"], "str"),
+    "void": "None",
+    "void *": "Any",
+}
+
+# the unknown types already warned about, shared by the type mappers of a run
+_warnedTypes: set[str] = set()
+
+
+def ResetTypeWarnings() -> None:
+    """
+    Forget the unknown types already warned about, called at the start of each run so that
+        they are warned about again.
+    """
+
+    _warnedTypes.clear()
+
+
+def _NormalizeCType(cType: str) -> str:
+    """
+    Strip the spaces and the `enum`/`struct` prefixes of a C type spelling.
+    """
+
+    cType = cType.strip()
+
+    if cType.startswith("enum "):
+        cType = cType[5:].strip()
+
+    if cType.startswith("struct "):
+        cType = cType[7:].strip()
+
+    return cType
+
+
+class TypeMapper:
+    """
+    Converts C type spellings to Python types, memoizing each spelling.
+
+    The types are resolved in order from the user-defined mappings, the builtin C types
+    and the custom types of the parsed header. Any other type is mapped to "Any" with a
+    warning which is only logged once per type until `ResetTypeWarnings`, whatever the
+    number of mappers (e.g. one per binding of a run).
+
+    Arguments
+    ---------
+    customTypes : Mapping[str, str], optional
+        The custom types of the parsed header (see `Parser.CustomTypes`).
+
+    userTypes : Mapping[str, str], optional
+        The user-defined mappings from C types to Python types, which take precedence over
+        the other ones (see `Settings.typeMap`).
+    """
+
+    def __init__(
+        self,
+        customTypes: Mapping[str, str] | None = None,
+        userTypes: Mapping[str, str] | None = None,
+    ) -> None:
+        self._customTypes = customTypes if customTypes is not None else {}
+        self._userTypes = {
+            _NormalizeCType(cType): pyType
+            for cType, pyType in (userTypes or {}).items()
+        }
+        self._memo: dict[str, str] = {}
+
+    def Convert(self, cType: str) -> str:
+        """
+        Convert a C type to a Python type.
+
+        Arguments
+        ---------
+        cType : str
+            The C type to convert.
+
+        Returns
+        -------
+        str
+            The converted Python type.
+        """
+
+        pyType = self._memo.get(cType)
+        if pyType is None:
+            pyType = self._Resolve(_NormalizeCType(cType))
+            self._memo[cType] = pyType
+
+        return pyType
+
+    def _Resolve(self, cType: str) -> str:
+        pyType = self._userTypes.get(cType)
+        if pyType is not None:
+            return pyType
+
+        pyType = _BUILTIN_TYPES.get(cType)
+        if pyType is not None:
+            return pyType
+
+        if cType in self._customTypes:
+            return cType
+
+        if cType not in _warnedTypes:
+            _warnedTypes.add(cType)
+            logger.warning(f'Unknown C type "{cType}", mapping to "Any".')
+
+        return "Any"
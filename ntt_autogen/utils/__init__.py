@@ -1,3 +1,14 @@
-from .log import logger  # type: ignore
+from .log import (  # type: ignore
+    logger,
+    LazyMessage,
+    SetLogLevel,
+    BackgroundLogging,
+    ForegroundLogging,
+)
 from .cache import *
 from .dependencies_utils import *
+from .output import *
+from .metrics import *
+from .io_pool import *
+from .render_context import *
+from .fragment_cache import *
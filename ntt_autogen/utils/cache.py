@@ -1,5 +1,791 @@
 import os
+import json
 import shutil
+import hashlib
+from typing import Iterable, TYPE_CHECKING
+from dataclasses import dataclass, field
+from .log import logger
+from .metrics import metrics
+from .dependencies_utils import DependencyFile, ScanDependencyFolder
+
+if TYPE_CHECKING:
+    from .io_pool import IOPool
+    from .render_context import RenderContext
+
+MANIFEST_FILE = "stamps.json"
+MANIFEST_VERSION = 3
+# version 1 has no entry records, version 2 no render contexts
+SUPPORTED_MANIFEST_VERSIONS = (1, 2, MANIFEST_VERSION)
+LEGACY_STAMP_EXTENSION = ".stamp"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+CACHE_MODE_MTIME = "mtime"
+CACHE_MODE_HASH = "hash"
+CACHE_MODES = (CACHE_MODE_MTIME, CACHE_MODE_HASH)
+
+
+@dataclass
+class FileStamp:
+    """
+    The recorded state of a tracked file.
+
+    Attributes
+    ----------
+    mtimeNs : int
+        The modification time of the file in nanoseconds.
+
+    size : int
+        The size of the file in bytes.
+
+    hash : str | None
+        The content hash of the file, if it has been computed.
+    """
+
+    mtimeNs: int
+    size: int
+    hash: str | None = None
+
+
+@dataclass
+class EntryContext:
+    """
+    The render context an entry was last generated with (see `RenderContext`).
+
+    Attributes
+    ----------
+    variables : list[str] | None
+        The render variables read by the templates of the entry, None if they are not
+        known (all the render data was fingerprinted).
+
+    fingerprint : str
+        The fingerprint of the settings of the entry and of the values of the variables.
+    """
+
+    variables: list[str] | None
+    fingerprint: str
+
+
+@dataclass
+class ManifestUpdates:
+    """
+    The stamps recorded by a copy of a manifest, e.g. in a worker process, to be merged
+        into the manifest of the run (see `StampManifest.TakeUpdates`).
+
+    Attributes
+    ----------
+    files : dict[str, FileStamp]
+        The updated file stamps, keyed by file path.
+
+    entries : dict[str, dict[str, FileStamp]]
+        The updated input records, keyed by entry.
+
+    contexts : dict[str, EntryContext]
+        The updated render contexts, keyed by entry.
+    """
+
+    files: dict[str, FileStamp]
+    entries: dict[str, dict[str, FileStamp]]
+    contexts: dict[str, EntryContext] = field(default_factory=dict)
+
+
+class StampManifest:
+    """
+    All stamps of a temporary folder, stored in one manifest file instead of one
+        `.stamp` file per tracked file.
+
+    Besides the stamps of single files, the manifest records the inputs of each generated
+    entry (a template or a binding) with the stamps they had when the entry was last
+    generated, so that an entry is only stale when one of its own inputs changed (see
+    `IsEntryModified` and `UpdateEntry`).
+
+    The manifest is loaded once per run, updated in memory and written back atomically
+    with `Save`. A temporary folder which still uses the per-file `.stamp` layout is
+    migrated on load, and the legacy stamp files are removed on the next `Save`.
+
+    Arguments
+    ---------
+    baseDir : str
+        The base directory for resolving relative paths.
+
+    tempFolder : str
+        The temporary folder holding the manifest (relative to the base directory).
+
+    mode : str, optional
+        The change detection mode. Defaults to "mtime" where a file is modified whenever
+        its size or mtime changes. In "hash" mode, a file whose size is unchanged but whose
+        mtime changed is hashed and only considered as modified if its content changed.
+    """
+
+    def __init__(
+        self,
+        baseDir: str,
+        tempFolder: str,
+        mode: str = CACHE_MODE_MTIME,
+    ) -> None:
+        assert mode in CACHE_MODES, f'Unknown cache mode "{mode}".'
+
+        self._baseDir = baseDir
+        self._tempFolder = tempFolder
+        self._mode = mode
+        self._hashes: dict[str, tuple[int, int, str]] = {}
+        self._files: dict[str, FileStamp] = {}
+        self._observed: dict[str, DependencyFile] = {}
+        self._prefetched: dict[str, DependencyFile | None] = {}  # None when missing
+        self._updated: dict[str, FileStamp] = {}
+        self._entries: dict[str, dict[str, FileStamp]] = {}
+        self._updatedEntries: dict[str, dict[str, FileStamp]] = {}
+        self._contexts: dict[str, EntryContext] = {}
+        self._updatedContexts: dict[str, EntryContext] = {}
+        self._legacyStamps: list[str] = []
+        self._isDirty = False
+
+    @staticmethod
+    def Load(
+        baseDir: str,
+        tempFolder: str,
+        mode: str = CACHE_MODE_MTIME,
+    ) -> "StampManifest":
+        """
+        Load the manifest of the temporary folder, migrating the legacy `.stamp` files if
+            no manifest exists yet.
+
+        Arguments
+        ---------
+        baseDir : str
+            The base directory for resolving relative paths.
+
+        tempFolder : str
+            The temporary folder holding the manifest.
+
+        mode : str, optional
+            The change detection mode ("mtime" or "hash"). Defaults to "mtime".
+
+        Returns
+        -------
+        StampManifest
+            The loaded manifest (empty if there is nothing to load).
+        """
+
+        manifest = StampManifest(baseDir, tempFolder, mode)
+        manifestPath = GetManifestFilePath(baseDir, tempFolder)
+
+        if not os.path.exists(manifestPath):
+            manifest._MigrateLegacyStamps()
+            return manifest
+
+        try:
+            with open(manifestPath, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(
+                f'Cannot read stamp manifest "{manifestPath}": {e}, ignoring...'
+            )
+            return manifest
+
+        if data.get("version") not in SUPPORTED_MANIFEST_VERSIONS:
+            logger.debug('Stamp manifest "%s" is outdated, ignoring...', manifestPath)
+            return manifest
+
+        for filePath, (mtimeNs, size, fileHash) in data.get("files", {}).items():
+            manifest._files[filePath] = FileStamp(mtimeNs, size, fileHash)
+
+        for entryKey, inputs in data.get("entries", {}).items():
+            manifest._entries[entryKey] = {
+                filePath: FileStamp(mtimeNs, size, fileHash)
+                for filePath, (mtimeNs, size, fileHash) in inputs.items()
+            }
+
+        for entryKey, (fingerprint, variables) in data.get("contexts", {}).items():
+            manifest._contexts[entryKey] = EntryContext(variables, fingerprint)
+
+        return manifest
+
+    def _MigrateLegacyStamps(self) -> None:
+        tempDir = os.path.join(self._baseDir, self._tempFolder)
+
+        if not os.path.isdir(tempDir):
+            return
+
+        for legacyStamp in ScanDependencyFolder(
+            tempDir,
+            frozenset([LEGACY_STAMP_EXTENSION]),
+            tempDir,
+        ):
+            self._legacyStamps.append(legacyStamp.path)
+            filePath = legacyStamp.path[: -len(LEGACY_STAMP_EXTENSION)]
+
+            try:
+                stat = os.stat(os.path.join(self._baseDir, filePath))
+            except OSError:
+                continue
+
+            # the legacy layout considers a file as unmodified while the stamp is newer
+            if stat.st_mtime_ns <= legacyStamp.mtimeNs:
+                self._files[filePath] = FileStamp(stat.st_mtime_ns, stat.st_size)
+
+        if self._legacyStamps:
+            logger.debug(
+                'Migrated %d legacy stamp file(s) of "%s".',
+                len(self._legacyStamps),
+                tempDir,
+            )
+            self._isDirty = True
+
+    def IsModified(
+        self,
+        filePath: str,
+        current: DependencyFile | None = None,
+    ) -> bool:
+        """
+        Check if a file differs from its recorded stamp.
+
+        Arguments
+        ---------
+        filePath : str
+            The path to the file (relative to the base directory).
+
+        current : DependencyFile, optional
+            The already known state of the file (e.g. from a dependency scan), to avoid
+            another `stat` call.
+
+        Returns
+        -------
+        bool
+            True if the file is not tracked yet or has been modified, False otherwise.
+        """
+
+        current = self._Observe(filePath, current)
+
+        stamp = self._files.get(filePath)
+        if stamp is None:
+            return True
+
+        return self._IsStampModified(filePath, stamp, current)
+
+    def _Observe(
+        self,
+        filePath: str,
+        current: DependencyFile | None = None,
+    ) -> DependencyFile:
+        if current is None:
+            if filePath in self._prefetched:
+                current = self._prefetched[filePath]
+                if current is None:
+                    fullFilePath = os.path.join(self._baseDir, filePath)
+                    raise FileNotFoundError(f"File '{fullFilePath}' does not exist.")
+            else:
+                current = _StatFile(filePath, self._baseDir)
+        self._observed[filePath] = current
+        return current
+
+    def Prefetch(self, filePaths: Iterable[str], ioPool: "IOPool") -> None:
+        """
+        Stat files concurrently, the next checks of these files use the prefetched state
+            instead of calling `stat` one file after the other.
+
+        Arguments
+        ---------
+        filePaths : Iterable[str]
+            The paths to the files (relative to the base directory). The files written
+            before being checked (e.g. the outputs of other entries) must not be
+            prefetched.
+
+        ioPool : IOPool
+            The pool running the `stat` calls.
+
+        Notes
+        -----
+        The prefetched states are kept until `ClearPrefetched` is called, at the end of
+            the run.
+        """
+
+        filePaths = sorted(set(filePaths).difference(self._prefetched))
+        if not filePaths:
+            return
+
+        with metrics.Phase("prefetch.stat"):
+            states = ioPool.Map(self._TryStat, filePaths)
+        self._prefetched.update(zip(filePaths, states))
+        metrics.Count("files.prefetched", len(filePaths))
+
+    def _TryStat(self, filePath: str) -> DependencyFile | None:
+        try:
+            return _StatFile(filePath, self._baseDir)
+        except FileNotFoundError:
+            return None
+
+    def ClearPrefetched(self) -> None:
+        """
+        Forget the states prefetched by `Prefetch`, the next checks stat the files again.
+        """
+
+        self._prefetched = {}
+
+    def _IsStampModified(
+        self,
+        filePath: str,
+        stamp: FileStamp,
+        current: DependencyFile,
+    ) -> bool:
+        metrics.Count("stamps.checked")
+        if stamp.mtimeNs == current.mtimeNs and stamp.size == current.size:
+            return False
+
+        if (
+            self._mode != CACHE_MODE_HASH
+            or stamp.hash is None
+            or stamp.size != current.size
+        ):
+            return True
+
+        if self._GetHash(filePath, current) != stamp.hash:
+            return True
+
+        # same content, only the mtime moved (e.g. checkout or cache restore)
+        stamp.mtimeNs = current.mtimeNs
+        self._isDirty = True
+        return False
+
+    def _CreateStamp(self, filePath: str, current: DependencyFile) -> FileStamp:
+        stamp = FileStamp(current.mtimeNs, current.size)
+        if self._mode == CACHE_MODE_HASH:
+            stamp.hash = self._GetHash(filePath, current)
+        return stamp
+
+    def IsEntryModified(
+        self,
+        entryKey: str,
+        declared: list[DependencyFile | str] | None = None,
+        context: "RenderContext | None" = None,
+    ) -> bool:
+        """
+        Check if one of the inputs recorded for an entry differs from its stamp.
+
+        Arguments
+        ---------
+        entryKey : str
+            The key of the entry (see `UpdateEntry`).
+
+        declared : list[DependencyFile | str], optional
+            The inputs the entry currently declares, either already known (e.g. from a
+            dependency scan) or only by path. A declared input which is not recorded yet
+            (e.g. a new file of a dependency folder) makes the entry stale. Defaults to
+            None.
+
+        context : RenderContext, optional
+            The current render context of the entry. A change of the fingerprint of the
+            variables recorded by `UpdateEntry` makes the entry stale. An entry recorded
+            without a context adopts this one. Defaults to None (not checked).
+
+        Returns
+        -------
+        bool
+            True if the entry has never been recorded, if one of its inputs has been
+            modified or deleted, if it declares a new input or if its render context
+            changed. False otherwise.
+        """
+
+        return self.ExplainEntry(entryKey, declared, context) is not None
+
+    def ExplainEntry(
+        self,
+        entryKey: str,
+        declared: list[DependencyFile | str] | None = None,
+        context: "RenderContext | None" = None,
+    ) -> str | None:
+        """
+        Find why an entry is stale, see `IsEntryModified`.
+
+        Arguments
+        ---------
+        entryKey : str
+            The key of the entry (see `UpdateEntry`).
+
+        declared : list[DependencyFile | str], optional
+            The inputs the entry currently declares. Defaults to None.
+
+        context : RenderContext, optional
+            The current render context of the entry. Defaults to None.
+
+        Returns
+        -------
+        str | None
+            The reason of the first change found (e.g. `"include/a.h" was modified`), or
+            None if the entry is up to date.
+        """
+
+        declaredFiles = [
+            self._Observe(depFile) if isinstance(depFile, str) else depFile
+            for depFile in declared or []
+        ]
+
+        inputs = self._entries.get(entryKey)
+        if inputs is None:
+            if self._MigrateEntry(entryKey, declaredFiles):
+                return "never generated"
+            return self._ExplainContext(entryKey, context)
+
+        for depFile in declaredFiles:
+            if depFile.path not in inputs:
+                return f'"{depFile.path}" is a new input'
+            self._Observe(depFile.path, depFile)
+
+        isRefreshed = False
+        for filePath, stamp in inputs.items():
+            try:
+                current = self._Observe(filePath)
+            except FileNotFoundError:
+                return f'"{filePath}" was deleted'
+
+            isTouched = stamp.mtimeNs != current.mtimeNs
+            if self._IsStampModified(filePath, stamp, current):
+                return f'"{filePath}" was modified'
+            isRefreshed = isRefreshed or isTouched
+
+        # the stamps refreshed in hash mode are sent back as well (see `TakeUpdates`)
+        if isRefreshed:
+            self._updatedEntries[entryKey] = inputs
+
+        return self._ExplainContext(entryKey, context)
+
+    def _ExplainContext(
+        self,
+        entryKey: str,
+        context: "RenderContext | None",
+    ) -> str | None:
+        if context is None:
+            return None
+
+        recorded = self._contexts.get(entryKey)
+        if recorded is None:
+            # recorded by a previous version, the variables read are not known
+            self._SetContext(entryKey, EntryContext(None, context.Fingerprint(None)))
+            return None
+
+        if context.Fingerprint(recorded.variables) != recorded.fingerprint:
+            return "the render context changed"
+        return None
+
+    def _SetContext(self, entryKey: str, entryContext: EntryContext | None) -> None:
+        if entryContext is None:
+            if self._contexts.pop(entryKey, None) is not None:
+                self._isDirty = True
+            return
+
+        self._updatedContexts[entryKey] = entryContext
+        if self._contexts.get(entryKey) != entryContext:
+            self._contexts[entryKey] = entryContext
+            self._isDirty = True
+
+    def HasEntry(self, entryKey: str) -> bool:
+        """
+        Check if the inputs of an entry have been recorded.
+
+        Arguments
+        ---------
+        entryKey : str
+            The key of the entry.
+
+        Returns
+        -------
+        bool
+            True if the entry has a record, False otherwise.
+        """
+
+        return entryKey in self._entries
+
+    def GetEntryInputs(self, entryKey: str) -> list[str]:
+        """
+        Get the recorded inputs of an entry.
+
+        Arguments
+        ---------
+        entryKey : str
+            The key of the entry.
+
+        Returns
+        -------
+        list[str]
+            The paths of the files read by the entry when it was last generated, empty if
+            the entry has no record.
+        """
+
+        return list(self._entries.get(entryKey, {}))
+
+    def ForgetEntry(self, entryKey: str) -> None:
+        """
+        Drop the record of an entry, e.g. when its outputs could not be written, so that
+            it is considered as never generated.
+
+        Arguments
+        ---------
+        entryKey : str
+            The key of the entry.
+        """
+
+        self._updatedEntries.pop(entryKey, None)
+        self._updatedContexts.pop(entryKey, None)
+        if self._entries.pop(entryKey, None) is not None:
+            self._isDirty = True
+        self._SetContext(entryKey, None)
+
+    def FindEntries(self, filePaths: set[str]) -> set[str]:
+        """
+        Find the entries whose record holds one of the files.
+
+        Arguments
+        ---------
+        filePaths : set[str]
+            The paths of the files, as recorded (see `UpdateEntry`).
+
+        Returns
+        -------
+        set[str]
+            The keys of the entries reading at least one of the files.
+        """
+
+        return {
+            entryKey
+            for entryKey, inputs in self._entries.items()
+            if not filePaths.isdisjoint(inputs)
+        }
+
+    def _MigrateEntry(
+        self,
+        entryKey: str,
+        declared: list[DependencyFile],
+    ) -> bool:
+        # a manifest without entry records only has the stamps of the declared inputs
+        if not declared or any(
+            depFile.path not in self._files or self.IsModified(depFile.path, depFile)
+            for depFile in declared
+        ):
+            return True
+
+        record = {depFile.path: self._files[depFile.path] for depFile in declared}
+        self._entries[entryKey] = record
+        self._updatedEntries[entryKey] = record
+        self._isDirty = True
+        return False
+
+    def UpdateEntry(
+        self,
+        entryKey: str,
+        inputs: list[str],
+        context: EntryContext | None = None,
+    ) -> None:
+        """
+        Record the inputs of a generated entry with their current state (in memory, see
+            `Save`), replacing the previous record of the entry.
+
+        Arguments
+        ---------
+        entryKey : str
+            The key of the entry, e.g. `template:<file>` or `binding:<output>`.
+
+        inputs : list[str]
+            The paths of all the files read to generate the entry (relative to the base
+            directory, or absolute). The missing files are not recorded, the state of the
+            files checked by `IsEntryModified` is the one observed by this check.
+
+        context : EntryContext, optional
+            The render context the entry was generated with (see
+            `RenderContext.Record`). Defaults to None (not tracked).
+        """
+
+        record: dict[str, FileStamp] = {}
+        for filePath in inputs:
+            # the state seen by `IsEntryModified`, which is what has been read
+            current = self._observed.get(filePath)
+            if current is None:
+                try:
+                    current = self._Observe(filePath)
+                except FileNotFoundError:
+                    continue
+            record[filePath] = self._CreateStamp(filePath, current)
+
+        self._updatedEntries[entryKey] = record
+        if self._entries.get(entryKey) != record:
+            self._entries[entryKey] = record
+            self._isDirty = True
+
+        self._SetContext(entryKey, context)
+
+    def _GetHash(self, filePath: str, current: DependencyFile) -> str:
+        cachedHash = self._hashes.get(filePath)
+        if cachedHash is not None and cachedHash[:2] == (current.mtimeNs, current.size):
+            return cachedHash[2]
+
+        metrics.Count("files.hashed")
+        fileHash = HashFile(os.path.join(self._baseDir, filePath))
+        self._hashes[filePath] = (current.mtimeNs, current.size, fileHash)
+        return fileHash
+
+    def Update(
+        self,
+        filePath: str,
+        current: DependencyFile | None = None,
+    ) -> None:
+        """
+        Record the current state of a file (in memory, see `Save`).
+
+        Arguments
+        ---------
+        filePath : str
+            The path to the file (relative to the base directory).
+
+        current : DependencyFile, optional
+            The already known state of the file. Defaults to the state observed by the
+            last `IsModified` call of this run, or a new `stat` call otherwise.
+        """
+
+        if current is None:
+            current = self._observed.get(filePath) or _StatFile(filePath, self._baseDir)
+
+        stamp = self._CreateStamp(filePath, current)
+
+        self._updated[filePath] = stamp
+        if self._files.get(filePath) != stamp:
+            self._files[filePath] = stamp
+            self._isDirty = True
+
+    def TakeUpdates(self) -> ManifestUpdates:
+        """
+        Get and forget the stamps recorded by `Update` and `UpdateEntry` since the last
+            call, e.g. to send them from a worker process back to the manifest of the run
+            (see `Merge`).
+
+        Returns
+        -------
+        ManifestUpdates
+            The updated file stamps and entry records.
+        """
+
+        updates = ManifestUpdates(
+            self._updated,
+            self._updatedEntries,
+            self._updatedContexts,
+        )
+        self._updated = {}
+        self._updatedEntries = {}
+        self._updatedContexts = {}
+        return updates
+
+    def Merge(self, updates: ManifestUpdates) -> None:
+        """
+        Apply the stamps recorded by another copy of this manifest (in memory, see `Save`).
+
+        Arguments
+        ---------
+        updates : ManifestUpdates
+            The stamps returned by `TakeUpdates`.
+        """
+
+        for filePath, stamp in updates.files.items():
+            self._updated[filePath] = stamp
+            if self._files.get(filePath) != stamp:
+                self._files[filePath] = stamp
+                self._isDirty = True
+
+        for entryKey, record in updates.entries.items():
+            self._updatedEntries[entryKey] = record
+            if self._entries.get(entryKey) != record:
+                self._entries[entryKey] = record
+                self._isDirty = True
+
+        for entryKey, entryContext in updates.contexts.items():
+            self._SetContext(entryKey, entryContext)
+
+    def Save(self) -> None:
+        """
+        Write the manifest back atomically if it has been changed.
+        """
+
+        if not self._isDirty:
+            return
+
+        manifestPath = GetManifestFilePath(self._baseDir, self._tempFolder)
+        os.makedirs(os.path.dirname(manifestPath), exist_ok=True)
+
+        data = {
+            "version": MANIFEST_VERSION,
+            "files": {
+                filePath: [stamp.mtimeNs, stamp.size, stamp.hash]
+                for filePath, stamp in sorted(self._files.items())
+            },
+            "entries": {
+                entryKey: {
+                    filePath: [stamp.mtimeNs, stamp.size, stamp.hash]
+                    for filePath, stamp in sorted(inputs.items())
+                }
+                for entryKey, inputs in sorted(self._entries.items())
+            },
+            "contexts": {
+                entryKey: [entryContext.fingerprint, entryContext.variables]
+                for entryKey, entryContext in sorted(self._contexts.items())
+            },
+        }
+
+        tempManifestPath = f"{manifestPath}.tmp"
+        with metrics.Phase("manifest.save"):
+            with open(tempManifestPath, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tempManifestPath, manifestPath)
+
+        tempDir = os.path.join(self._baseDir, self._tempFolder)
+        for legacyStamp in self._legacyStamps:
+            try:
+                os.remove(os.path.join(tempDir, legacyStamp))
+            except OSError:
+                pass
+
+        self._legacyStamps = []
+        self._isDirty = False
+
+
+def HashFile(filePath: str) -> str:
+    """
+    Hash the content of a file in chunks with blake2b.
+
+    Args:
+        filePath (str): The path to the file.
+
+    Returns:
+        str: The hexadecimal digest of the content.
+    """
+
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(filePath, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            hasher.update(chunk)
+
+    return hasher.hexdigest()
+
+
+def _StatFile(filePath: str, baseDir: str) -> DependencyFile:
+    fullFilePath = os.path.join(baseDir, filePath)
+
+    try:
+        stat = os.stat(fullFilePath)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File '{fullFilePath}' does not exist.")
+
+    return DependencyFile(filePath, stat.st_mtime_ns, stat.st_size)
+
+
+def GetManifestFilePath(baseDir: str, tempFolder: str) -> str:
+    """
+    Get the path to the stamp manifest of a temporary folder.
+
+    Args:
+        baseDir (str): The base directory for resolving relative paths.
+        tempFolder (str): The temporary folder holding the manifest.
+
+    Returns:
+        str: The path to the manifest file.
+    """
+
+    return os.path.join(baseDir, tempFolder, MANIFEST_FILE)
 
 
 def GetStampFilePath(
@@ -8,7 +794,8 @@ def GetStampFilePath(
     tempFolder: str,
 ) -> str:
     """
-    Get the path to the stamp file for a given file.
+    Get the path to the legacy stamp file for a given file (only used for migrating
+        temporary folders to the stamp manifest).
 
     Args:
         filePath (str): The path to the original file (relative to the base directory).
@@ -19,13 +806,14 @@ def GetStampFilePath(
         str: The path to the corresponding stamp file.
     """
 
-    return os.path.join(baseDir, tempFolder, f"{filePath}.stamp")
+    return os.path.join(baseDir, tempFolder, f"{filePath}{LEGACY_STAMP_EXTENSION}")
 
 
 def IsFileModified(
     filePath: str,
     baseDir: str,
     tempFolder: str,
+    manifest: StampManifest | None = None,
 ) -> bool:
     """
     Check if a file has been modified based on its cache.
@@ -34,41 +822,44 @@ def IsFileModified(
         filePath (str): The path to the file to check (relative to the base directory).
         baseDir (str): The base directory for resolving relative paths.
         tempFolder (str): The temporary folder where stamp files are stored.
+        manifest (StampManifest, optional): The already loaded manifest of the run.
+            Loaded from the temporary folder if not provided.
 
     Returns:
         bool: True if the file has been modified, False otherwise.
     """
 
-    fullFilePath = os.path.join(baseDir, filePath)
-    stampFilePath = GetStampFilePath(filePath, baseDir, tempFolder)
-
-    if not os.path.exists(fullFilePath):
-        raise FileNotFoundError(f"File '{fullFilePath}' does not exist.")
+    if manifest is None:
+        manifest = StampManifest.Load(baseDir, tempFolder)
 
-    if not os.path.exists(stampFilePath):
-        return True
+    return manifest.IsModified(filePath)
 
-    if os.path.getmtime(fullFilePath) > os.path.getmtime(stampFilePath):
-        return True
 
-    return False
-
-
-def UpdateFileStamp(filePath: str, baseDir: str, tempFolder: str) -> None:
+def UpdateFileStamp(
+    filePath: str,
+    baseDir: str,
+    tempFolder: str,
+    manifest: StampManifest | None = None,
+) -> None:
     """
-    Update the stamp file for a given file to reflect its current modification time.
+    Update the stamp for a given file to reflect its current modification time.
 
     Args:
         filePath (str): The path to the original file (relative to the base directory).
         baseDir (str): The base directory for resolving relative paths.
         tempFolder (str): The temporary folder to store stamp files.
+        manifest (StampManifest, optional): The already loaded manifest of the run, which
+            is only updated in memory. If not provided, the manifest of the temporary
+            folder is loaded, updated and saved right away.
     """
 
-    stampFilePath = GetStampFilePath(filePath, baseDir, tempFolder)
+    if manifest is not None:
+        manifest.Update(filePath)
+        return
 
-    os.makedirs(os.path.dirname(stampFilePath), exist_ok=True)
-    with open(stampFilePath, "w") as file:
-        file.write("")
+    manifest = StampManifest.Load(baseDir, tempFolder)
+    manifest.Update(filePath)
+    manifest.Save()
 
 
 def ClearCache(baseDir: str, tempFolder: str) -> None:
@@ -1,88 +1,262 @@
 import os
+from dataclasses import dataclass
 from .log import logger
+from .metrics import metrics
 
 
-def _IsFileValid(
-    file: str,
-    extensions: list[str],
-) -> bool:
+@dataclass(frozen=True)
+class DependencyFile:
+    """
+    A single file found while scanning the dependency folders.
+
+    Attributes
+    ----------
+    path : str
+        The file path relative to the base directory.
+
+    mtimeNs : int
+        The modification time of the file in nanoseconds.
+
+    size : int
+        The size of the file in bytes.
+    """
+
+    path: str
+    mtimeNs: int
+    size: int
+
+
+def ScanDependencyFolder(
+    folder: str,
+    extensions: frozenset[str],
+    baseDir: str,
+) -> list[DependencyFile]:
     """
-    Check if the file has a valid extension.
+    Scan a single dependency folder with exactly one `os.scandir` call per directory.
 
     Arguments
     ---------
-    file : str
-        The file path.
+    folder : str
+        The absolute folder path.
 
-    extensions : list[str]
-        The list of valid extensions.
+    extensions : frozenset[str]
+        The set of valid extensions (including the leading dot).
+
+    baseDir: str,
+        The base directory for resolving relative paths.
 
     Returns
     -------
-    bool
-        True if the file has a valid extension, False otherwise.
+    list[DependencyFile]
+        The matched files, sorted by their relative path.
     """
 
-    _, ext = os.path.splitext(file)
-    return ext in extensions
+    if not os.path.isdir(folder):
+        logger.warning(f'Folder path "{folder}" does not exist, skipping...')
+        return []
 
+    foundFiles: list[DependencyFile] = []
+    pendingFolders = [folder]
 
-def _LoadFilesRecursively(
-    finalFiles: set[str],
-    folder: str,
+    while pendingFolders:
+        currentFolder = pendingFolders.pop()
+
+        try:
+            entries = os.scandir(currentFolder)
+        except OSError as e:
+            logger.warning(f'Cannot scan folder "{currentFolder}": {e}, skipping...')
+            continue
+
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pendingFolders.append(entry.path)
+                    continue
+
+                if os.path.splitext(entry.name)[1] not in extensions:
+                    continue
+
+                if not entry.is_file():
+                    continue
+
+                stat = entry.stat()
+                foundFiles.append(
+                    DependencyFile(
+                        path=os.path.relpath(entry.path, baseDir),
+                        mtimeNs=stat.st_mtime_ns,
+                        size=stat.st_size,
+                    )
+                )
+
+    foundFiles.sort(key=lambda dependencyFile: dependencyFile.path)
+    return foundFiles
+
+
+def _StatDependencyFiles(
+    files: list[DependencyFile],
+    baseDir: str,
+) -> list[DependencyFile]:
+    """
+    Take the stats of already listed files again, the files which no longer exist are
+        dropped.
+    """
+
+    statedFiles: list[DependencyFile] = []
+    for dependencyFile in files:
+        try:
+            stat = os.stat(os.path.join(baseDir, dependencyFile.path))
+        except OSError:
+            continue
+
+        statedFiles.append(
+            DependencyFile(
+                path=dependencyFile.path,
+                mtimeNs=stat.st_mtime_ns,
+                size=stat.st_size,
+            )
+        )
+
+    return statedFiles
+
+
+class DependencyScanCache:
+    """
+    Memoizes the dependency folder scans, keyed on the scanned folder and the extensions.
+
+    One instance is shared by every template and binding of an `Autogen` run, so a folder
+    which is listed by many entries is only walked once. The instance can also be kept by
+    the caller and passed to several runs (e.g. in a watch loop): each run calls `NewRun`,
+    after which the files of a reused listing are stat'ed again, so that a file modified
+    in place is never checked against its old stats. The caller is responsible for
+    calling `Invalidate` whenever files are added to or removed from the folders.
+
+    Attributes
+    ----------
+    hits : int
+        The number of scans served from the memo.
+
+    misses : int
+        The number of scans which had to walk the folder.
+    """
+
+    def __init__(self) -> None:
+        self._scans: dict[
+            tuple[str, frozenset[str], str], tuple[int, list[DependencyFile]]
+        ] = {}
+        self._run = 0
+        self.hits = 0
+        self.misses = 0
+
+    def NewRun(self) -> None:
+        """
+        Start a new run: the stats of the scans memoized by the previous runs are taken
+            again the next time they are used, only the listings of the folders are kept.
+        """
+
+        self._run += 1
+
+    def ScanFolder(
+        self,
+        folder: str,
+        extensions: frozenset[str],
+        baseDir: str,
+    ) -> list[DependencyFile]:
+        """
+        Same as `ScanDependencyFolder` but served from the memo when possible.
+        """
+
+        key = (os.path.normpath(folder), extensions, baseDir)
+        memo = self._scans.get(key)
+
+        if memo is not None:
+            self.hits += 1
+            metrics.Count("scan.cacheHits")
+            run, scan = memo
+            if run != self._run:
+                scan = _StatDependencyFiles(scan, baseDir)
+                metrics.Count("scan.restats", len(scan))
+                self._scans[key] = (self._run, scan)
+            return scan
+
+        self.misses += 1
+        with metrics.Phase("scan", folder):
+            scan = ScanDependencyFolder(folder, extensions, baseDir)
+        metrics.Count("scan.files", len(scan))
+        self._scans[key] = (self._run, scan)
+        return scan
+
+    def Invalidate(self, folder: str | None = None) -> None:
+        """
+        Drop the memoized scans.
+
+        Arguments
+        ---------
+        folder : str, optional
+            Only drop the scans whose folder contains this path. Drop everything if None.
+        """
+
+        if folder is None:
+            self._scans.clear()
+            return
+
+        folder = os.path.normpath(folder)
+        for key in list(self._scans):
+            scannedFolder = key[0]
+            if folder == scannedFolder or folder.startswith(scannedFolder + os.sep):
+                del self._scans[key]
+
+
+def ScanDependencies(
+    dependencies: list[str],
     extensions: list[str],
     baseDir: str,
-) -> set[str]:
+    scanCache: DependencyScanCache | None = None,
+) -> list[DependencyFile]:
     """
-    Load all files in the folder recursively.
+    Scan all dependency folders once and collect the matched files with their stats.
 
     Arguments
     ---------
-    finalFiles : list[str]
-        The list of files to append to.
-
-    folder : str
-        The folder path.
+    dependencies : list[str]
+        The list of dependency folders (relative to the base directory).
 
     extensions : list[str]
-        The list of valid extensions.
+        The list of extensions to consider.
 
     baseDir: str,
         The base directory for resolving relative paths.
 
+    scanCache: DependencyScanCache, optional
+        The memo to serve the folder scans from. Defaults to None (always scan).
+
     Returns
     -------
-    list[str]
-        The list of files.
+    list[DependencyFile]
+        The matched files without duplicates, sorted by their relative path.
     """
 
-    if not os.path.exists(folder):
-        logger.warning(f'Folder path "{folder}" does not exist, skipping...')
-        return finalFiles
-
-    for root, _folders, files in os.walk(folder):
-        for file in files:
-            fullPath = os.path.join(root, file)
-
-            if _IsFileValid(fullPath, extensions):
-                relPath = os.path.relpath(fullPath, baseDir)
-                finalFiles.add(relPath)
-
-        for _folder in _folders:
-            _LoadFilesRecursively(
-                finalFiles,
-                os.path.join(root, _folder),
-                extensions,
-                baseDir,
-            )
+    extensionSet = frozenset(extensions)
+    allFiles: dict[str, DependencyFile] = {}
+
+    for dep in dependencies:
+        folder = os.path.join(baseDir, dep)
+        folderFiles = (
+            scanCache.ScanFolder(folder, extensionSet, baseDir)
+            if scanCache is not None
+            else ScanDependencyFolder(folder, extensionSet, baseDir)
+        )
 
-    return finalFiles
+        for dependencyFile in folderFiles:
+            allFiles.setdefault(dependencyFile.path, dependencyFile)
+
+    return [allFiles[path] for path in sorted(allFiles)]
 
 
 def AllDependenciesFiles(
     dependencies: list[str],
     extensions: list[str],
     baseDir: str,
+    scanCache: DependencyScanCache | None = None,
 ) -> list[str]:
     """
     List all files in the dependencies (folders) recursively.
@@ -98,21 +272,48 @@ def AllDependenciesFiles(
     baseDir: str,
         The base directory for resolving relative paths.
 
+    scanCache: DependencyScanCache, optional
+        The memo to serve the folder scans from. Defaults to None (always scan).
+
     Returns
     -------
     list[str]
         The list of all files in the dependencies.
     """
 
-    allFiles: set[str] = set()
-    for dep in dependencies:
-        allFiles.update(
-            _LoadFilesRecursively(
-                allFiles,
-                os.path.join(baseDir, dep),
-                extensions,
-                baseDir,
-            )
+    return [
+        dependencyFile.path
+        for dependencyFile in ScanDependencies(
+            dependencies,
+            extensions,
+            baseDir,
+            scanCache,
         )
+    ]
+
+
+def RelativeToBaseDir(path: str, baseDir: str) -> str:
+    """
+    Express a path relatively to the base directory, as the paths tracked by the stamp
+        manifest.
+
+    Arguments
+    ---------
+    path : str
+        The path, absolute or relative to the base directory.
+
+    baseDir : str
+        The base directory.
+
+    Returns
+    -------
+    str
+        The path relative to the base directory, or the absolute path if it is outside of
+        the base directory.
+    """
 
-    return list(allFiles)
+    fullPath = os.path.normpath(os.path.join(baseDir, path))
+    relativePath = os.path.relpath(fullPath, baseDir)
+    if relativePath == os.pardir or relativePath.startswith(os.pardir + os.sep):
+        return fullPath
+    return relativePath
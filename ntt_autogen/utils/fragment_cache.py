@@ -0,0 +1,141 @@
+import os
+import json
+import hashlib
+from typing import Any, Callable
+from .log import logger
+from .metrics import metrics
+
+FRAGMENT_CACHE_FOLDER = "fragment-cache"
+FRAGMENT_CACHE_VERSION = 2
+
+_MISSING: Any = object()
+
+
+def _FragmentKey(macro: Callable[[Any], Any], declaration: Any, comments: bool) -> str:
+    # the serialized declarations only hold builtin values in a fixed order, their repr
+    # is a stable key and much cheaper than JSON
+    return hashlib.blake2b(
+        repr((getattr(macro, "name", None), declaration.ToDict(comments))).encode(
+            "utf-8"
+        ),
+        digest_size=16,
+    ).hexdigest()
+
+
+class FragmentCache:
+    """
+    Keeps the fragments of an output rendered per declaration by the `fragment(macro,
+        declaration)` helper of the binding templates, so that only the declarations which
+        changed are rendered again.
+
+    A fragment is keyed by the name of the macro and the serialized declaration (see
+    `PyObject.ToDict`), without its comments unless the macro read them: the comments of
+    a declaration loaded from the parse cache are then never read for nothing. The whole
+    cache is dropped when its digest changes.
+
+    Arguments
+    ---------
+    filePath : str
+        The file storing the fragments.
+
+    digest : str
+        The fingerprint of what the fragments depend on besides their declaration (the
+        templates, the render context...).
+
+    Notes
+    -----
+    A fragment macro must only depend on its declaration and on the render context, not
+        on the variables of the loop calling it.
+    """
+
+    def __init__(self, filePath: str, digest: str) -> None:
+        self._filePath = filePath
+        self._digest = digest
+        # a key mapped to None is the one of a fragment which depends on the comments
+        self._cached: dict[str, str | None] = {}
+        self._fragments: dict[str, str | None] = {}
+
+        try:
+            with open(filePath, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if data.get("version") == FRAGMENT_CACHE_VERSION and data["digest"] == digest:
+            self._cached = data["fragments"]
+        else:
+            logger.debug('Dropping the outdated fragments of "%s".', filePath)
+
+    def Render(self, macro: Callable[[Any], Any], declaration: Any) -> str:
+        """
+        Render a declaration with a macro, or reuse its cached fragment.
+
+        Arguments
+        ---------
+        macro : Callable[[Any], Any]
+            The Jinja macro rendering one declaration.
+
+        declaration : Any
+            The declaration, which has the `ToDict` and `CommentReads` methods.
+
+        Returns
+        -------
+        str
+            The rendered fragment.
+        """
+
+        withComments = False
+        key = _FragmentKey(macro, declaration, withComments)
+        fragment = self._Lookup(key)
+        if fragment is None:
+            withComments = True
+            key = _FragmentKey(macro, declaration, withComments)
+            fragment = self._Lookup(key)
+
+        if fragment is _MISSING:
+            commentReads = declaration.CommentReads()
+            fragment = str(macro(declaration))
+            metrics.Count("fragments.rendered")
+
+            # the comments read by the macro become part of the key
+            if not withComments and declaration.CommentReads() != commentReads:
+                self._fragments[key] = None
+                key = _FragmentKey(macro, declaration, True)
+            self._fragments[key] = fragment
+
+        return fragment
+
+    def _Lookup(self, key: str) -> Any:
+        if key in self._fragments:
+            return self._fragments[key]
+
+        if key not in self._cached:
+            return _MISSING
+
+        fragment = self._fragments[key] = self._cached[key]
+        if fragment is not None:
+            metrics.Count("fragments.reused")
+        return fragment
+
+    def Save(self) -> None:
+        """
+        Write the fragments rendered or reused since the creation back atomically, the
+            ones of the removed declarations are dropped.
+        """
+
+        if self._fragments == self._cached:
+            return
+
+        os.makedirs(os.path.dirname(self._filePath), exist_ok=True)
+        tempFilePath = f"{self._filePath}.{os.getpid()}.tmp"
+        with open(tempFilePath, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": FRAGMENT_CACHE_VERSION,
+                    "digest": self._digest,
+                    "fragments": self._fragments,
+                },
+                f,
+                separators=(",", ":"),
+            )
+        os.replace(tempFilePath, self._filePath)
@@ -0,0 +1,83 @@
+from typing import Any, Callable, Iterable, TypeVar
+from concurrent.futures import Future, ThreadPoolExecutor
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class IOPool:
+    """
+    A bounded pool of threads running the blocking file operations of a run (stats,
+        reads, closing and renaming the outputs) concurrently, so that the latency of each
+        operation is overlapped instead of paid in sequence.
+
+    Arguments
+    ---------
+    workers : int
+        The number of threads, usually the `ioWorkers` of the settings.
+
+    Notes
+    -----
+    The pool does not log nor record stamps: the results are handed back to the calling
+        thread, which applies them in a deterministic order.
+    """
+
+    def __init__(self, workers: int) -> None:
+        assert workers >= 1, f"The I/O pool needs at least 1 worker, got {workers}."
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="autogen-io",
+        )
+
+    def Submit(self, function: Callable[..., R], *args: Any) -> "Future[R]":
+        """
+        Run a file operation in the pool.
+
+        Arguments
+        ---------
+        function : Callable
+            The operation.
+
+        args : Any
+            Its arguments.
+
+        Returns
+        -------
+        Future
+            The future result of the operation.
+        """
+
+        return self._executor.submit(function, *args)
+
+    def Map(self, function: Callable[[T], R], items: Iterable[T]) -> list[R]:
+        """
+        Run an operation on several items concurrently.
+
+        Arguments
+        ---------
+        function : Callable
+            The operation, called with each item.
+
+        items : Iterable
+            The items.
+
+        Returns
+        -------
+        list
+            The results, in the order of the items.
+        """
+
+        return list(self._executor.map(function, items))
+
+    def Close(self) -> None:
+        """
+        Wait for the submitted operations and stop the threads.
+        """
+
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "IOPool":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.Close()
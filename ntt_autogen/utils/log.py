@@ -1,4 +1,16 @@
+import os
+import sys
+import queue
+import atexit
 import logging
+from typing import Any, Callable, Iterator, TYPE_CHECKING
+from contextlib import contextmanager
+
+if TYPE_CHECKING:
+    from logging.handlers import QueueHandler, QueueListener
+
+LOG_LEVEL_ENV = "NTT_AUTOGEN_LOG_LEVEL"  # overrides the default log level
+DEFAULT_LOG_LEVEL = "INFO"
 
 
 class ColorStreamHandler(logging.Handler):
@@ -19,12 +31,132 @@ class ColorStreamHandler(logging.Handler):
         color_code = self.COLOR_CODES.get(record.levelname, self.RESET_CODE)
         message = self.format(record)
         colored_message = f"{color_code}{message}{self.RESET_CODE}"
-        print(colored_message)
+        # a single write, so that the lines of several threads are not interleaved
+        sys.stdout.write(f"{colored_message}\n")
+
+
+class LazyMessage:
+    """
+    A log argument only built if the record is emitted, for the debug payloads which are
+        expensive to format (e.g. `logger.debug("Files: %s", LazyMessage(lambda: ...))`).
+
+    Arguments
+    ---------
+    function : Callable[[], Any]
+        Builds the payload.
+    """
+
+    def __init__(self, function: Callable[[], Any]) -> None:
+        self._function = function
+        self._message: str | None = None
+
+    def __str__(self) -> str:
+        # built once, whatever the number of handlers formatting the record
+        if self._message is None:
+            self._message = str(self._function())
+        return self._message
+
+
+def SetLogLevel(level: int | str) -> None:
+    """
+    Set the level of the autogen logger.
+
+    Arguments
+    ---------
+    level : int | str
+        The level, e.g. `logging.DEBUG` or "DEBUG".
+    """
+
+    logger.setLevel(level.upper() if isinstance(level, str) else level)
+
+
+# the writer thread of `BackgroundLogging`, None when the records are written directly
+_listener: "QueueListener | None" = None
+_queueHandler: "QueueHandler | None" = None
+
+
+def _StartBackgroundWriter() -> None:
+    global _listener, _queueHandler
+    from logging.handlers import QueueHandler, QueueListener
+
+    logQueue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    _queueHandler = QueueHandler(logQueue)  # type: ignore
+    _listener = QueueListener(logQueue, handler)  # type: ignore
+    _listener.start()
+
+    logger.removeHandler(handler)
+    logger.addHandler(_queueHandler)
+
+
+def _StopBackgroundWriter() -> None:
+    global _listener, _queueHandler
+
+    if _listener is None:
+        return
+
+    logger.removeHandler(_queueHandler)  # type: ignore
+    logger.addHandler(handler)
+
+    _listener.stop()  # writes the pending records
+    _listener = None
+    _queueHandler = None
+
+
+def _UseDirectWriterInChild() -> None:
+    global _listener, _queueHandler
+
+    # the writer thread is not copied into a forked process
+    if _listener is not None:
+        logger.removeHandler(_queueHandler)  # type: ignore
+        logger.addHandler(handler)
+        _listener = None
+        _queueHandler = None
+
+
+@contextmanager
+def BackgroundLogging() -> Iterator[None]:
+    """
+    Write the log records to the console from a background thread while in the block, so
+        that the console I/O does not slow the generation down. The pending records are
+        written when leaving the block. Nested blocks share the same thread.
+    """
+
+    if _listener is not None:
+        yield
+        return
+
+    _StartBackgroundWriter()
+    try:
+        yield
+    finally:
+        _StopBackgroundWriter()
+
+
+@contextmanager
+def ForegroundLogging() -> Iterator[None]:
+    """
+    Write the log records directly while in the block, suspending `BackgroundLogging`,
+        e.g. while forking worker processes, which must not be forked while the writer
+        thread may hold the console lock.
+    """
+
+    if _listener is None:
+        yield
+        return
+
+    _StopBackgroundWriter()
+    try:
+        yield
+    finally:
+        _StartBackgroundWriter()
 
 
 logger = logging.getLogger("AUTOGEN")
-logger.setLevel(logging.DEBUG)
+logger.setLevel(os.environ.get(LOG_LEVEL_ENV, DEFAULT_LOG_LEVEL).upper())
 formatter = logging.Formatter("[%(name)7s] - [%(levelname)7s] - %(message)s")
 handler = ColorStreamHandler()
 handler.setFormatter(formatter)
 logger.addHandler(handler)
+
+os.register_at_fork(after_in_child=_UseDirectWriterInChild)
+atexit.register(_StopBackgroundWriter)
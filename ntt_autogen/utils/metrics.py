@@ -0,0 +1,236 @@
+import os
+import json
+import time
+import threading
+from typing import Any, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+METRICS_REPORT_VERSION = 1
+
+
+@dataclass
+class MetricsData:
+    """
+    The timings and counters recorded by a process, sent back by the worker processes
+        (see `Metrics.Take` and `Metrics.Merge`).
+    """
+
+    phases: dict[str, list[float]] = field(default_factory=dict)  # [count, seconds]
+    counters: dict[str, int] = field(default_factory=dict)
+    events: list[dict[str, Any]] = field(default_factory=list)  # trace events
+
+
+class Metrics:
+    """
+    Records how long the phases of a run take (scanning, checking the stamps, parsing,
+        compiling and rendering the templates, writing the outputs...) and counts what
+        they process, to be written as a JSON report or a Chrome trace.
+
+    Use the shared `metrics` instance.
+
+    Arguments
+    ---------
+    trace : bool, optional
+        Whether the trace events are recorded, see `Reset`. Defaults to False.
+
+    Notes
+    -----
+    The time of a phase includes the time of the phases nested in it.
+    """
+
+    def __init__(self, trace: bool = False) -> None:
+        self._lock = threading.Lock()
+        self._data = MetricsData()
+        self._start = time.perf_counter()
+        self._trace = trace
+
+    @property
+    def tracing(self) -> bool:
+        """
+        Whether the trace events are recorded.
+        """
+        return self._trace
+
+    def Reset(self, trace: bool = False) -> None:
+        """
+        Forget everything recorded so far, e.g. before a new run.
+
+        Arguments
+        ---------
+        trace : bool, optional
+            Whether the trace events are recorded until the next reset, for
+            `WriteTrace`. They are kept in memory for every phase, so only when a trace
+            is written. Defaults to False.
+        """
+
+        with self._lock:
+            self._data = MetricsData()
+            self._start = time.perf_counter()
+            self._trace = trace
+
+    @contextmanager
+    def Phase(self, name: str, detail: str | None = None) -> Iterator[None]:
+        """
+        Time a phase of the run.
+
+        Arguments
+        ---------
+        name : str
+            The name of the phase, the phases of the same name are summed in the report.
+
+        detail : str, optional
+            What the phase processes (e.g. the template file), only shown in the trace.
+            Defaults to None.
+        """
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                phase = self._data.phases.setdefault(name, [0, 0.0])
+                phase[0] += 1
+                phase[1] += end - start
+
+                if self._trace:
+                    event: dict[str, Any] = {
+                        "name": name,
+                        "ph": "X",
+                        "ts": start * 1e6,
+                        "dur": (end - start) * 1e6,
+                        "pid": os.getpid(),
+                        "tid": threading.get_ident(),
+                    }
+                    if detail is not None:
+                        event["args"] = {"detail": detail}
+                    self._data.events.append(event)
+
+    def Count(self, name: str, value: int = 1) -> None:
+        """
+        Add to a counter.
+
+        Arguments
+        ---------
+        name : str
+            The name of the counter, e.g. "outputs.written".
+
+        value : int, optional
+            The amount to add. Defaults to 1.
+        """
+
+        with self._lock:
+            self._data.counters[name] = self._data.counters.get(name, 0) + value
+
+    def Take(self) -> MetricsData:
+        """
+        Get what has been recorded since the last call, to send it to another process.
+
+        Returns
+        -------
+        MetricsData
+            The recorded timings, counters and trace events.
+        """
+
+        with self._lock:
+            data = self._data
+            self._data = MetricsData()
+        return data
+
+    def Merge(self, data: MetricsData) -> None:
+        """
+        Add what has been recorded by another process.
+
+        Arguments
+        ---------
+        data : MetricsData
+            The data returned by `Take`.
+        """
+
+        with self._lock:
+            for name, (count, seconds) in data.phases.items():
+                phase = self._data.phases.setdefault(name, [0, 0.0])
+                phase[0] += count
+                phase[1] += seconds
+            for name, value in data.counters.items():
+                self._data.counters[name] = self._data.counters.get(name, 0) + value
+            self._data.events.extend(data.events)
+
+    def Report(self) -> dict[str, Any]:
+        """
+        Summarize what has been recorded.
+
+        Returns
+        -------
+        dict[str, Any]
+            The wall time since the last reset, the count and total time of each phase
+            and the counters, all times in milliseconds.
+        """
+
+        with self._lock:
+            return {
+                "version": METRICS_REPORT_VERSION,
+                "wallMs": (time.perf_counter() - self._start) * 1000,
+                "phases": {
+                    name: {"count": count, "totalMs": seconds * 1000}
+                    for name, (count, seconds) in sorted(self._data.phases.items())
+                },
+                "counters": dict(sorted(self._data.counters.items())),
+            }
+
+    def WriteReport(self, filePath: str) -> None:
+        """
+        Write the report (see `Report`) as JSON.
+
+        Arguments
+        ---------
+        filePath : str
+            The path of the report file.
+        """
+
+        _WriteJson(filePath, self.Report())
+
+    def WriteTrace(self, filePath: str) -> None:
+        """
+        Write the phases in the Chrome trace event format, which can be opened with
+            chrome://tracing or https://ui.perfetto.dev. The worker processes are shown
+            as separate processes. Only the phases recorded while tracing are written
+            (see `Reset`).
+
+        Arguments
+        ---------
+        filePath : str
+            The path of the trace file.
+        """
+
+        with self._lock:
+            events = list(self._data.events)
+            counters = dict(self._data.counters)
+
+        # the counters are shown as their final value at the end of the trace
+        end = max((event["ts"] + event["dur"] for event in events), default=0.0)
+        events.extend(
+            {
+                "name": name,
+                "ph": "C",
+                "ts": end,
+                "pid": os.getpid(),
+                "args": {name: value},
+            }
+            for name, value in sorted(counters.items())
+        )
+
+        _WriteJson(filePath, {"traceEvents": events, "displayTimeUnit": "ms"})
+
+
+def _WriteJson(filePath: str, data: dict[str, Any]) -> None:
+    folder = os.path.dirname(filePath)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+
+    with open(filePath, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=4)
+
+
+metrics = Metrics()
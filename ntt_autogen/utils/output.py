@@ -0,0 +1,199 @@
+import os
+import filecmp
+from typing import IO, Iterable, TYPE_CHECKING
+from .log import logger
+from .metrics import metrics
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+    from .io_pool import IOPool
+
+WRITE_BUFFER_SIZE = 64 * 1024  # characters gathered before writing to the outputs
+
+
+class OutputWriter:
+    """
+    Streams the rendered chunks into the output files, only replacing the outputs whose
+        content has changed so that their modification time (and the rebuilds of what
+        depends on them) is kept otherwise.
+
+    Attributes
+    ----------
+    written : int
+        The number of outputs created or replaced.
+    unchanged : int
+        The number of outputs left untouched since their content was already the same.
+
+    Arguments
+    ---------
+    ioPool : IOPool, optional
+        When given, the outputs are closed, compared and replaced in the pool while the
+        next outputs are rendered, and `Flush` must be called to wait for them. Defaults
+        to None, in which case `Write` returns once the outputs are replaced.
+    """
+
+    def __init__(self, ioPool: "IOPool | None" = None) -> None:
+        self.written = 0
+        self.unchanged = 0
+        self._ioPool = ioPool
+        self._pending: list[tuple[list[str], "Future[list[bool]]"]] = []
+
+    def Write(
+        self,
+        chunks: Iterable[str],
+        outputPaths: list[str],
+        keepContent: bool = False,
+    ) -> str | None:
+        """
+        Stream the rendered chunks into several output files at once. Each output is
+            written into a temporary file next to it, which then replaces the output if the
+            content differs, so an output is never left half-written.
+
+        Arguments
+        ---------
+        chunks : Iterable[str]
+            The rendered content, e.g. `jinjaTemplate.generate(...)`. It is only iterated
+            once.
+
+        outputPaths : list[str]
+            The paths of the output files, their folders are created if needed.
+
+        keepContent : bool
+            Whether the whole content is also kept and returned. Defaults to False, in
+            which case only one batch of chunks is held in memory at a time.
+
+        Returns
+        -------
+        str | None
+            The whole content if `keepContent` is set, None otherwise.
+        """
+
+        tempPaths = [f"{outputPath}.{os.getpid()}.tmp" for outputPath in outputPaths]
+        files: list[IO[str]] = []
+        parts: list[str] | None = [] if keepContent else None
+
+        try:
+            for outputPath, tempPath in zip(outputPaths, tempPaths):
+                os.makedirs(os.path.dirname(outputPath), exist_ok=True)
+                files.append(open(tempPath, "w"))
+
+            # the chunks are rendered while iterated, so this also times the rendering
+            with metrics.Phase("render", outputPaths[0] if outputPaths else None):
+                # the template chunks are small, they are written by batches
+                buffer: list[str] = []
+                bufferSize = 0
+                for chunk in chunks:
+                    buffer.append(chunk)
+                    bufferSize += len(chunk)
+                    if bufferSize >= WRITE_BUFFER_SIZE:
+                        _WriteBuffer(buffer, files, parts)
+                        buffer = []
+                        bufferSize = 0
+                _WriteBuffer(buffer, files, parts)
+        except BaseException:
+            _Discard(files, tempPaths)
+            raise
+
+        if self._ioPool is None:
+            self._Apply(outputPaths, _Commit(files, outputPaths, tempPaths))
+        else:
+            future = self._ioPool.Submit(_Commit, files, outputPaths, tempPaths)
+            self._pending.append((outputPaths, future))
+
+        return "".join(parts) if parts is not None else None
+
+    def Flush(self) -> None:
+        """
+        Wait for the outputs being written in the I/O pool. They are counted and logged in
+            the order of the `Write` calls, whatever the order they finish in.
+
+        Raises
+        ------
+        Exception
+            The first error met while replacing the outputs, once all of them are done.
+        """
+
+        pending = self._pending
+        self._pending = []
+
+        error: Exception | None = None
+        for outputPaths, future in pending:
+            try:
+                replaced = future.result()
+            except Exception as e:
+                error = error or e
+                continue
+            self._Apply(outputPaths, replaced)
+
+        if error is not None:
+            raise error
+
+    def _Apply(self, outputPaths: list[str], replaced: list[bool]) -> None:
+        for outputPath, isReplaced in zip(outputPaths, replaced):
+            if isReplaced:
+                self.written += 1
+                metrics.Count("outputs.written")
+            else:
+                self.unchanged += 1
+                metrics.Count("outputs.unchanged")
+                logger.debug('Output "%s" is unchanged, kept as is.', outputPath)
+
+
+def _Commit(
+    files: list[IO[str]],
+    outputPaths: list[str],
+    tempPaths: list[str],
+) -> list[bool]:
+    # closes the temporary files and replaces the outputs whose content changed
+    with metrics.Phase("write", outputPaths[0] if outputPaths else None):
+        try:
+            for file in files:
+                file.close()
+
+            replaced: list[bool] = []
+            for outputPath, tempPath in zip(outputPaths, tempPaths):
+                if _IsSameContent(tempPath, outputPath):
+                    os.remove(tempPath)
+                    replaced.append(False)
+                else:
+                    os.replace(tempPath, outputPath)
+                    replaced.append(True)
+        except BaseException:
+            _Discard(files, tempPaths)
+            raise
+
+    return replaced
+
+
+def _Discard(files: list[IO[str]], tempPaths: list[str]) -> None:
+    for file in files:
+        file.close()
+    for tempPath in tempPaths:
+        if os.path.exists(tempPath):
+            os.remove(tempPath)
+
+
+def _IsSameContent(tempPath: str, outputPath: str) -> bool:
+    try:
+        outputSize = os.stat(outputPath).st_size
+    except FileNotFoundError:
+        return False
+
+    # the sizes differ for most changes, the bytes are only compared otherwise
+    if outputSize != os.stat(tempPath).st_size:
+        return False
+
+    return filecmp.cmp(tempPath, outputPath, shallow=False)
+
+
+def _WriteBuffer(
+    buffer: list[str],
+    files: list[IO[str]],
+    parts: list[str] | None,
+) -> None:
+    data = "".join(buffer)
+    metrics.Count("render.characters", len(data))
+    for file in files:
+        file.write(data)
+    if parts is not None:
+        parts.append(data)
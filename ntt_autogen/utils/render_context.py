@@ -0,0 +1,107 @@
+import re
+import json
+import hashlib
+from typing import Any, Mapping
+from .cache import EntryContext
+
+_ADDRESS = re.compile(r" at 0x[0-9A-Fa-f]+")
+
+
+def _StableRepr(value: Any) -> str:
+    # the default repr of an object (or a function) holds its address
+    return _ADDRESS.sub("", repr(value))
+
+
+def Fingerprint(data: Any) -> str:
+    """
+    Hash JSON-like data, e.g. a serialized declaration or a render context.
+
+    Arguments
+    ---------
+    data : Any
+        The data. The values which are not JSON serializable are hashed by their `repr`
+        without the addresses it may hold, so that the fingerprint is stable across runs.
+
+    Returns
+    -------
+    str
+        The hexadecimal blake2b digest of the data.
+    """
+
+    key = json.dumps(data, sort_keys=True, separators=(",", ":"), default=_StableRepr)
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class RenderContext:
+    """
+    What an entry is rendered with besides its input files: its settings and the render
+        data (the keyword arguments of `Autogen`), fingerprinted so that a change of
+        either makes the entry stale (see `StampManifest.ExplainEntry`).
+
+    Arguments
+    ---------
+    settings : Any
+        The settings of the entry, e.g. `asdict(template)`.
+
+    renderData : Mapping[str, Any]
+        The data passed to the templates of the entry.
+
+    Notes
+    -----
+    Only the render variables read by the templates of the entry are fingerprinted, so a
+        change of the others does not make the entry stale. The values which are not JSON
+        serializable (e.g. functions) are compared by their `repr` without addresses: a
+        change which does not show in it does not make the entry stale.
+    """
+
+    def __init__(self, settings: Any, renderData: Mapping[str, Any]) -> None:
+        self._settings = settings
+        self._renderData = renderData
+
+    def Fingerprint(self, variables: list[str] | None) -> str:
+        """
+        Fingerprint the settings and the values of some render variables.
+
+        Arguments
+        ---------
+        variables : list[str] | None
+            The names of the variables read by the templates (see
+            `FindTemplateReferences`), or None when they are not known, in which case all
+            the render data is fingerprinted.
+
+        Returns
+        -------
+        str
+            The fingerprint.
+        """
+
+        values = (
+            dict(self._renderData)
+            if variables is None
+            else {
+                name: self._renderData[name]
+                for name in variables
+                if name in self._renderData
+            }
+        )
+        return Fingerprint({"settings": self._settings, "values": values})
+
+    def Record(self, variables: list[str] | None) -> EntryContext:
+        """
+        Get the context to record for a generated entry (see `StampManifest.UpdateEntry`).
+
+        Arguments
+        ---------
+        variables : list[str] | None
+            The names of the variables read by the templates, None when they are not known.
+
+        Returns
+        -------
+        EntryContext
+            The variables along with their fingerprint.
+        """
+
+        return EntryContext(
+            sorted(variables) if variables is not None else None,
+            self.Fingerprint(variables),
+        )
@@ -0,0 +1,308 @@
+import os
+import sys
+import time
+import ctypes
+import select
+import struct
+import threading
+from typing import Any
+from .autogen import Autogen
+from .utils import logger, metrics, LazyMessage, DependencyScanCache
+
+# inotify(7) constants, see <sys/inotify.h>
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+)
+_EVENT_HEADER = struct.Struct("iIII")
+_IGNORED_FOLDER_NAMES = frozenset([".git", ".hg", ".svn", "__pycache__"])
+_READ_SIZE = 64 * 1024
+
+
+class _InotifyEventSource:
+    """
+    Reports the files changed under a folder with inotify. The excluded folders (e.g. the
+        temporary folder) are not watched.
+    """
+
+    def __init__(self, folder: str, excludedFolders: list[str]) -> None:
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self._excludedFolders = [os.path.normpath(path) for path in excludedFolders]
+        self._folders: dict[int, str] = {}
+        self._AddTree(folder)
+
+    def _AddTree(self, folder: str) -> list[str]:
+        files: list[str] = []
+        stack = [folder]
+        while stack:
+            current = os.path.normpath(stack.pop())
+            if current in self._excludedFolders:
+                continue
+
+            wd = self._libc.inotify_add_watch(
+                self._fd, os.fsencode(current), _WATCH_MASK
+            )
+            if wd < 0:
+                logger.warning(f'Cannot watch folder "{current}", ignoring...')
+                continue
+            self._folders[wd] = current
+
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in _IGNORED_FOLDER_NAMES:
+                                stack.append(entry.path)
+                        else:
+                            files.append(entry.path)
+            except OSError:
+                continue
+
+        return files
+
+    def Wait(self, timeout: float) -> list[str] | None:
+        """
+        Wait for changes.
+
+        Arguments
+        ---------
+        timeout : float
+            The maximum time to wait, in seconds.
+
+        Returns
+        -------
+        list[str] | None
+            The changed files (empty if nothing changed), or None if some events have been
+            lost and every file must be checked.
+        """
+
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return []
+
+        try:
+            data = os.read(self._fd, _READ_SIZE)
+        except BlockingIOError:
+            return []
+
+        changedFiles: list[str] = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+
+            if mask & _IN_Q_OVERFLOW:
+                return None
+
+            folder = self._folders.get(wd)
+            if folder is None or not name:
+                continue
+
+            path = os.path.join(folder, name)
+            if mask & _IN_ISDIR:
+                # the files may have been created before the folder is watched
+                if mask & (_IN_CREATE | _IN_MOVED_TO):
+                    changedFiles.extend(self._AddTree(path))
+                continue
+
+            changedFiles.append(path)
+
+        return changedFiles
+
+    def Close(self) -> None:
+        os.close(self._fd)
+
+
+class _PollingEventSource:
+    """
+    Reports that every file must be checked (against the stamp manifest) at a regular
+        interval, and the changes of the settings file.
+    """
+
+    def __init__(self, settingFile: str, stopEvent: threading.Event) -> None:
+        self._settingFile = settingFile
+        self._stopEvent = stopEvent
+        self._settingStamp = self._StatSettingFile()
+
+    def _StatSettingFile(self) -> tuple[int, int] | None:
+        try:
+            stat = os.stat(self._settingFile)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def Wait(self, timeout: float) -> list[str] | None:
+        if self._stopEvent.wait(timeout):
+            return []
+
+        settingStamp = self._StatSettingFile()
+        if settingStamp != self._settingStamp:
+            self._settingStamp = settingStamp
+            return [self._settingFile]
+
+        return None
+
+    def Close(self) -> None:
+        pass
+
+
+def Watch(
+    tempFolder: str = "temp",
+    baseDir: str | None = None,
+    scanCache: DependencyScanCache | None = None,
+    jobs: int | None = None,
+    debounce: float = 0.2,
+    pollInterval: float = 1.0,
+    polling: bool = False,
+    stopEvent: threading.Event | None = None,
+    **kwargs: Any,
+) -> None:
+    """
+    Generate the templates and bindings, then keep watching the base directory and only
+        regenerate the entries affected by the changed files, until stopped. The settings,
+        the caches and the compiled templates are kept in memory between the runs, and the
+        settings file is reloaded whenever it changes.
+
+    Arguments
+    ---------
+    tempFolder : str, optional
+        The temporary folder, see `Autogen`. Defaults to "temp".
+
+    baseDir : str, optional
+        The base directory, see `Autogen`. Defaults to None (the current working
+        directory).
+
+    scanCache : DependencyScanCache, optional
+        The memo of the dependency folder scans, see `Autogen`. Defaults to None.
+
+    jobs : int, optional
+        The number of worker processes, see `Autogen`. Defaults to None.
+
+    debounce : float, optional
+        The quiet time in seconds after the last change before regenerating, so that a
+        burst of changes (e.g. a checkout) triggers a single run. Defaults to 0.2.
+
+    pollInterval : float, optional
+        The time in seconds between two checks of the stop event, or between two checks
+        of all the files when polling. Defaults to 1.0.
+
+    polling : bool, optional
+        Check all the recorded inputs against the stamp manifest at each interval instead
+        of using inotify. Defaults to False, polling is still used where inotify is not
+        available.
+
+    stopEvent : threading.Event, optional
+        The event stopping the watch. Defaults to None (watch until interrupted).
+
+    Keyword Arguments
+    -----------------
+    kwargs : dict
+        Additional data to pass to the templates and bindings.
+
+    Notes
+    -----
+    Only the files under the base directory are watched with inotify, a change of an
+        included system header is only seen when polling.
+    """
+
+    stopEvent = stopEvent if stopEvent is not None else threading.Event()
+    autogen = Autogen.Load(tempFolder, baseDir, scanCache, jobs, **kwargs)
+    settingFile = os.path.normpath(autogen.SettingFile)
+    baseDir = os.path.dirname(settingFile)
+
+    _RunSafely(autogen, None)
+
+    eventSource: _InotifyEventSource | _PollingEventSource
+    if polling or not sys.platform.startswith("linux"):
+        eventSource = _PollingEventSource(settingFile, stopEvent)
+    else:
+        try:
+            eventSource = _InotifyEventSource(
+                baseDir,
+                [os.path.join(baseDir, tempFolder)],
+            )
+        except (OSError, AttributeError) as e:
+            logger.warning(f"Cannot use inotify ({e!r}), polling instead.")
+            eventSource = _PollingEventSource(settingFile, stopEvent)
+
+    logger.info(f'Watching "{baseDir}"...')
+
+    try:
+        while not stopEvent.is_set():
+            changedFiles = eventSource.Wait(pollInterval)
+            if changedFiles == []:
+                continue
+
+            # None when the events are unknown, every recorded input is then checked
+            checkAll = changedFiles is None
+            changedFiles = changedFiles or []
+
+            # wait until the changes settle
+            while not checkAll:
+                moreFiles = eventSource.Wait(debounce)
+                if moreFiles is None:
+                    checkAll = True
+                elif not moreFiles:
+                    break
+                else:
+                    changedFiles.extend(moreFiles)
+
+            if settingFile in map(os.path.normpath, changedFiles):
+                logger.info(f'Settings file "{settingFile}" changed, reloading...')
+                try:
+                    autogen.Reload()
+                except Exception as e:
+                    logger.error(f"Cannot reload the settings: {e!r}")
+                    continue
+                _RunSafely(autogen, None)
+                continue
+
+            if checkAll:
+                entryKeys = autogen.FindStaleEntries()
+            else:
+                entryKeys = autogen.FindEntries(changedFiles)
+
+            if entryKeys:
+                logger.debug(
+                    "Regenerating %s...", LazyMessage(lambda: sorted(entryKeys))
+                )
+                _RunSafely(autogen, entryKeys)
+    finally:
+        eventSource.Close()
+
+
+def _RunSafely(autogen: Autogen, entryKeys: set[str] | None) -> None:
+    # only the metrics of the last run are kept
+    metrics.Reset()
+    start = time.perf_counter()
+    try:
+        autogen.Run(entryKeys)
+    except Exception as e:
+        # keep watching, the failed entries stay stale until their inputs change
+        logger.error(f"Generation failed: {e!r}")
+        return
+
+    logger.debug("Generation done in %.2fms.", (time.perf_counter() - start) * 1000)
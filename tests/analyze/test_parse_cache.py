@@ -0,0 +1,110 @@
+import os
+import time
+import pytest  # type: ignore
+from typing import Any
+from pathlib import Path
+from ntt_autogen.analyze import Parser, ParseCache
+from ntt_autogen.utils import metrics
+
+HEADER = """
+#include "types.h"
+
+/** A point. */
+struct __attribute__((annotate("binding"))) Point {
+    Scalar x; ///< The x coordinate
+    Scalar y;
+};
+
+enum Mode { MODE_A, MODE_B = 4 };
+
+void move(struct Point* point, Scalar dx);
+"""
+
+
+def _ParseWithCache(headerPath: Path, cache: ParseCache) -> Parser:
+    parser = Parser(filePath=str(headerPath), cache=cache)
+    parser.Parse()
+    return parser
+
+
+def _ForbidClang(monkeypatch: Any) -> None:
+    def _Fail(self: Parser) -> None:
+        raise AssertionError("libclang should not be called on a cache hit.")
+
+    monkeypatch.setattr(Parser, "_ParseTranslationUnit", _Fail)
+
+
+def test_parse_cache_hit(tmp_path: Path, monkeypatch: Any) -> None:
+    (tmp_path / "types.h").write_text("typedef float Scalar;\n")
+    (tmp_path / "point.h").write_text(HEADER)
+    cache = ParseCache(str(tmp_path / "cache"))
+
+    parsed = _ParseWithCache(tmp_path / "point.h", cache)
+
+    with monkeypatch.context() as patch:
+        _ForbidClang(patch)
+        cached = _ParseWithCache(tmp_path / "point.h", cache)
+
+        assert [struct.ToDict(comments=False) for struct in cached.Structs] == [
+            struct.ToDict(comments=False) for struct in parsed.Structs
+        ]
+        assert cached.Structs[0].name == "Point"
+        assert cached.Structs[0].annotations == ["binding"]
+        assert cached.Structs[0].fields[0].type == "Scalar"
+        assert cached.Enums[0].constants[1].value == 4
+        assert cached.Typedefs[0].underlyingType == "float"
+        assert cached.Functions[0].arguments[1].name == "dx"
+        assert cached.AllCustomTypes == ["Point"]
+
+    # the comments are not cached until read, which parses the header again once
+    metrics.Reset()
+    assert cached.Structs[0].comment == "A point."
+    assert cached.Structs[0].fields[0].comment == "The x coordinate"
+    assert [struct.ToDict() for struct in cached.Structs] == [
+        struct.ToDict() for struct in parsed.Structs
+    ]
+    assert metrics.Report()["counters"]["parse.commentRuns"] == 1
+
+    _ForbidClang(monkeypatch)
+    cached = _ParseWithCache(tmp_path / "point.h", cache)
+
+    assert cached.Structs[0].comment == "A point."
+    assert cached.Structs[0].fields[0].comment == "The x coordinate"
+
+
+def test_parse_cache_invalidated_by_include(tmp_path: Path) -> None:
+    (tmp_path / "types.h").write_text("typedef float Scalar;\n")
+    (tmp_path / "point.h").write_text(HEADER)
+    cache = ParseCache(str(tmp_path / "cache"))
+
+    _ParseWithCache(tmp_path / "point.h", cache)
+
+    (tmp_path / "types.h").write_text("typedef double Scalar;\n")
+    parser = _ParseWithCache(tmp_path / "point.h", cache)
+
+    assert parser.Typedefs[0].underlyingType == "double"
+
+
+def test_parse_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = ParseCache(str(tmp_path / "cache"), maxEntries=2)
+
+    for index in range(3):
+        (tmp_path / f"header{index}.h").write_text(f"int value{index};\n")
+
+    _ParseWithCache(tmp_path / "header0.h", cache)
+    time.sleep(0.01)
+    _ParseWithCache(tmp_path / "header1.h", cache)
+    time.sleep(0.01)
+    _ParseWithCache(tmp_path / "header0.h", cache)
+    time.sleep(0.01)
+    _ParseWithCache(tmp_path / "header2.h", cache)
+
+    assert len(os.listdir(tmp_path / "cache")) == 2
+
+    entryPath = cache._EntryPath(
+        str(tmp_path / "header1.h"),
+        Parser.DEFAULT_CLANG_ARGS,
+        Parser.DEFAULT_PARSE_OPTIONS,
+        None,
+    )
+    assert not os.path.exists(entryPath), "The least recently used entry was kept."
@@ -0,0 +1,22 @@
+import pytest  # type: ignore
+from ntt_autogen.analyze import Parser
+
+
+def test_parse_custom_types_index():
+    code = """
+struct __attribute__((annotate("binding"))) Vector { float x; };
+enum __attribute__((annotate("binding"))) Mode { MODE_A };
+typedef __attribute__((annotate("binding"))) int Handle;
+struct Hidden { int a; };
+"""
+
+    parser = Parser(code)
+    parser.Parse()
+
+    assert dict(parser.CustomTypes) == {
+        "Vector": "struct",
+        "Mode": "enum",
+        "Handle": "typedef",
+    }
+    assert parser.AllCustomTypes == ["Vector", "Mode", "Handle"]
+    assert "Hidden" not in parser.CustomTypes
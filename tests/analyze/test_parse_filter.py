@@ -0,0 +1,62 @@
+import pytest  # type: ignore
+from typing import Any
+from pathlib import Path
+from ntt_autogen.analyze import Parser, DeclarationFilter
+from ntt_autogen.analyze import parser as parserModule
+
+
+def test_parse_filter_annotation():
+    code = """
+struct __attribute__((annotate("binding"))) Kept { int a; };
+struct Dropped { int a; };
+void __attribute__((annotate("binding"))) keptFunction(void);
+void droppedFunction(void);
+"""
+
+    parser = Parser(code, declarationFilter=DeclarationFilter(annotation="binding"))
+    parser.Parse()
+
+    assert [struct.name for struct in parser.Structs] == ["Kept"]
+    assert [function.name for function in parser.Functions] == ["keptFunction"]
+
+
+def test_parse_filter_name_pattern():
+    code = """
+typedef int ntt_Handle;
+typedef int other_Handle;
+int ntt_open(ntt_Handle handle);
+"""
+
+    parser = Parser(code, declarationFilter=DeclarationFilter(namePattern="ntt_.*"))
+    parser.Parse()
+
+    assert [typedef.name for typedef in parser.Typedefs] == ["ntt_Handle"]
+    assert [function.name for function in parser.Functions] == ["ntt_open"]
+
+
+def test_parse_filter_main_file_only(tmp_path: Path, monkeypatch: Any) -> None:
+    (tmp_path / "third_party.h").write_text(
+        "struct External { int a; };\nvoid external(void);\n"
+    )
+    (tmp_path / "api.h").write_text(
+        '#include "third_party.h"\nstruct Internal { struct External e; };\n'
+    )
+
+    createdStructs: list[str] = []
+
+    class _CountingPyStruct(parserModule.PyStruct):  # type: ignore
+        def __init__(self, cursor: Any) -> None:
+            createdStructs.append(cursor.spelling)
+            super().__init__(cursor)
+
+    monkeypatch.setattr(parserModule, "PyStruct", _CountingPyStruct)
+
+    parser = Parser(
+        filePath=str(tmp_path / "api.h"),
+        declarationFilter=DeclarationFilter(mainFileOnly=True),
+    )
+    parser.Parse()
+
+    assert [struct.name for struct in parser.Structs] == ["Internal"]
+    assert parser.Functions == []
+    assert createdStructs == ["Internal"], "Rejected declarations were materialized."
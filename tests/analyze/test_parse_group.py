@@ -0,0 +1,90 @@
+import pytest  # type: ignore
+from pathlib import Path
+from ntt_autogen.analyze import Parser, ParseCache, DeclarationFilter
+
+
+def _CreateHeaders(folder: Path) -> None:
+    (folder / "common.h").write_text(
+        "#pragma once\n"
+        'struct __attribute__((annotate("binding"))) Common { int a; };\n'
+    )
+    (folder / "window.h").write_text(
+        '#pragma once\n#include "common.h"\n'
+        'struct __attribute__((annotate("binding"))) Window { struct Common c; };\n'
+        "void window_open(struct Window* window);\n"
+    )
+    (folder / "input.h").write_text(
+        '#pragma once\n#include "common.h"\n#include "window.h"\n'
+        "enum Key { KEY_A, KEY_B };\n"
+        "int input_pressed(struct Window* window, enum Key key);\n"
+    )
+
+
+def _CreateParsers(folder: Path, cache: ParseCache | None = None) -> list[Parser]:
+    return [
+        Parser(
+            filePath=str(folder / name),
+            cache=cache,
+            declarationFilter=DeclarationFilter(mainFileOnly=True),
+        )
+        for name in ("window.h", "input.h")
+    ]
+
+
+def _Declarations(parser: Parser) -> list[str]:
+    return [
+        pyObject.name
+        for pyObject in [
+            *parser.Structs,
+            *parser.Enums,
+            *parser.Typedefs,
+            *parser.Functions,
+        ]
+    ]
+
+
+def test_parse_together_splits_declarations(tmp_path: Path) -> None:
+    _CreateHeaders(tmp_path)
+
+    window, input = _CreateParsers(tmp_path)
+    Parser.ParseTogether([window, input])
+
+    assert _Declarations(window) == ["Window", "window_open"]
+    assert _Declarations(input) == ["Key", "input_pressed"]
+
+    for parser in (window, input):
+        assert dict(parser.CustomTypes) == {"Window": "struct"}
+
+
+def test_parse_together_matches_standalone_parse(tmp_path: Path) -> None:
+    _CreateHeaders(tmp_path)
+
+    together = _CreateParsers(tmp_path)
+    Parser.ParseTogether(together)
+
+    for parser, standalone in zip(together, _CreateParsers(tmp_path)):
+        standalone.Parse()
+        assert parser._DumpDeclarations() == standalone._DumpDeclarations()
+
+
+def test_parse_together_uses_parse_cache(tmp_path: Path) -> None:
+    _CreateHeaders(tmp_path)
+    cache = ParseCache(str(tmp_path / "cache"))
+
+    Parser.ParseTogether(_CreateParsers(tmp_path, cache))
+
+    # the entries of a group parse are the ones of a standalone parse
+    window = _CreateParsers(tmp_path, cache)[0]
+    assert window._LoadFromCache()
+    assert _Declarations(window) == ["Window", "window_open"]
+
+    (tmp_path / "common.h").write_text("#pragma once\nstruct Common { long a; };\n")
+    window, input = _CreateParsers(tmp_path, cache)
+    assert not window._LoadFromCache()
+
+
+def test_parse_together_requires_main_file_filter(tmp_path: Path) -> None:
+    _CreateHeaders(tmp_path)
+
+    with pytest.raises(AssertionError):
+        Parser.ParseTogether([Parser(filePath=str(tmp_path / "window.h"))])
@@ -0,0 +1,53 @@
+import os
+import pytest  # type: ignore
+from pathlib import Path
+from ntt_autogen.analyze import Parser, BuildPrecompiledHeader, GetSharedIndex
+
+PRELUDE = """
+#pragma once
+typedef unsigned int Handle;
+struct __attribute__((annotate("binding"))) Common { Handle id; };
+"""
+
+
+def test_parse_with_precompiled_header(tmp_path: Path) -> None:
+    (tmp_path / "prelude.h").write_text(PRELUDE)
+    (tmp_path / "api.h").write_text(
+        '#include "prelude.h"\nstruct Common* open(Handle handle);\n'
+    )
+
+    pch = BuildPrecompiledHeader(
+        str(tmp_path / "prelude.h"),
+        str(tmp_path / "pch"),
+        Parser.DEFAULT_CLANG_ARGS,
+    )
+
+    parser = Parser(filePath=str(tmp_path / "api.h"), index=GetSharedIndex(), pch=pch)
+    parser.Parse()
+
+    assert [function.name for function in parser.Functions] == ["open"]
+    assert parser.Functions[0].arguments[0].type == "Handle"
+    assert parser.CustomTypes == {"Common": "struct"}
+
+
+def test_precompiled_header_reuse(tmp_path: Path) -> None:
+    (tmp_path / "prelude.h").write_text(PRELUDE)
+    args = Parser.DEFAULT_CLANG_ARGS
+
+    pch = BuildPrecompiledHeader(str(tmp_path / "prelude.h"), str(tmp_path), args)
+    pchTime = os.stat(pch).st_mtime_ns
+
+    assert (
+        BuildPrecompiledHeader(str(tmp_path / "prelude.h"), str(tmp_path), args) == pch
+    )
+    assert os.stat(pch).st_mtime_ns == pchTime, "Unchanged prelude was rebuilt."
+
+    (tmp_path / "prelude.h").write_text(PRELUDE + "typedef int Extra;\n")
+
+    assert (
+        BuildPrecompiledHeader(str(tmp_path / "prelude.h"), str(tmp_path), args) != pch
+    )
+
+
+def test_shared_index() -> None:
+    assert GetSharedIndex() is GetSharedIndex()
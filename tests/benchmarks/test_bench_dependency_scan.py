@@ -0,0 +1,82 @@
+import os
+import time
+from pathlib import Path
+from typing import Any
+import pytest  # type: ignore
+from ntt_autogen.utils import ScanDependencies
+
+DEPTH = 8
+FANOUT = 2
+FILES_PER_FOLDER = 3
+
+
+def _LegacyLoadFilesRecursively(
+    finalFiles: set[str],
+    folder: str,
+    extensions: list[str],
+    baseDir: str,
+) -> set[str]:
+    # The scanner which was replaced, kept here as the baseline of the benchmark.
+    for root, _folders, files in os.walk(folder):
+        for file in files:
+            fullPath = os.path.join(root, file)
+            if os.path.splitext(fullPath)[1] in extensions:
+                finalFiles.add(os.path.relpath(fullPath, baseDir))
+
+        for _folder in _folders:
+            _LegacyLoadFilesRecursively(
+                finalFiles, os.path.join(root, _folder), extensions, baseDir
+            )
+
+    return finalFiles
+
+
+def _CreateDeepTree(folder: Path, depth: int) -> int:
+    for index in range(FILES_PER_FOLDER):
+        (folder / f"header_{index}.h").write_text("")
+    (folder / "notes.txt").write_text("")
+
+    folderCount = 1
+    if depth > 0:
+        for index in range(FANOUT):
+            child = folder / f"sub_{index}"
+            child.mkdir()
+            folderCount += _CreateDeepTree(child, depth - 1)
+
+    return folderCount
+
+
+def test_bench_dependency_scan(tmp_path: Path, monkeypatch: Any) -> None:
+    root = tmp_path / "include"
+    root.mkdir()
+    folderCount = _CreateDeepTree(root, DEPTH - 1)
+
+    scanCount = 0
+    originalScandir = os.scandir
+
+    def _CountingScandir(path: Any) -> Any:
+        nonlocal scanCount
+        scanCount += 1
+        return originalScandir(path)
+
+    monkeypatch.setattr(os, "scandir", _CountingScandir)
+
+    start = time.perf_counter()
+    legacyFiles = _LegacyLoadFilesRecursively(set(), str(root), [".h"], str(tmp_path))
+    legacyTime = time.perf_counter() - start
+    legacyScans, scanCount = scanCount, 0
+
+    start = time.perf_counter()
+    newFiles = ScanDependencies(["include"], [".h"], str(tmp_path))
+    newTime = time.perf_counter() - start
+    newScans = scanCount
+
+    print(
+        f"\n[scan] folders={folderCount} "
+        f"legacy: scans={legacyScans} time={legacyTime * 1000:.2f}ms | "
+        f"new: scans={newScans} time={newTime * 1000:.2f}ms"
+    )
+
+    assert sorted(legacyFiles) == [file.path for file in newFiles]
+    assert newScans == folderCount
+    assert legacyScans > newScans * (DEPTH - 2)
@@ -0,0 +1,76 @@
+from pathlib import Path
+from ntt_autogen import Binding
+from ntt_autogen.binding import GenerateBindings
+from ntt_autogen.analyze import ParseCache
+from ntt_autogen.utils import metrics
+
+STRUCTS_COUNT = 1000
+FIELDS_COUNT = 8
+
+STRUCT_MACRO = (
+    "{% macro struct_binding(struct) %}"
+    "class {{ struct.name }}:\n"
+    '    """{{ convertRawCCommentToPythonDocstring(struct) }}"""\n'
+    "{% for field in struct.fields %}"
+    "    {{ field.name }}: {{ cTypeConvert(field.type) }}  # {{ field.type }}\n"
+    "    {{ convertRawCCommentToPythonComment(field) }}\n"
+    "{% endfor %}\n"
+    "{% endmacro %}"
+)
+FRAGMENT_TEMPLATE = (
+    STRUCT_MACRO
+    + "{% for struct in structs %}{{ fragment(struct_binding, struct) }}{% endfor %}"
+)
+PLAIN_TEMPLATE = (
+    STRUCT_MACRO + "{% for struct in structs %}{{ struct_binding(struct) }}{% endfor %}"
+)
+
+
+def _WriteHeader(projectDir: Path, editedField: str) -> None:
+    lines: list[str] = []
+    for index in range(STRUCTS_COUNT):
+        fields = " ".join(f"int field{i};" for i in range(FIELDS_COUNT))
+        if index == STRUCTS_COUNT // 2:
+            fields += f" float {editedField};"
+        lines.append(f"/** Struct {index}. */\nstruct Struct{index} {{ {fields} }};")
+    (projectDir / "header.h").write_text("\n".join(lines))
+
+
+def _MeasureRender(projectDir: Path) -> tuple[float, dict[str, int]]:
+    binding = Binding(file="header.h", template="binding.py.in", output="binding.py")
+
+    # as in a run, the declarations are serialized for the parse cache while parsed
+    parseCache = ParseCache(str(projectDir / "temp" / "parse-cache"))
+
+    metrics.Reset()
+    GenerateBindings(binding, str(projectDir), "temp", parseCache=parseCache)
+    report = metrics.Report()
+    return report["phases"]["render"]["totalMs"], report["counters"]
+
+
+def test_bench_fragments(tmp_path: Path) -> None:
+    renderTimes: dict[str, float] = {}
+    counters: dict[str, dict[str, int]] = {}
+    for name, template in (("plain", PLAIN_TEMPLATE), ("fragments", FRAGMENT_TEMPLATE)):
+        projectDir = tmp_path / name
+        projectDir.mkdir()
+        (projectDir / "binding.py.in").write_text(template)
+
+        _WriteHeader(projectDir, "before")
+        _MeasureRender(projectDir)
+
+        # a single declaration of the header changes
+        _WriteHeader(projectDir, "after")
+        renderTimes[name], counters[name] = _MeasureRender(projectDir)
+
+    print(
+        f"\n[fragments] {STRUCTS_COUNT} structs, one modified | render "
+        f"plain: {renderTimes['plain']:.2f}ms fragments: {renderTimes['fragments']:.2f}ms"
+    )
+
+    plainOutput = (tmp_path / "plain" / "binding.py").read_text()
+    assert "    after: float  # float\n" in plainOutput
+    assert (tmp_path / "fragments" / "binding.py").read_text() == plainOutput
+    assert counters["fragments"]["fragments.rendered"] == 1
+    assert counters["fragments"]["fragments.reused"] == STRUCTS_COUNT - 1
+    assert "fragments.rendered" not in counters["plain"]
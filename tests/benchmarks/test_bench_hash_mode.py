@@ -0,0 +1,69 @@
+import os
+import json
+import time
+from pathlib import Path
+from dataclasses import asdict
+from ntt_autogen import Autogen, Settings, Template
+from ntt_autogen.utils import metrics
+
+TEMPLATES_COUNT = 20
+HEADERS_COUNT = 200
+
+
+def _SetupProject(projectDir: Path, cacheMode: str) -> list[Path]:
+    includeDir = projectDir / "include"
+    includeDir.mkdir(parents=True)
+
+    for index in range(HEADERS_COUNT):
+        (includeDir / f"header_{index}.h").write_text(f"int value_{index};\n" * 50)
+
+    templates: list[Template] = []
+    for index in range(TEMPLATES_COUNT):
+        template = Template(
+            file=f"template_{index}.txt.in",
+            dependencies=["include"],
+            extensions=[".h"],
+        )
+        (projectDir / template.file).write_text("{{ VALUE }}")
+        templates.append(template)
+
+    settings = Settings(templates=templates, cacheMode=cacheMode)
+    (projectDir / "autogen-settings.json").write_text(json.dumps(asdict(settings)))
+
+    return [projectDir / f"template_{index}.txt" for index in range(TEMPLATES_COUNT)]
+
+
+def _TouchAll(projectDir: Path) -> None:
+    newTime = time.time_ns() + 10**9
+    for root, _folders, files in os.walk(projectDir):
+        for file in files:
+            os.utime(os.path.join(root, file), ns=(newTime, newTime))
+
+
+def _CountRebuildsAfterTouch(projectDir: Path, cacheMode: str) -> tuple[int, float]:
+    _SetupProject(projectDir, cacheMode)
+    Autogen(baseDir=str(projectDir), VALUE="value")
+
+    _TouchAll(projectDir)
+
+    # the outputs are left untouched when their content is the same, count the renders
+    metrics.Reset()
+    start = time.perf_counter()
+    Autogen(baseDir=str(projectDir), VALUE="value")
+    elapsed = time.perf_counter() - start
+
+    return metrics.Report()["counters"].get("templates.generated", 0), elapsed
+
+
+def test_bench_hash_mode_after_mass_touch(tmp_path: Path) -> None:
+    mtimeRebuilds, mtimeTime = _CountRebuildsAfterTouch(tmp_path / "mtime", "mtime")
+    hashRebuilds, hashTime = _CountRebuildsAfterTouch(tmp_path / "hash", "hash")
+
+    print(
+        f"\n[touch] templates={TEMPLATES_COUNT} headers={HEADERS_COUNT} "
+        f"mtime: rebuilds={mtimeRebuilds} time={mtimeTime * 1000:.2f}ms | "
+        f"hash: rebuilds={hashRebuilds} time={hashTime * 1000:.2f}ms"
+    )
+
+    assert mtimeRebuilds == TEMPLATES_COUNT
+    assert hashRebuilds == 0
@@ -0,0 +1,78 @@
+import json
+import time
+import threading
+from typing import Any
+from pathlib import Path
+from dataclasses import asdict
+from ntt_autogen import Autogen, Settings, Template
+from ntt_autogen.utils import GetManifestFilePath, metrics, output
+
+TEMPLATES_COUNT = 40
+WRITE_DELAY = 0.005  # seconds per output, e.g. a network filesystem
+
+
+def _CreateProject(projectDir: Path, ioWorkers: int) -> None:
+    projectDir.mkdir()
+    for index in range(TEMPLATES_COUNT):
+        (projectDir / f"template{index}.txt.in").write_text(
+            f"{index}: {{% for i in range(200) %}}{{{{ i }}}} {{% endfor %}}"
+        )
+
+    settings = Settings(
+        templates=[
+            Template(file=f"template{index}.txt.in") for index in range(TEMPLATES_COUNT)
+        ],
+        ioWorkers=ioWorkers,
+    )
+    (projectDir / "autogen-settings.json").write_text(json.dumps(asdict(settings)))
+
+
+def _MeasureRun(projectDir: Path) -> tuple[float, dict[str, int]]:
+    metrics.Reset()
+    start = time.perf_counter()
+    Autogen(baseDir=str(projectDir))
+    return time.perf_counter() - start, metrics.Report()["counters"]
+
+
+def test_bench_io_pipeline(tmp_path: Path, monkeypatch: Any) -> None:
+    commit = output._Commit
+    commitThreads: list[str] = []
+
+    def _SlowCommit(*args: Any) -> list[bool]:
+        commitThreads.append(threading.current_thread().name)
+        time.sleep(WRITE_DELAY)
+        return commit(*args)
+
+    monkeypatch.setattr(output, "_Commit", _SlowCommit)
+
+    _CreateProject(tmp_path / "inline", ioWorkers=0)
+    _CreateProject(tmp_path / "pipelined", ioWorkers=8)
+
+    inlineTime, inlineCounters = _MeasureRun(tmp_path / "inline")
+    inlineThreads, commitThreads[:] = commitThreads[:], []
+    pipelinedTime, pipelinedCounters = _MeasureRun(tmp_path / "pipelined")
+    pipelinedThreads, commitThreads[:] = commitThreads[:], []
+
+    print(
+        f"\n[io pipeline] {TEMPLATES_COUNT} templates, {WRITE_DELAY * 1000:.0f}ms per "
+        f"write | inline: {inlineTime * 1000:.2f}ms "
+        f"pipelined: {pipelinedTime * 1000:.2f}ms"
+    )
+
+    for index in range(TEMPLATES_COUNT):
+        for project in ("inline", "pipelined"):
+            content = (tmp_path / project / f"template{index}.txt").read_text()
+            assert content.startswith(f"{index}: 0 1 2")
+    for counters in (inlineCounters, pipelinedCounters):
+        assert counters["outputs.written"] == TEMPLATES_COUNT
+    assert inlineThreads == [threading.main_thread().name] * TEMPLATES_COUNT
+    assert len(pipelinedThreads) == TEMPLATES_COUNT
+    assert all(
+        thread.startswith("autogen-io") for thread in pipelinedThreads
+    ), "The outputs should be written in the background."
+
+    # rendered again without their stamps, the outputs are left as is
+    Path(GetManifestFilePath(str(tmp_path / "pipelined"), "temp")).unlink()
+    _, counters = _MeasureRun(tmp_path / "pipelined")
+    assert counters["outputs.unchanged"] == TEMPLATES_COUNT
+    assert "outputs.written" not in counters
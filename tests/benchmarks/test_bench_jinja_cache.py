@@ -0,0 +1,77 @@
+import time
+import pytest  # type: ignore
+from typing import Any
+from pathlib import Path
+from jinja2 import Environment, Template as JinjaTemplate
+from ntt_autogen.jinja_environment import CreateEnvironment, LoadTemplate
+
+TEMPLATES_COUNT = 20
+BLOCKS_COUNT = 50
+RUNS_COUNT = 3
+
+
+def _CreateTemplates(folder: Path) -> list[str]:
+    block = (
+        "{% for item in ITEMS %}"
+        "{% if item % 2 == 0 %}{{ item | string | upper }}{% else %}{{ item }}{% endif %}"
+        "{% endfor %}\n"
+    )
+
+    files: list[str] = []
+    for index in range(TEMPLATES_COUNT):
+        file = f"template_{index}.txt.in"
+        (folder / file).write_text(block * BLOCKS_COUNT)
+        files.append(file)
+
+    return files
+
+
+def _CountCompilations(monkeypatch: Any) -> list[int]:
+    compilations = [0]
+    compile = Environment.compile
+
+    def _Compile(self: Environment, *args: Any, **kwargs: Any) -> Any:
+        compilations[0] += 1
+        return compile(self, *args, **kwargs)
+
+    monkeypatch.setattr(Environment, "compile", _Compile)
+    return compilations
+
+
+def test_bench_jinja_cache(tmp_path: Path, monkeypatch: Any) -> None:
+    files = _CreateTemplates(tmp_path)
+    data = {"ITEMS": list(range(5))}
+    compilations = _CountCompilations(monkeypatch)
+
+    # the previous behaviour: every entry of every run compiles its template
+    start = time.perf_counter()
+    for _ in range(RUNS_COUNT):
+        bareContents = [
+            JinjaTemplate((tmp_path / file).read_text()).render(**data)
+            for file in files
+        ]
+    bareTime = time.perf_counter() - start
+    bareCompilations = compilations[0]
+
+    # one environment per run, the later runs load the bytecode cache
+    compilations[0] = 0
+    start = time.perf_counter()
+    for _ in range(RUNS_COUNT):
+        environment = CreateEnvironment(str(tmp_path), "temp")
+        cachedContents = [
+            LoadTemplate(environment, str(tmp_path), file).render(**data)
+            for file in files
+        ]
+    cachedTime = time.perf_counter() - start
+
+    print(
+        f"\n[jinja] templates={TEMPLATES_COUNT} runs={RUNS_COUNT} "
+        f"bare templates: {bareTime * 1000:.2f}ms | "
+        f"shared environment + bytecode cache: {cachedTime * 1000:.2f}ms"
+    )
+
+    assert cachedContents == bareContents
+    assert bareCompilations == TEMPLATES_COUNT * RUNS_COUNT
+    assert (
+        compilations[0] == TEMPLATES_COUNT
+    ), "Only the first run should compile the templates."
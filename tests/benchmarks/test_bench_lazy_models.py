@@ -0,0 +1,116 @@
+import time
+from typing import Any
+from pathlib import Path
+from ntt_autogen import Binding
+from ntt_autogen.binding import GenerateBindings
+from ntt_autogen.analyze import ParseCache
+from ntt_autogen.analyze.py_object import PyObject
+from ntt_autogen.utils import metrics
+
+STRUCTS_COUNT = 400
+FIELDS_COUNT = 8
+
+PLAIN_TEMPLATE = (
+    "{% for struct in structs %}class {{ struct.name }}:\n"
+    "{% for field in struct.fields %}    {{ field.name }}: {{ field.type }}\n"
+    "{% endfor %}{% endfor %}"
+)
+COMMENTED_TEMPLATE = (
+    "{% for struct in structs %}class {{ struct.name }}:  # {{ struct.comment }}\n"
+    "{% for field in struct.fields %}    {{ field.name }}: {{ field.type }}"
+    "  # {{ field.comment }}\n{% endfor %}{% endfor %}"
+)
+
+
+def _CreateProject(projectDir: Path) -> None:
+    lines: list[str] = []
+    for structIndex in range(STRUCTS_COUNT):
+        lines.append(f"/** Struct number {structIndex}. */")
+        lines.append(f"struct Struct{structIndex} {{")
+        for fieldIndex in range(FIELDS_COUNT):
+            lines.append(f"    int field{fieldIndex}; ///< Field {fieldIndex}")
+        lines.append("};")
+
+    projectDir.mkdir()
+    (projectDir / "header.h").write_text("\n".join(lines))
+    (projectDir / "plain.py.in").write_text(PLAIN_TEMPLATE)
+    (projectDir / "commented.py.in").write_text(COMMENTED_TEMPLATE)
+
+
+def _CountCommentLoads(monkeypatch: Any) -> list[int]:
+    loads = [0]
+    loadComments = PyObject._LoadComments
+
+    def _LoadComments(self: PyObject) -> None:
+        loads[0] += 1
+        loadComments(self)
+
+    monkeypatch.setattr(PyObject, "_LoadComments", _LoadComments)
+    return loads
+
+
+def _MakeModelsEager(monkeypatch: Any) -> None:
+    # the models before the lazy comments read them while built from their cursor
+    init = PyObject.__init__
+
+    def _EagerInit(self: PyObject, cursor: Any) -> None:
+        init(self, cursor)
+        self._LoadComments()
+
+    monkeypatch.setattr(PyObject, "__init__", _EagerInit)
+
+
+def _Generate(projectDir: Path, template: str) -> tuple[float, dict[str, int]]:
+    binding = Binding(file="header.h", template=template, output=f"{template}.out")
+    parseCache = ParseCache(str(projectDir / "temp" / "parse-cache"))
+
+    metrics.Reset()
+    start = time.perf_counter()
+    GenerateBindings(binding, str(projectDir), "temp", parseCache=parseCache)
+    return time.perf_counter() - start, metrics.Report()["counters"]
+
+
+def test_bench_lazy_models(tmp_path: Path, monkeypatch: Any) -> None:
+    declarationsCount = STRUCTS_COUNT * (FIELDS_COUNT + 1)
+    loads = _CountCommentLoads(monkeypatch)
+
+    times: dict[str, float] = {}
+    commentLoads: dict[str, int] = {}
+    for name in ("eager", "lazy"):
+        _CreateProject(tmp_path / name)
+
+        with monkeypatch.context() as patch:
+            if name == "eager":
+                _MakeModelsEager(patch)
+
+            loads[0] = 0
+            times[name], counters = _Generate(tmp_path / name, "plain.py.in")
+            commentLoads[name] = loads[0]
+
+        assert counters["parse.runs"] == 1
+
+    print(
+        f"\n[models] declarations={declarationsCount} parse cache on, comments unused "
+        f"| eager: {times['eager'] * 1000:.2f}ms lazy: {times['lazy'] * 1000:.2f}ms"
+    )
+
+    assert commentLoads["eager"] == declarationsCount
+    assert commentLoads["lazy"] == 0, "No comment should be read when none is rendered."
+    assert (tmp_path / "lazy" / "plain.py.in.out").read_text() == (
+        tmp_path / "eager" / "plain.py.in.out"
+    ).read_text()
+
+    # a template rendering the comments reads them once from the header, then they are
+    # served by the parse cache
+    _, counters = _Generate(tmp_path / "lazy", "commented.py.in")
+    assert counters["parse.commentRuns"] == 1
+    assert "parse.runs" not in counters
+
+    (tmp_path / "lazy" / "commented.py.in.out").unlink()
+    _, counters = _Generate(tmp_path / "lazy", "commented.py.in")
+    assert "parse.commentRuns" not in counters
+    assert "parse.runs" not in counters
+
+    output = (tmp_path / "lazy" / "commented.py.in.out").read_text()
+    assert "class Struct0:  # Struct number 0.\n" in output
+    assert f"    field{FIELDS_COUNT - 1}: int  # Field {FIELDS_COUNT - 1}\n" in output
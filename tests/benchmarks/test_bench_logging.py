@@ -0,0 +1,65 @@
+import io
+import time
+import logging
+from typing import Any
+from ntt_autogen.utils import logger, LazyMessage, BackgroundLogging
+
+FILES_COUNT = 5000
+CALLS_COUNT = 200
+CONSOLE_WRITE_DELAY = 0.0005  # seconds, a terminal or pipe under back-pressure
+
+
+class _SlowConsole(io.StringIO):
+    def write(self, text: str) -> int:
+        time.sleep(CONSOLE_WRITE_DELAY)
+        return super().write(text)
+
+
+def _LegacyFormatFileList(paths: list[str]) -> str:
+    # The formatting which was done before every check, kept as the baseline.
+    return str(paths).replace(", ", ",\n\t").replace("[", "[\n\t").replace("]", "\n]")
+
+
+def _MeasureCalls(function: Any) -> float:
+    start = time.perf_counter()
+    for _ in range(CALLS_COUNT):
+        function()
+    return (time.perf_counter() - start) / CALLS_COUNT
+
+
+def test_bench_logging(monkeypatch: Any) -> None:
+    paths = [f"include/header_{index}.h" for index in range(FILES_COUNT)]
+    builtPayloads: list[int] = []
+
+    def _FormatFileList() -> str:
+        builtPayloads.append(1)
+        return _LegacyFormatFileList(paths)
+
+    console = _SlowConsole()
+    monkeypatch.setattr("sys.stdout", console)
+    level = logger.level
+    try:
+        logger.setLevel(logging.INFO)
+        eagerTime = _MeasureCalls(
+            lambda: logger.debug("Files: {}".format(_LegacyFormatFileList(paths)))
+        )
+        lazyTime = _MeasureCalls(
+            lambda: logger.debug("Files: %s", LazyMessage(_FormatFileList))
+        )
+
+        directTime = _MeasureCalls(lambda: logger.info("Generated a file."))
+        with BackgroundLogging():
+            backgroundTime = _MeasureCalls(lambda: logger.info("Generated a file."))
+    finally:
+        logger.setLevel(level)
+        monkeypatch.undo()
+
+    print(
+        f"\n[logging] disabled debug payload of {FILES_COUNT} files "
+        f"eager: {eagerTime * 1e6:.2f}us lazy: {lazyTime * 1e6:.2f}us | "
+        f"info record on a slow console "
+        f"direct: {directTime * 1e6:.2f}us background: {backgroundTime * 1e6:.2f}us"
+    )
+
+    assert builtPayloads == [], "The payload should not be built at INFO."
+    assert console.getvalue().count("Generated a file.") == 2 * CALLS_COUNT
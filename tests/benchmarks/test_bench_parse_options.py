@@ -0,0 +1,49 @@
+import time
+import pytest  # type: ignore
+from pathlib import Path
+from ntt_autogen.analyze import Parser
+
+HEADER_SIZES = [50, 200, 800]
+
+
+def _CreateHeader(headerPath: Path, functionsCount: int) -> None:
+    lines = ["#pragma once"]
+    for index in range(functionsCount):
+        lines.append(f"""
+/** Function number {index}. */
+static inline int function_{index}(int a, int b) {{
+    int total = 0;
+    for (int i = 0; i < a; ++i) {{
+        total += (i * b) ^ (total >> 1);
+        if (total > {index}) {{ total -= a; }}
+    }}
+    return total;
+}}""")
+    headerPath.write_text("\n".join(lines))
+
+
+def _TimeParse(headerPath: Path, options: int) -> tuple[float, Parser]:
+    start = time.perf_counter()
+    parser = Parser(filePath=str(headerPath), options=options)
+    parser.Parse()
+    return time.perf_counter() - start, parser
+
+
+def test_bench_parse_time_by_header_size(tmp_path: Path) -> None:
+    print()
+    for functionsCount in HEADER_SIZES:
+        headerPath = tmp_path / f"header_{functionsCount}.h"
+        _CreateHeader(headerPath, functionsCount)
+
+        fullTime, fullParser = _TimeParse(headerPath, 0)
+        tunedTime, tunedParser = _TimeParse(headerPath, Parser.DEFAULT_PARSE_OPTIONS)
+
+        print(
+            f"[parse] functions={functionsCount} size={headerPath.stat().st_size}B "
+            f"options=0: {fullTime * 1000:.2f}ms | "
+            f"default options: {tunedTime * 1000:.2f}ms"
+        )
+
+        assert [function.ToDict() for function in tunedParser.Functions] == [
+            function.ToDict() for function in fullParser.Functions
+        ]
@@ -0,0 +1,87 @@
+import os
+import sys
+import json
+import time
+import subprocess
+from pathlib import Path
+from dataclasses import asdict
+from ntt_autogen import Settings, Template, Binding
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+HEAVY_MODULES = ["jinja2", "clang.cindex", "concurrent.futures.process"]
+
+
+def _CreateProject(projectDir: Path) -> None:
+    (projectDir / "header.h").write_text("struct Point { int x; int y; };")
+    (projectDir / "binding.py.jinja").write_text(
+        "{% for struct in structs %}class {{ struct.name }}: ...\n{% endfor %}"
+    )
+    (projectDir / "config.txt.in").write_text("{{ VALUE }}")
+
+    settings = Settings(
+        templates=[Template(file="config.txt.in")],
+        bindings=[
+            Binding(
+                file="header.h",
+                template="binding.py.jinja",
+                output="binding.py",
+            )
+        ],
+    )
+    (projectDir / "autogen-settings.json").write_text(json.dumps(asdict(settings)))
+
+
+def _RunCli(projectDir: Path) -> tuple[float, int, set[str]]:
+    """
+    Run the command in a new interpreter, returning its wall time, its total import time
+        in microseconds and the imported modules (from `-X importtime`).
+    """
+
+    env = dict(os.environ, PYTHONPATH=str(ROOT_DIR))
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "ntt_autogen.cli"]
+        + ["-C", str(projectDir)],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - start
+    assert result.returncode == 0, result.stderr
+
+    importTime = 0
+    modules: set[str] = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        modules.add(module.strip())
+
+        # the nested imports are already counted by their parent
+        if not module.startswith("  "):
+            importTime += int(cumulative)
+
+    return elapsed, importTime, modules
+
+
+def test_bench_startup(tmp_path: Path) -> None:
+    _CreateProject(tmp_path)
+
+    staleTime, staleImportTime, staleModules = _RunCli(tmp_path)
+    assert (tmp_path / "binding.py").read_text() == "class Point: ...\n"
+
+    noopTime, noopImportTime, noopModules = _RunCli(tmp_path)
+
+    print(
+        f"\n[startup] stale run: {staleTime * 1000:.2f}ms "
+        f"(imports {staleImportTime / 1000:.2f}ms) | "
+        f"no-op run: {noopTime * 1000:.2f}ms "
+        f"(imports {noopImportTime / 1000:.2f}ms)"
+    )
+
+    for module in HEAVY_MODULES[:2]:
+        assert module in staleModules, f'The stale run should import "{module}".'
+    for module in HEAVY_MODULES:
+        assert (
+            module not in noopModules
+        ), f'A run where nothing is stale should not import "{module}".'
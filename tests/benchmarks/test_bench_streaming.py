@@ -0,0 +1,56 @@
+import time
+import tracemalloc
+import pytest  # type: ignore
+from pathlib import Path
+from jinja2 import Environment
+from ntt_autogen.utils import OutputWriter
+
+LINES_COUNT = 200_000
+OUTPUTS_COUNT = 3
+
+
+def _RenderThenWrite(template: object, outputPaths: list[Path]) -> None:
+    content = template.render(LINES=range(LINES_COUNT))  # type: ignore
+    for outputPath in outputPaths:
+        with open(outputPath, "w") as f:
+            f.write(content)
+
+
+def _Measure(function: object, *args: object) -> tuple[float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    function(*args)  # type: ignore
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def test_bench_streaming_peak_memory(tmp_path: Path) -> None:
+    template = Environment().from_string(
+        "{% for line in LINES %}def function_{{ line }}(value: int) -> int: ...\n"
+        "{% endfor %}"
+    )
+    renderedPaths = [
+        tmp_path / f"rendered_{index}.py" for index in range(OUTPUTS_COUNT)
+    ]
+    streamedPaths = [
+        tmp_path / f"streamed_{index}.py" for index in range(OUTPUTS_COUNT)
+    ]
+
+    renderTime, renderPeak = _Measure(_RenderThenWrite, template, renderedPaths)
+    streamTime, streamPeak = _Measure(
+        OutputWriter().Write,
+        template.generate(LINES=range(LINES_COUNT)),
+        [str(path) for path in streamedPaths],
+    )
+
+    print(
+        f"\n[streaming] size={renderedPaths[0].stat().st_size}B outputs={OUTPUTS_COUNT} "
+        f"render: {renderTime * 1000:.2f}ms peak {renderPeak / 1024:.0f}KiB | "
+        f"stream: {streamTime * 1000:.2f}ms peak {streamPeak / 1024:.0f}KiB"
+    )
+
+    for renderedPath, streamedPath in zip(renderedPaths, streamedPaths):
+        assert streamedPath.read_text() == renderedPath.read_text()
+    assert streamPeak * 10 < renderPeak
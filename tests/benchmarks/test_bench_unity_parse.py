@@ -0,0 +1,72 @@
+import time
+import pytest  # type: ignore
+from pathlib import Path
+from ntt_autogen.analyze import Parser, DeclarationFilter, GetSharedIndex
+from ntt_autogen.utils import metrics
+
+HEADERS_COUNT = 40
+COMMON_DECLARATIONS = 2000
+
+
+def _CreateHeaders(folder: Path) -> list[Path]:
+    commonLines = ["#pragma once"]
+    for index in range(COMMON_DECLARATIONS):
+        commonLines.append(f"struct Common{index} {{ int a; float b; }};")
+        commonLines.append(f"int common_{index}(struct Common{index}* value);")
+    (folder / "common.h").write_text("\n".join(commonLines))
+
+    headers: list[Path] = []
+    for index in range(HEADERS_COUNT):
+        header = folder / f"header_{index}.h"
+        header.write_text(
+            f'#pragma once\n#include "common.h"\n'
+            f"struct Header{index} {{ struct Common{index} common; }};\n"
+            f"void header_{index}(struct Header{index}* value);\n"
+        )
+        headers.append(header)
+
+    return headers
+
+
+def _CreateParsers(headers: list[Path]) -> list[Parser]:
+    return [
+        Parser(
+            filePath=str(header),
+            index=GetSharedIndex(),
+            declarationFilter=DeclarationFilter(mainFileOnly=True),
+        )
+        for header in headers
+    ]
+
+
+def test_bench_unity_parse(tmp_path: Path) -> None:
+    headers = _CreateHeaders(tmp_path)
+
+    separateParsers = _CreateParsers(headers)
+    metrics.Reset()
+    start = time.perf_counter()
+    for parser in separateParsers:
+        parser.Parse()
+    separateTime = time.perf_counter() - start
+    separateCounters = metrics.Report()["counters"]
+
+    unityParsers = _CreateParsers(headers)
+    metrics.Reset()
+    start = time.perf_counter()
+    Parser.ParseTogether(unityParsers)
+    unityTime = time.perf_counter() - start
+    unityCounters = metrics.Report()["counters"]
+
+    print(
+        f"\n[unity parse] headers={HEADERS_COUNT} "
+        f"common declarations={COMMON_DECLARATIONS * 2} "
+        f"separate: {separateTime * 1000:.2f}ms | together: {unityTime * 1000:.2f}ms"
+    )
+
+    for separate, unity in zip(separateParsers, unityParsers):
+        assert unity._DumpDeclarations() == separate._DumpDeclarations()
+    assert separateCounters["parse.runs"] == HEADERS_COUNT
+    assert (
+        unityCounters["parse.runs"] == 1
+    ), "The headers should be parsed in a single translation unit."
+    assert unityCounters["parse.unityHeaders"] == HEADERS_COUNT
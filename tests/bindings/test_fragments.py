@@ -0,0 +1,138 @@
+import pytest  # type: ignore
+from pathlib import Path
+from ntt_autogen import Binding
+from ntt_autogen.binding import GenerateBindings
+from ntt_autogen.analyze import ParseCache
+from ntt_autogen.utils import metrics
+
+TEMPLATE = (
+    "{% macro struct_binding(struct) %}"
+    "class {{ struct.name }}:{% for field in struct.fields %} {{ field.name }}"
+    "{% endfor %}\n{% endmacro %}"
+    "{% for struct in structs %}{{ fragment(struct_binding, struct) }}{% endfor %}"
+)
+
+
+def _Generate(projectDir: Path, parseCache: ParseCache | None = None) -> dict[str, int]:
+    binding = Binding(file="header.h", template="binding.py.in", output="binding.py")
+
+    metrics.Reset()
+    GenerateBindings(binding, str(projectDir), "temp", parseCache=parseCache)
+    counters = metrics.Report()["counters"]
+    return {
+        name: counters.get(f"fragments.{name}", 0) for name in ("rendered", "reused")
+    }
+
+
+def test_fragments_are_reused(tmp_path: Path) -> None:
+    (tmp_path / "header.h").write_text(
+        "struct Point { int x; int y; };\nstruct Size { int w; };\n"
+    )
+    (tmp_path / "binding.py.in").write_text(TEMPLATE)
+
+    assert _Generate(tmp_path) == {"rendered": 2, "reused": 0}
+    assert (tmp_path / "binding.py").read_text() == "class Point: x y\nclass Size: w\n"
+
+    # only the modified declaration is rendered again
+    (tmp_path / "header.h").write_text(
+        "struct Point { int x; int y; };\nstruct Size { int w; int h; };\n"
+    )
+    assert _Generate(tmp_path) == {"rendered": 1, "reused": 1}
+    assert (
+        tmp_path / "binding.py"
+    ).read_text() == "class Point: x y\nclass Size: w h\n"
+
+    # a modified template invalidates all the fragments
+    (tmp_path / "binding.py.in").write_text(TEMPLATE.replace("class", "struct"))
+    assert _Generate(tmp_path) == {"rendered": 2, "reused": 0}
+    assert (
+        tmp_path / "binding.py"
+    ).read_text() == "struct Point: x y\nstruct Size: w h\n"
+
+
+def test_fragments_keyed_by_the_comments_read(tmp_path: Path) -> None:
+    header = "/** {} */\nstruct Point {{ int x; }};\n/** A size. */\nstruct Size {{ int w; }};"
+    (tmp_path / "header.h").write_text(header.format("A point."))
+    (tmp_path / "binding.py.in").write_text(TEMPLATE)
+    parseCache = ParseCache(str(tmp_path / "temp" / "parse-cache"))
+
+    assert _Generate(tmp_path, parseCache) == {"rendered": 2, "reused": 0}
+
+    # the fragments do not read the comments
+    (tmp_path / "header.h").write_text(header.format("The point."))
+    assert _Generate(tmp_path, parseCache) == {"rendered": 0, "reused": 2}
+
+    # the comments missing from the parse cache are read from the header once
+    (tmp_path / "binding.py.in").write_text(
+        TEMPLATE.replace(":", ":{{ struct.comment }}")
+    )
+    assert _Generate(tmp_path, parseCache) == {"rendered": 2, "reused": 0}
+    assert metrics.Report()["counters"]["parse.commentRuns"] == 1
+    assert (
+        tmp_path / "binding.py"
+    ).read_text() == "class Point:The point. x\nclass Size:A size. w\n"
+
+    (tmp_path / "header.h").write_text(header.format("A moved point."))
+    assert _Generate(tmp_path, parseCache) == {"rendered": 1, "reused": 1}
+    assert (
+        tmp_path / "binding.py"
+    ).read_text() == "class Point:A moved point. x\nclass Size:A size. w\n"
+
+
+def test_fragment_without_cache(tmp_path: Path) -> None:
+    (tmp_path / "header.h").write_text("")
+    (tmp_path / "binding.py.in").write_text(TEMPLATE)
+    binding = Binding(file="header.h", template="binding.py.in", output="binding.py")
+
+    content, _ = GenerateBindings(
+        binding,
+        str(tmp_path),
+        "temp",
+        testContent="struct Point { int x; };",
+    )
+
+    assert content == "class Point: x\n"
+    assert not (tmp_path / "temp" / "fragment-cache").exists()
+
+
+def test_fragment_is_a_reserved_name(tmp_path: Path) -> None:
+    (tmp_path / "header.h").write_text("struct Point { int x; };")
+    (tmp_path / "binding.py.in").write_text(TEMPLATE)
+    binding = Binding(file="header.h", template="binding.py.in", output="binding.py")
+
+    with pytest.raises(AssertionError, match="reserved by the bindings: fragment"):
+        GenerateBindings(binding, str(tmp_path), "temp", systemData={"fragment": 1})
+
+
+def test_fragments_depend_on_the_variables_read(tmp_path: Path) -> None:
+    (tmp_path / "header.h").write_text("struct Point { int x; };")
+    (tmp_path / "binding.py.in").write_text(TEMPLATE)
+    binding = Binding(file="header.h", template="binding.py.in", output="binding.py")
+
+    GenerateBindings(binding, str(tmp_path), "temp", systemData={"UNUSED": 1})
+
+    # an unrelated variable, even one JSON cannot serialize, keeps the fragments
+    (tmp_path / "header.h").write_text(
+        "struct Point { int x; };\nstruct Size { int w; };"
+    )
+    metrics.Reset()
+    GenerateBindings(
+        binding, str(tmp_path), "temp", systemData={"UNUSED": 2, "helper": lambda s: s}
+    )
+    counters = metrics.Report()["counters"]
+    assert (counters["fragments.rendered"], counters["fragments.reused"]) == (1, 1)
+
+
+def test_fragment_cache_only_for_fragment_templates(tmp_path: Path) -> None:
+    (tmp_path / "header.h").write_text("struct Point { int x; };")
+    (tmp_path / "binding.py.in").write_text(
+        "{% for struct in structs %}{{ helper(struct.name) }}{% endfor %}"
+    )
+    binding = Binding(file="header.h", template="binding.py.in", output="binding.py")
+
+    GenerateBindings(
+        binding, str(tmp_path), "temp", systemData={"helper": lambda s: s.lower()}
+    )
+
+    assert (tmp_path / "binding.py").read_text() == "point"
+    assert not (tmp_path / "temp" / "fragment-cache").exists()
@@ -0,0 +1,93 @@
+import json
+import logging
+import pytest  # type: ignore
+from typing import Any
+from pathlib import Path
+from dataclasses import asdict
+from ntt_autogen import Autogen, Settings
+from ntt_autogen.binding import GenerateBindings
+from ntt_autogen.models import Binding
+from ntt_autogen.type_mapper import TypeMapper, ResetTypeWarnings
+
+
+def test_type_mapper_builtin_and_custom_types() -> None:
+    typeMapper = TypeMapper(customTypes={"Vector": "struct", "Mode": "enum"})
+
+    assert typeMapper.Convert("unsigned int") == "int"
+    assert typeMapper.Convert(" double ") == "float"
+    assert typeMapper.Convert("const char *") == "str"
+    assert typeMapper.Convert("void") == "None"
+    assert typeMapper.Convert("struct Vector") == "Vector"
+    assert typeMapper.Convert("enum Mode") == "Mode"
+
+
+def test_type_mapper_user_types_take_precedence() -> None:
+    typeMapper = TypeMapper(userTypes={"struct Handle": "int", "char *": "bytes"})
+
+    assert typeMapper.Convert("Handle") == "int"
+    assert typeMapper.Convert("struct Handle") == "int"
+    assert typeMapper.Convert("char *") == "bytes"
+
+
+def test_type_mapper_warns_unknown_type_once(caplog: Any) -> None:
+    ResetTypeWarnings()
+
+    # e.g. the type mappers of the bindings of a run
+    with caplog.at_level(logging.WARNING, logger="AUTOGEN"):
+        for _ in range(3):
+            typeMapper = TypeMapper()
+            assert typeMapper.Convert("struct Unknown") == "Any"
+            assert typeMapper.Convert("Unknown") == "Any"
+
+    assert len(caplog.records) == 1
+
+    ResetTypeWarnings()
+    with caplog.at_level(logging.WARNING, logger="AUTOGEN"):
+        assert TypeMapper().Convert("Unknown") == "Any"
+
+    assert len(caplog.records) == 2, "A new run should warn again."
+
+
+def test_generate_bindings_with_type_map(tmp_path: Path) -> None:
+    (tmp_path / "api.h").write_text("")
+    (tmp_path / "binding.py.in").write_text(
+        "{% for function in functions %}"
+        "def {{ function.name }}({{ getFunctionParameters(function) }})"
+        " -> {{ cTypeConvert(function.returnType) }}: ..."
+        "{% endfor %}"
+    )
+
+    binding = Binding(file="api.h", template="binding.py.in", output="binding.py")
+    content, _ = GenerateBindings(
+        binding,
+        str(tmp_path),
+        "temp",
+        testContent="Handle open(const char * path, float mode);",
+        typeMap={"Handle": "int"},
+    )
+
+    assert content == "def open(path: str, mode: float) -> int: ..."
+
+
+def test_unknown_type_warned_once_per_run(tmp_path: Path, caplog: Any) -> None:
+    for name in ("a", "b"):
+        (tmp_path / f"{name}.h").write_text(f"void {name}(struct Unknown* value);")
+    (tmp_path / "binding.py.in").write_text(
+        "{% for function in functions %}{{ getFunctionParameters(function) }}"
+        "{% endfor %}"
+    )
+    settings = Settings(
+        bindings=[
+            Binding(file=f"{name}.h", template="binding.py.in", output=f"{name}.py")
+            for name in ("a", "b")
+        ]
+    )
+    (tmp_path / "autogen-settings.json").write_text(json.dumps(asdict(settings)))
+
+    with caplog.at_level(logging.WARNING, logger="AUTOGEN"):
+        Autogen(baseDir=str(tmp_path))
+
+    warnings = [
+        record for record in caplog.records if "Unknown C type" in record.getMessage()
+    ]
+    assert len(warnings) == 1
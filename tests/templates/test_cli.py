@@ -0,0 +1,136 @@
+import json
+import pytest  # type: ignore
+from pathlib import Path
+from dataclasses import asdict
+from ntt_autogen import Autogen, Settings, Template
+from ntt_autogen.cli import main
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    (tmp_path / "header.jinja").write_text("header")
+    (tmp_path / "first.txt.in").write_text('{% include "header.jinja" %}-first')
+    (tmp_path / "second.txt.in").write_text("second")
+    settings = Settings(
+        templates=[Template(file="first.txt.in"), Template(file="second.txt.in")]
+    )
+    (tmp_path / "autogen-settings.json").write_text(json.dumps(asdict(settings)))
+    return tmp_path
+
+
+def _ReadOutputLines(capsys: pytest.CaptureFixture[str]) -> list[str]:
+    # the log records are printed as well
+    return [
+        line for line in capsys.readouterr().out.splitlines() if "AUTOGEN" not in line
+    ]
+
+
+def test_cli_dry_run_does_not_generate(
+    project: Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    assert main(["-C", str(project), "--dry-run"]) == 0
+
+    assert _ReadOutputLines(capsys) == [
+        "template:first.txt.in",
+        "template:second.txt.in",
+    ]
+    assert not (project / "first.txt").exists()
+    assert not (project / "second.txt").exists()
+
+
+def test_cli_explain_stale_entries(
+    project: Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    assert main(["-C", str(project)]) == 0
+    assert (project / "first.txt").read_text() == "header-first"
+    capsys.readouterr()
+
+    (project / "header.jinja").write_text("new header")
+    (project / "second.txt").unlink()
+
+    assert main(["-C", str(project), "--dry-run", "--explain"]) == 0
+    assert _ReadOutputLines(capsys) == [
+        'template:first.txt.in: "header.jinja" was modified',
+        'template:second.txt.in: output "second.txt" is missing',
+    ]
+
+    assert main(["-C", str(project), "--explain", "--jobs", "2"]) == 0
+    assert (project / "first.txt").read_text() == "new header-first"
+    assert (project / "second.txt").read_text() == "second"
+    capsys.readouterr()
+
+    assert main(["-C", str(project), "--dry-run", "--explain"]) == 0
+    assert _ReadOutputLines(capsys) == []
+
+
+def test_cli_only_generates_matching_entries(project: Path) -> None:
+    assert main(["-C", str(project), "--only", "second.*"]) == 0
+
+    assert not (project / "first.txt").exists()
+    assert (project / "second.txt").read_text() == "second"
+
+
+def test_cli_rejects_invalid_arguments(project: Path) -> None:
+    with pytest.raises(SystemExit) as exitInfo:
+        main(["-C", str(project), "--jobs", "0"])
+    assert exitInfo.value.code == 2
+
+    for arguments in (["-D", "version"], ["-D", "jobs=2"], ["--variables", "none"]):
+        with pytest.raises(SystemExit) as exitInfo:
+            main(["-C", str(project), *arguments])
+        assert exitInfo.value.code == 2
+
+
+def test_cli_passes_render_variables(
+    project: Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    (project / "second.txt.in").write_text("{{ name }} {{ version }}")
+    Autogen(baseDir=str(project), name="lib", version="1.2")
+    assert (project / "second.txt").read_text() == "lib 1.2"
+    capsys.readouterr()
+
+    assert main(["-C", str(project), "--dry-run"]) == 0
+    assert _ReadOutputLines(capsys) == ["template:second.txt.in"]
+
+    (project / "variables.json").write_text(json.dumps({"name": "lib", "version": "1"}))
+    arguments = ["--variables", str(project / "variables.json"), "-D", "version=1.2"]
+    assert main(["-C", str(project), "--dry-run", *arguments]) == 0
+    assert _ReadOutputLines(capsys) == []
+
+    assert main(["-C", str(project), *arguments[:2]]) == 0
+    assert (project / "second.txt").read_text() == "lib 1"
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_cli_writes_metrics(project: Path, jobs: str) -> None:
+    reportPath = project / "reports" / "report.json"
+    tracePath = project / "reports" / "trace.json"
+
+    arguments = ["-C", str(project), "--jobs", jobs]
+    arguments += ["--report", str(reportPath), "--trace", str(tracePath)]
+    assert main(arguments) == 0
+
+    report = json.loads(reportPath.read_text())
+    assert report["counters"]["templates.generated"] == 2
+    assert report["counters"]["outputs.written"] == 2
+    assert report["counters"]["render.characters"] == len("header-first") + len(
+        "second"
+    )
+    assert report["phases"]["entry"]["count"] == 2
+    assert report["phases"]["compile"]["count"] == 2
+
+    trace = json.loads(tracePath.read_text())
+    entries = [event for event in trace["traceEvents"] if event["name"] == "entry"]
+    assert sorted(event["args"]["detail"] for event in entries) == [
+        "template:first.txt.in",
+        "template:second.txt.in",
+    ]
+
+    assert main(arguments) == 0
+
+    report = json.loads(reportPath.read_text())
+    assert report["counters"]["templates.skipped"] == 2
+    assert "outputs.written" not in report["counters"]
@@ -0,0 +1,144 @@
+import os
+import json
+from pathlib import Path
+from dataclasses import asdict
+from ntt_autogen import Autogen, Settings, Template, Binding
+from ntt_autogen.utils import GetManifestFilePath, metrics
+
+
+def _WriteSettings(projectDir: Path, settings: Settings) -> None:
+    (projectDir / "autogen-settings.json").write_text(json.dumps(asdict(settings)))
+
+
+def _Touch(filePath: Path, content: str) -> None:
+    stat = filePath.stat() if filePath.exists() else None
+    filePath.write_text(content)
+    if stat is not None:
+        # make sure the modification is seen whatever the timestamp resolution
+        os.utime(filePath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def _ResetOutputs(*outputs: Path) -> None:
+    for output in outputs:
+        os.utime(output, ns=(0, 0))
+
+
+def _IsRegenerated(output: Path) -> bool:
+    return output.stat().st_mtime_ns != 0
+
+
+def _GeneratedTemplates(projectDir: Path, **kwargs: str) -> int:
+    metrics.Reset()
+    Autogen(baseDir=str(projectDir), **kwargs)
+    return metrics.Report()["counters"].get("templates.generated", 0)
+
+
+def _RecordedInputs(projectDir: Path) -> list[str]:
+    with open(GetManifestFilePath(str(projectDir), "temp"), "r") as f:
+        entries = json.load(f)["entries"]
+    return sorted(filePath for inputs in entries.values() for filePath in inputs)
+
+
+def test_template_tracks_referenced_templates(tmp_path: Path) -> None:
+    (tmp_path / "macros.jinja").write_text(
+        "{% macro greet(name) %}Hi {{ name }}{% endmacro %}"
+    )
+    (tmp_path / "header.jinja").write_text("// header")
+    (tmp_path / "unused.jinja").write_text("unused")
+    (tmp_path / "template.txt.in").write_text(
+        '{% import "macros.jinja" as macros %}{% include "header.jinja" %}\n'
+        "{{ macros.greet(VALUE) }}"
+    )
+    _WriteSettings(tmp_path, Settings(templates=[Template(file="template.txt.in")]))
+
+    Autogen(baseDir=str(tmp_path), VALUE="you")
+    output = tmp_path / "template.txt"
+    assert output.read_text() == "// header\nHi you"
+
+    _ResetOutputs(output)
+    _Touch(tmp_path / "unused.jinja", "still unused")
+    Autogen(baseDir=str(tmp_path), VALUE="you")
+    assert not _IsRegenerated(output), "An unrelated template must not rebuild."
+
+    _Touch(tmp_path / "header.jinja", "// new header")
+    Autogen(baseDir=str(tmp_path), VALUE="you")
+    assert output.read_text() == "// new header\nHi you"
+
+    _ResetOutputs(output)
+    _Touch(
+        tmp_path / "macros.jinja",
+        "{% macro greet(name) %}Hello {{ name }}{% endmacro %}",
+    )
+    Autogen(baseDir=str(tmp_path), VALUE="you")
+    assert output.read_text() == "// new header\nHello you"
+
+
+def test_template_tracks_new_dependency_files(tmp_path: Path) -> None:
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "a.txt").write_text("a")
+    (tmp_path / "template.txt.in").write_text("{{ VALUE }}")
+    _WriteSettings(
+        tmp_path,
+        Settings(
+            templates=[
+                Template(
+                    file="template.txt.in", dependencies=["data"], extensions=[".txt"]
+                )
+            ]
+        ),
+    )
+
+    assert _GeneratedTemplates(tmp_path, VALUE="first") == 1
+    assert _GeneratedTemplates(tmp_path, VALUE="first") == 0
+
+    # the same render variables, only the new file makes the template stale
+    (tmp_path / "data" / "b.txt").write_text("b")
+    assert _GeneratedTemplates(tmp_path, VALUE="first") == 1
+
+    assert (tmp_path / "template.txt").read_text() == "first"
+    assert _RecordedInputs(tmp_path) == [
+        os.path.join("data", "a.txt"),
+        os.path.join("data", "b.txt"),
+        "template.txt.in",
+    ]
+
+
+def test_binding_tracks_its_includes(tmp_path: Path) -> None:
+    include = tmp_path / "include"
+    include.mkdir()
+    (include / "types.h").write_text("#pragma once\nstruct Types { int a; };\n")
+    (include / "unrelated.h").write_text("struct Unrelated { int a; };\n")
+    (include / "api.h").write_text('#include "types.h"\nstruct Api { int a; };\n')
+    (tmp_path / "binding.py.in").write_text(
+        "{% for struct in structs %}{{ struct.name }};{% endfor %}"
+    )
+    _WriteSettings(
+        tmp_path,
+        Settings(
+            bindings=[
+                Binding(
+                    file="include/api.h",
+                    template="binding.py.in",
+                    output="api.py",
+                )
+            ]
+        ),
+    )
+
+    Autogen(baseDir=str(tmp_path))
+    output = tmp_path / "api.py"
+    assert output.read_text() == "Types;Api;"
+
+    _ResetOutputs(output)
+    Autogen(baseDir=str(tmp_path))
+    assert not _IsRegenerated(output), "An up-to-date binding must be skipped."
+
+    _Touch(include / "unrelated.h", "struct Unrelated { long a; };\n")
+    Autogen(baseDir=str(tmp_path))
+    assert not _IsRegenerated(
+        output
+    ), "A header which is not included must not rebuild."
+
+    _Touch(include / "types.h", "#pragma once\nstruct Renamed { int a; };\n")
+    Autogen(baseDir=str(tmp_path))
+    assert output.read_text() == "Renamed;Api;"
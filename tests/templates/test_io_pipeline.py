@@ -0,0 +1,96 @@
+import json
+import time
+import pytest  # type: ignore
+from typing import Any
+from pathlib import Path
+from dataclasses import asdict
+from ntt_autogen import Autogen, Settings, Template, Binding
+from ntt_autogen.utils import StampManifest, output
+
+
+def _WriteSettings(
+    projectDir: Path,
+    templates: list[Template],
+    bindings: list[Binding] | None = None,
+) -> None:
+    settings = Settings(templates=templates, bindings=bindings or [])
+    (projectDir / "autogen-settings.json").write_text(json.dumps(asdict(settings)))
+
+
+def test_entry_reading_a_pending_output(tmp_path: Path) -> None:
+    (tmp_path / "gen").mkdir()
+    (tmp_path / "gen" / "a.txt.in").write_text("first")
+    (tmp_path / "b.txt.in").write_text('b: {% include "gen/a.txt" %}')
+    _WriteSettings(
+        tmp_path,
+        [
+            Template(file="gen/a.txt.in"),
+            Template(file="b.txt.in", dependencies=["gen"], extensions=[".txt"]),
+        ],
+    )
+
+    Autogen(baseDir=str(tmp_path))
+    assert (tmp_path / "b.txt").read_text() == "b: first"
+
+    # the output of the first entry is recorded as an input of the second one
+    (tmp_path / "gen" / "a.txt.in").write_text("second")
+    Autogen(baseDir=str(tmp_path))
+    assert (tmp_path / "b.txt").read_text() == "b: second"
+
+
+def test_failed_write_forgets_the_entry(tmp_path: Path) -> None:
+    for file in ("good1.txt.in", "broken.txt.in", "good2.txt.in"):
+        (tmp_path / file).write_text("{{ VALUE }}")
+    (tmp_path / "broken").mkdir()
+    (tmp_path / "broken" / "file.txt").write_text("")
+    _WriteSettings(
+        tmp_path,
+        [
+            Template(file="good1.txt.in"),
+            Template(file="broken.txt.in", outputs=["broken"]),
+            Template(file="good2.txt.in"),
+        ],
+    )
+
+    with pytest.raises(OSError):
+        Autogen(baseDir=str(tmp_path), VALUE="value")
+
+    assert (tmp_path / "good1.txt").read_text() == "value"
+    assert (tmp_path / "good2.txt").read_text() == "value"
+
+    manifest = StampManifest.Load(str(tmp_path), "temp")
+    assert not manifest.IsEntryModified("template:good1.txt.in")
+    assert not manifest.IsEntryModified("template:good2.txt.in")
+    assert manifest.IsEntryModified(
+        "template:broken.txt.in"
+    ), "An entry whose output was not written must stay stale."
+
+
+def test_binding_including_a_pending_output(tmp_path: Path, monkeypatch: Any) -> None:
+    commit = output._Commit
+
+    def _SlowCommit(*args: Any) -> list[bool]:
+        time.sleep(0.2)
+        return commit(*args)
+
+    monkeypatch.setattr(output, "_Commit", _SlowCommit)
+
+    (tmp_path / "gen").mkdir()
+    (tmp_path / "gen" / "config.h.in").write_text("struct Cfg { int v; };")
+    (tmp_path / "a.h").write_text(
+        '#include "gen/config.h"\nstruct S { struct Cfg c; };'
+    )
+    (tmp_path / "binding.py.in").write_text(
+        "{% for struct in structs %}{{ struct.name }}"
+        "{% for field in struct.fields %} {{ field.name }}:{{ field.type }}{% endfor %}"
+        ";{% endfor %}"
+    )
+    # the binding has no record yet, it does not know it reads the generated header
+    _WriteSettings(
+        tmp_path,
+        [Template(file="gen/config.h.in")],
+        [Binding(file="a.h", template="binding.py.in", output="a.py")],
+    )
+
+    Autogen(baseDir=str(tmp_path))
+    assert (tmp_path / "a.py").read_text() == "Cfg v:int;S c:struct Cfg;"
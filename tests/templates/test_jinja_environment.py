@@ -0,0 +1,57 @@
+import os
+import json
+from pathlib import Path
+from dataclasses import asdict
+from ntt_autogen import Autogen, Settings, Template
+from ntt_autogen.jinja_environment import (
+    BYTECODE_CACHE_FOLDER,
+    CreateEnvironment,
+    LoadTemplate,
+)
+
+
+def test_load_template_reuses_compiled_template(tmp_path: Path) -> None:
+    (tmp_path / "template.txt.in").write_text("{{ VALUE }}")
+    environment = CreateEnvironment(str(tmp_path), "temp")
+
+    template = LoadTemplate(environment, str(tmp_path), "template.txt.in")
+
+    assert template is LoadTemplate(environment, str(tmp_path), "template.txt.in")
+    assert template.render(VALUE="value") == "value"
+    assert list((tmp_path / "temp" / BYTECODE_CACHE_FOLDER).iterdir())
+
+
+def test_load_template_reloads_modified_template(tmp_path: Path) -> None:
+    templatePath = tmp_path / "template.txt.in"
+    templatePath.write_text("old")
+    environment = CreateEnvironment(str(tmp_path), "temp")
+    assert LoadTemplate(environment, str(tmp_path), "template.txt.in").render() == "old"
+
+    templatePath.write_text("new")
+    stat = templatePath.stat()
+    # the auto reload compares the modification time in seconds
+    os.utime(templatePath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+
+    assert LoadTemplate(environment, str(tmp_path), "template.txt.in").render() == "new"
+
+
+def test_load_template_outside_base_dir(tmp_path: Path) -> None:
+    baseDir = tmp_path / "project"
+    baseDir.mkdir()
+    (tmp_path / "shared.txt.in").write_text("{{ VALUE }}")
+    environment = CreateEnvironment(str(baseDir), "temp")
+
+    template = LoadTemplate(environment, str(baseDir), "../shared.txt.in")
+
+    assert template.render(VALUE="value") == "value"
+
+
+def test_templates_include_other_templates(tmp_path: Path) -> None:
+    (tmp_path / "header.jinja").write_text("// {{ VALUE }}\n")
+    (tmp_path / "template.txt.in").write_text('{% include "header.jinja" %}\nbody')
+    settings = Settings(templates=[Template(file="template.txt.in")])
+    (tmp_path / "autogen-settings.json").write_text(json.dumps(asdict(settings)))
+
+    Autogen(baseDir=str(tmp_path), VALUE="value")
+
+    assert (tmp_path / "template.txt").read_text() == "// value\nbody"
@@ -0,0 +1,122 @@
+import json
+import pytest  # type: ignore
+from pathlib import Path
+from dataclasses import asdict
+from ntt_autogen import Autogen, Settings, Template, Binding
+from ntt_autogen.utils import StampManifest
+
+
+def _WriteProject(projectDir: Path, templates: dict[str, str], jobs: int) -> None:
+    for file, content in templates.items():
+        (projectDir / file).write_text(content)
+
+    settings = Settings(
+        templates=[Template(file=file) for file in templates],
+        jobs=jobs,
+    )
+    (projectDir / "autogen-settings.json").write_text(json.dumps(asdict(settings)))
+
+
+def test_parallel_generation(tmp_path: Path) -> None:
+    templates = {
+        f"template{index}.txt.in": f"{index}-{{{{ VALUE }}}}" for index in range(4)
+    }
+    _WriteProject(tmp_path, templates, jobs=3)
+
+    Autogen(baseDir=str(tmp_path), VALUE="value")
+
+    manifest = StampManifest.Load(str(tmp_path), "temp")
+    for index, file in enumerate(templates):
+        assert (tmp_path / file[:-3]).read_text() == f"{index}-value"
+        assert not manifest.IsEntryModified(
+            f"template:{file}"
+        ), f'"{file}" was not stamped.'
+
+
+def test_parallel_generation_failure_keeps_other_stamps(tmp_path: Path) -> None:
+    templates = {
+        "good1.txt.in": "{{ VALUE }}",
+        "broken.txt.in": "{{ 1 / 0 }}",
+        "good2.txt.in": "{{ VALUE }}",
+    }
+    _WriteProject(tmp_path, templates, jobs=1)
+
+    with pytest.raises(RuntimeError, match="broken.txt.in"):
+        Autogen(baseDir=str(tmp_path), jobs=2, VALUE="value")
+
+    assert (tmp_path / "good1.txt").read_text() == "value"
+    assert (tmp_path / "good2.txt").read_text() == "value"
+    assert not (tmp_path / "broken.txt").exists()
+
+    manifest = StampManifest.Load(str(tmp_path), "temp")
+    assert not manifest.IsEntryModified("template:good1.txt.in")
+    assert not manifest.IsEntryModified("template:good2.txt.in")
+    assert manifest.IsEntryModified(
+        "template:broken.txt.in"
+    ), "Failed entry must stay stale."
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_binding_group_generation(tmp_path: Path, jobs: int) -> None:
+    (tmp_path / "common.h").write_text(
+        "#pragma once\n"
+        'struct __attribute__((annotate("binding"))) Common { int a; };\n'
+    )
+    for name in ("window", "input"):
+        (tmp_path / f"{name}.h").write_text(
+            f'#pragma once\n#include "common.h"\nstruct {name.title()} {{ int a; }};\n'
+            f"void {name}_open(struct Common common);\n"
+        )
+    (tmp_path / "binding.py.in").write_text(
+        "{% for struct in structs %}{{ struct.name }};{% endfor %}"
+        "{% for function in functions %}{{ function.name }};{% endfor %}"
+    )
+
+    settings = Settings(
+        templates=[Template(file="unused.txt.in")],
+        bindings=[
+            Binding(
+                file=f"{name}.h",
+                template="binding.py.in",
+                output=f"{name}.py",
+                group="platform",
+            )
+            for name in ("window", "input")
+        ]
+        + [Binding(file="common.h", template="binding.py.in", output="common.py")],
+        jobs=jobs,
+    )
+    (tmp_path / "unused.txt.in").write_text("")
+    (tmp_path / "autogen-settings.json").write_text(json.dumps(asdict(settings)))
+
+    Autogen(baseDir=str(tmp_path))
+
+    assert (tmp_path / "window.py").read_text() == "Window;window_open;"
+    assert (tmp_path / "input.py").read_text() == "Input;input_open;"
+    assert (tmp_path / "common.py").read_text() == "Common;"
+
+
+def test_parallel_bindings_of_one_header(tmp_path: Path) -> None:
+    # large enough for the workers to store it at the same time
+    (tmp_path / "shared.h").write_text(
+        "".join(f"struct Struct{index} {{ int a; }};\n" for index in range(2000))
+    )
+    (tmp_path / "binding.py.in").write_text(
+        "{% for struct in structs %}{{ struct.name }};{% endfor %}"
+    )
+
+    # every worker parses the header and stores it in the parse cache
+    settings = Settings(
+        bindings=[
+            Binding(file="shared.h", template="binding.py.in", output=f"out{index}.py")
+            for index in range(8)
+        ],
+        jobs=8,
+    )
+    (tmp_path / "autogen-settings.json").write_text(json.dumps(asdict(settings)))
+
+    Autogen(baseDir=str(tmp_path))
+
+    for index in range(8):
+        assert (tmp_path / f"out{index}.py").read_text().startswith("Struct0;")
+    assert not list((tmp_path / "temp").rglob("*.tmp"))
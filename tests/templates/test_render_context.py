@@ -0,0 +1,125 @@
+import json
+from typing import Any
+from pathlib import Path
+from dataclasses import asdict
+from ntt_autogen import Autogen, Settings, Template
+from ntt_autogen.utils import StampManifest, GetManifestFilePath
+
+
+def _WriteProject(projectDir: Path, templates: list[Template]) -> None:
+    settings = Settings(templates=templates)
+    (projectDir / "autogen-settings.json").write_text(json.dumps(asdict(settings)))
+
+
+def _Generated(caplog: Any) -> list[str]:
+    generated = [
+        record.getMessage()
+        for record in caplog.records
+        if record.getMessage().startswith("Generated file")
+    ]
+    caplog.clear()
+    return generated
+
+
+def test_kwargs_change_rebuilds_affected_entries(tmp_path: Path, caplog: Any) -> None:
+    (tmp_path / "value.txt.in").write_text("{{ VALUE }}")
+    (tmp_path / "other.txt.in").write_text("{{ OTHER }}")
+    (tmp_path / "included.txt.in").write_text('{% include "part.jinja" %}')
+    (tmp_path / "part.jinja").write_text("{{ VALUE }}")
+    _WriteProject(
+        tmp_path,
+        [
+            Template(file="value.txt.in"),
+            Template(file="other.txt.in"),
+            Template(file="included.txt.in"),
+        ],
+    )
+
+    Autogen(baseDir=str(tmp_path), VALUE="a", OTHER="b")
+    assert len(_Generated(caplog)) == 3
+
+    Autogen(baseDir=str(tmp_path), VALUE="a", OTHER="b")
+    assert _Generated(caplog) == []
+
+    # the variables read through an included template are tracked as well
+    Autogen(baseDir=str(tmp_path), VALUE="c", OTHER="b")
+    assert (tmp_path / "value.txt").read_text() == "c"
+    assert (tmp_path / "included.txt").read_text() == "c"
+    assert (tmp_path / "other.txt").read_text() == "b"
+    assert sorted(_Generated(caplog)) == [
+        'Generated file "included.txt" from template "included.txt.in".',
+        'Generated file "value.txt" from template "value.txt.in".',
+    ]
+
+    # a variable which is not read does not matter
+    Autogen(baseDir=str(tmp_path), VALUE="c", OTHER="b", UNUSED=1)
+    assert _Generated(caplog) == []
+
+
+def test_settings_entry_change_rebuilds(tmp_path: Path, caplog: Any) -> None:
+    (tmp_path / "a.txt.in").write_text("{{ VALUE }}")
+    (tmp_path / "b.txt.in").write_text("{{ VALUE }}")
+    _WriteProject(tmp_path, [Template(file="a.txt.in"), Template(file="b.txt.in")])
+
+    Autogen(baseDir=str(tmp_path), VALUE="a")
+    _Generated(caplog)
+
+    _WriteProject(
+        tmp_path,
+        [
+            Template(file="a.txt.in", outputs=["a.txt", "copy.txt"]),
+            Template(file="b.txt.in"),
+        ],
+    )
+    (tmp_path / "copy.txt").write_text("a")  # only the settings changed
+
+    Autogen(baseDir=str(tmp_path), VALUE="a")
+    assert _Generated(caplog) == [
+        'Generated file "a.txt" from template "a.txt.in".',
+        'Generated file "copy.txt" from template "a.txt.in".',
+    ]
+
+
+def test_record_without_context_is_adopted(tmp_path: Path, caplog: Any) -> None:
+    (tmp_path / "a.txt.in").write_text("{{ VALUE }}")
+    _WriteProject(tmp_path, [Template(file="a.txt.in")])
+
+    Autogen(baseDir=str(tmp_path), VALUE="a")
+    _Generated(caplog)
+
+    # a manifest written before the render contexts were recorded
+    manifestPath = Path(GetManifestFilePath(str(tmp_path), "temp"))
+    data = json.loads(manifestPath.read_text())
+    del data["contexts"]
+    data["version"] = 2
+    manifestPath.write_text(json.dumps(data))
+
+    Autogen(baseDir=str(tmp_path), VALUE="a")
+    assert _Generated(caplog) == []
+
+    manifest = StampManifest.Load(str(tmp_path), "temp")
+    assert manifest.IsEntryModified("template:a.txt.in") is False
+
+    Autogen(baseDir=str(tmp_path), VALUE="b")
+    assert (tmp_path / "a.txt").read_text() == "b"
+
+
+class _Helper:
+    def __str__(self) -> str:
+        return "helper"
+
+
+def test_unserializable_variables_render(tmp_path: Path, caplog: Any) -> None:
+    (tmp_path / "value.txt.in").write_text("{{ fmt(VALUE) }} {{ obj }}")
+    _WriteProject(tmp_path, [Template(file="value.txt.in")])
+
+    Autogen(baseDir=str(tmp_path), VALUE="a", fmt=lambda s: s.upper(), obj=_Helper())
+    assert (tmp_path / "value.txt").read_text() == "A helper"
+    assert len(_Generated(caplog)) == 1
+
+    # new instances, their fingerprint does not depend on their address
+    Autogen(baseDir=str(tmp_path), VALUE="a", fmt=lambda s: s.upper(), obj=_Helper())
+    assert _Generated(caplog) == []
+
+    Autogen(baseDir=str(tmp_path), VALUE="b", fmt=lambda s: s.upper(), obj=_Helper())
+    assert (tmp_path / "value.txt").read_text() == "B helper"
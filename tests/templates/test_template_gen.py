@@ -4,6 +4,20 @@ import json
 from dataclasses import asdict
 from pyfakefs.fake_filesystem import FakeFilesystem
 from ntt_autogen import Autogen, Settings, Template
+from ntt_autogen.utils import DependencyScanCache, GetManifestFilePath, metrics
+
+
+def _ReadStamp(filePath: str) -> int | None:
+    manifestPath = GetManifestFilePath("/project", "temp")
+    if not os.path.exists(manifestPath):
+        return None
+
+    with open(manifestPath, "r") as f:
+        entries = json.load(f)["entries"]
+
+    # the stamps are recorded per template, keep the latest one
+    stamps = [inputs[filePath] for inputs in entries.values() if filePath in inputs]
+    return max(stamp[0] for stamp in stamps) if stamps else None
 
 
 def test_auto_generate_config(fs: FakeFilesystem) -> None:
@@ -31,9 +45,7 @@ def test_auto_generate_config(fs: FakeFilesystem) -> None:
         data = json.loads(generated_config)
         assert data["setting1"] == "value1", "setting1 was not set correctly."
 
-    assert os.path.exists(
-        "/project/temp/config.json.in.stamp"
-    ), "Stamp file was not created."
+    assert _ReadStamp("config.json.in") is not None, "Stamp file was not created."
 
 
 def test_auto_generate_setting_file(fs: FakeFilesystem) -> None:
@@ -73,15 +85,21 @@ def test_skip_unchanged_template(fs: FakeFilesystem) -> None:
 
     Autogen(baseDir="/project", VALUE="initial")
 
-    firstStampTime = os.path.getmtime("/project/temp/template.json.in.stamp")
+    manifestPath = GetManifestFilePath("/project", "temp")
+    firstStampTime = os.path.getmtime(manifestPath)
+    firstOutputTime = os.path.getmtime("/project/template.json")
 
+    time.sleep(0.1)
     Autogen(baseDir="/project", VALUE="initial")
 
-    secondStampTime = os.path.getmtime("/project/temp/template.json.in.stamp")
+    secondStampTime = os.path.getmtime(manifestPath)
 
     assert (
         firstStampTime == secondStampTime
-    ), "Stamp file was updated despite no changes to the template."
+    ), "Stamp manifest was updated despite no changes to the template."
+    assert firstOutputTime == os.path.getmtime(
+        "/project/template.json"
+    ), "Output was regenerated despite no changes to the template."
 
 
 def test_auto_generate_template_if_source_changed(fs: FakeFilesystem) -> None:
@@ -102,7 +120,7 @@ def test_auto_generate_template_if_source_changed(fs: FakeFilesystem) -> None:
 
     Autogen(baseDir="/project", VALUE="initial")
 
-    firstStampTime = os.path.getmtime("/project/temp/template.json.in.stamp")
+    firstStampTime = _ReadStamp("template.json.in")
 
     time.sleep(0.1)
     with open("/project/template.json.in", "w") as f:
@@ -117,7 +135,7 @@ def test_auto_generate_template_if_source_changed(fs: FakeFilesystem) -> None:
 
     Autogen(baseDir="/project", VALUE="initial")
 
-    secondStampTime = os.path.getmtime("/project/temp/template.json.in.stamp")
+    secondStampTime = _ReadStamp("template.json.in")
 
     with open("/project/template.json", "r") as f:
         generated_content = f.read()
@@ -165,27 +183,36 @@ def test_autogen_with_dependencies(fs: FakeFilesystem) -> None:
 
     Autogen(baseDir="/project", BASE_VALUE="base1")
 
-    assert os.path.exists(
-        "/project/temp/base.json.in.stamp"
-    ), "Stamp file was not created."
+    assert _ReadStamp("base.json.in") is not None, "Stamp file was not created."
 
-    assert os.path.exists(
-        "/project/temp/depedencies.txt.stamp"
+    assert (
+        _ReadStamp("depedencies.txt") is not None
     ), "Dependency stamp file was not created."
 
-    firstStampTime = os.path.getmtime("/project/temp/base.json.in.stamp")
+    firstStampTime = _ReadStamp("depedencies.txt")
+    firstOutputTime = os.path.getmtime("/project/base.json")
 
     time.sleep(0.1)
     with open("/project/depedencies.txt", "w") as f:
         f.write("base.json.in\nadditional_dependency.txt\n")
 
+    metrics.Reset()
     Autogen(baseDir="/project", BASE_VALUE="base1")
+    counters = metrics.Report()["counters"]
 
-    secondStampTime = os.path.getmtime("/project/temp/base.json.in.stamp")
+    secondStampTime = _ReadStamp("depedencies.txt")
 
     assert (
         firstStampTime < secondStampTime
     ), "Stamp file was not updated after dependency file was modified."
+    assert (
+        counters["templates.generated"] == 1
+    ), "Output was not regenerated after dependency file was modified."
+
+    # the regenerated output has the same content, it is left untouched
+    assert counters["outputs.unchanged"] == 1
+    assert "outputs.written" not in counters
+    assert firstOutputTime == os.path.getmtime("/project/base.json")
 
     with open("/project/base.json", "r") as f:
         generated_content = f.read()
@@ -238,8 +265,8 @@ def test_templates_with_shared_dependencies(fs: FakeFilesystem) -> None:
 
     Autogen(baseDir="/project", TEMPLATE_NAME="Hello")
 
-    assert os.path.exists(
-        "/project/temp/template1.json.in.stamp"
+    assert (
+        _ReadStamp("template1.json.in") is not None
     ), "Stamp file for template1 was not created."
 
     with open("/project/template1.json", "r") as f:
@@ -247,8 +274,8 @@ def test_templates_with_shared_dependencies(fs: FakeFilesystem) -> None:
         data1 = json.loads(generated_content1)
         assert data1["template"] == "Hello", "Template1 was not generated correctly."
 
-    assert os.path.exists(
-        "/project/temp/template2.json.in.stamp"
+    assert (
+        _ReadStamp("template2.json.in") is not None
     ), "Stamp file for template2 was not created."
 
     with open("/project/template2.json", "r") as f:
@@ -256,9 +283,29 @@ def test_templates_with_shared_dependencies(fs: FakeFilesystem) -> None:
         data2 = json.loads(generated_content2)
         assert data2["template"] == "Hello", "Template2 was not generated correctly."
 
+    firstStampTime = _ReadStamp("shared_dep.txt")
+
+    metrics.Reset()
+    Autogen(baseDir="/project", TEMPLATE_NAME="Hello")
+
+    assert (
+        metrics.Report()["counters"]["templates.skipped"] == 2
+    ), "The templates were regenerated without any change."
+
     time.sleep(0.1)
+    with open("/project/shared_dep.txt", "w") as f:
+        f.write("Modified shared dependency content")
 
-    Autogen(baseDir="/project", TEMPLATE_NAME="World")
+    # the same render variables, only the shared dependency makes the templates stale
+    metrics.Reset()
+    Autogen(baseDir="/project", TEMPLATE_NAME="Hello")
+
+    assert (
+        metrics.Report()["counters"]["templates.generated"] == 2
+    ), "The templates were not regenerated after the shared dependency changed."
+    assert (
+        firstStampTime < _ReadStamp("shared_dep.txt")
+    ), "The stamp of the shared dependency was not updated."
 
     with open("/project/template1.json", "r") as f:
         generated_content1 = f.read()
@@ -270,18 +317,70 @@ def test_templates_with_shared_dependencies(fs: FakeFilesystem) -> None:
         data2 = json.loads(generated_content2)
         assert data2["template"] == "Hello", "Template2 was not regenerated correctly."
 
+
+def test_shared_dependency_scan_cache(fs: FakeFilesystem) -> None:
+    os.makedirs("/project/include", exist_ok=True)
+
+    with open("/project/include/shared.h", "w") as f:
+        f.write("int shared;")
+
+    templates = [
+        Template(
+            file=f"template{index}.txt.in",
+            dependencies=["include"],
+            extensions=[".h"],
+        )
+        for index in range(3)
+    ]
+
+    for template in templates:
+        with open(f"/project/{template.file}", "w") as f:
+            f.write("{{ VALUE }}")
+
+    with open("/project/autogen-settings.json", "w") as f:
+        f.write(json.dumps(asdict(Settings(templates=templates))))
+
+    scanCache = DependencyScanCache()
+    Autogen(baseDir="/project", scanCache=scanCache, VALUE="first")
+
+    assert scanCache.misses == 1, "The shared folder should be scanned only once."
+    assert scanCache.hits == 2, "The other templates should reuse the scan."
+
+    Autogen(baseDir="/project", scanCache=scanCache, VALUE="first")
+
+    assert scanCache.misses == 1, "The scan should be reused across runs."
+    assert scanCache.hits == 5
+
+    scanCache.Invalidate("/project/include")
+    Autogen(baseDir="/project", scanCache=scanCache, VALUE="first")
+
+    assert scanCache.misses == 2, "The invalidated folder should be scanned again."
+
+
+def test_migrate_legacy_stamp_files(fs: FakeFilesystem) -> None:
+    os.makedirs("/project/temp", exist_ok=True)
+
+    with open("/project/template.txt.in", "w") as f:
+        f.write("{{ VALUE }}")
+
+    with open("/project/autogen-settings.json", "w") as f:
+        f.write(
+            json.dumps(asdict(Settings(templates=[Template(file="template.txt.in")])))
+        )
+
+    with open("/project/template.txt", "w") as f:
+        f.write("legacy")
+
     time.sleep(0.1)
-    with open("/project/shared_dep.txt", "w") as f:
-        f.write("Modified shared dependency content")
+    with open("/project/temp/template.txt.in.stamp", "w") as f:
+        f.write("")
 
-    Autogen(baseDir="/project", TEMPLATE_NAME="New")
+    Autogen(baseDir="/project", VALUE="new")
 
-    with open("/project/template1.json", "r") as f:
-        generated_content1 = f.read()
-        data1 = json.loads(generated_content1)
-        assert data1["template"] == "New", "Template1 was not regenerated correctly."
+    with open("/project/template.txt", "r") as f:
+        assert f.read() == "legacy", "Migrated stamps should keep the template cached."
 
-    with open("/project/template2.json", "r") as f:
-        generated_content2 = f.read()
-        data2 = json.loads(generated_content2)
-        assert data2["template"] == "New", "Template2 was not regenerated correctly."
+    assert _ReadStamp("template.txt.in") is not None, "Legacy stamp was not migrated."
+    assert not os.path.exists(
+        "/project/temp/template.txt.in.stamp"
+    ), "Legacy stamp file was not removed."
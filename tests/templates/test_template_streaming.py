@@ -0,0 +1,77 @@
+import os
+import json
+import pytest  # type: ignore
+from typing import Any
+from pathlib import Path
+from dataclasses import asdict
+from ntt_autogen import Autogen, Settings, Template
+from ntt_autogen.template_gen import GenerateTemplate
+
+
+def test_generate_template_without_content(tmp_path: Path) -> None:
+    (tmp_path / "template.txt.in").write_text("{{ VALUE }}")
+    template = Template(file="template.txt.in", outputs=["a.txt", "b/b.txt"])
+
+    content, _ = GenerateTemplate(
+        template,
+        str(tmp_path),
+        "temp",
+        returnContent=False,
+        VALUE="value",
+    )
+
+    assert content == ""
+    assert (tmp_path / "a.txt").read_text() == "value"
+    assert (tmp_path / "b" / "b.txt").read_text() == "value"
+
+
+def test_autogen_keeps_unchanged_outputs(tmp_path: Path, caplog: Any) -> None:
+    (tmp_path / "include").mkdir()
+    (tmp_path / "include" / "a.h").write_text("int a;")
+    (tmp_path / "template.txt.in").write_text("{{ VALUE }}")
+    settings = Settings(
+        templates=[
+            Template(
+                file="template.txt.in", dependencies=["include"], extensions=[".h"]
+            )
+        ]
+    )
+    (tmp_path / "autogen-settings.json").write_text(json.dumps(asdict(settings)))
+
+    Autogen(baseDir=str(tmp_path), VALUE="value")
+    assert "Outputs: 1 written, 0 unchanged." in caplog.messages
+
+    outputPath = tmp_path / "template.txt"
+    os.utime(outputPath, ns=(0, 0))
+    (tmp_path / "include" / "a.h").write_text("int a, b;")
+    caplog.clear()
+
+    Autogen(baseDir=str(tmp_path), VALUE="value")
+
+    assert "Outputs: 0 written, 1 unchanged." in caplog.messages
+    assert outputPath.stat().st_mtime_ns == 0
+
+
+def test_render_variables_named_like_arguments(tmp_path: Path) -> None:
+    (tmp_path / "template.txt.in").write_text("{{ manifest }}-{{ environment }}")
+    template = Template(file="template.txt.in")
+
+    content, _ = GenerateTemplate(
+        template,
+        str(tmp_path),
+        "temp",
+        renderData={"manifest": "a", "environment": "b"},
+    )
+    assert content == "a-b"
+
+    with pytest.raises(AssertionError, match="VALUE"):
+        GenerateTemplate(
+            template, str(tmp_path), "temp", renderData={"VALUE": 1}, VALUE=2
+        )
+
+    # the keyword arguments of a run are passed as render data
+    settings = Settings(templates=[template])
+    (tmp_path / "autogen-settings.json").write_text(json.dumps(asdict(settings)))
+    (tmp_path / "template.txt").unlink()
+    Autogen(baseDir=str(tmp_path), manifest="c", environment="d")
+    assert (tmp_path / "template.txt").read_text() == "c-d"
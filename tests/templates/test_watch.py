@@ -0,0 +1,76 @@
+import json
+import time
+import pytest  # type: ignore
+import threading
+from pathlib import Path
+from typing import Callable
+from dataclasses import asdict
+from ntt_autogen import Settings, Template, Watch
+
+TIMEOUT = 10.0
+
+
+def _WaitFor(condition: Callable[[], bool]) -> None:
+    deadline = time.monotonic() + TIMEOUT
+    while not condition():
+        assert time.monotonic() < deadline, "Timed out waiting for the regeneration."
+        time.sleep(0.02)
+
+
+def _ReadOutput(outputPath: Path) -> str | None:
+    try:
+        return outputPath.read_text()
+    except FileNotFoundError:
+        return None
+
+
+def _WriteSettings(projectDir: Path, templates: list[Template]) -> None:
+    settingFile = projectDir / "autogen-settings.json"
+    settingFile.write_text(json.dumps(asdict(Settings(templates=templates))))
+
+
+@pytest.mark.parametrize("polling", [False, True])
+def test_watch_regenerates_changed_entries(tmp_path: Path, polling: bool) -> None:
+    (tmp_path / "header.jinja").write_text("first")
+    (tmp_path / "template.txt.in").write_text(
+        '{% include "header.jinja" %}-{{ VALUE }}'
+    )
+    (tmp_path / "other.txt.in").write_text("{{ VALUE }}")
+    _WriteSettings(tmp_path, [Template(file="template.txt.in")])
+
+    stopEvent = threading.Event()
+    thread = threading.Thread(
+        target=Watch,
+        kwargs=dict(
+            baseDir=str(tmp_path),
+            debounce=0.05,
+            pollInterval=0.05,
+            polling=polling,
+            stopEvent=stopEvent,
+            VALUE="value",
+        ),
+    )
+    thread.start()
+
+    try:
+        output = tmp_path / "template.txt"
+        _WaitFor(lambda: _ReadOutput(output) == "first-value")
+
+        (tmp_path / "header.jinja").write_text("second")
+        _WaitFor(lambda: _ReadOutput(output) == "second-value")
+
+        # the settings are reloaded
+        _WriteSettings(
+            tmp_path,
+            [Template(file="template.txt.in"), Template(file="other.txt.in")],
+        )
+        _WaitFor(lambda: _ReadOutput(tmp_path / "other.txt") == "value")
+
+        # a deleted output is generated again
+        output.unlink()
+        _WaitFor(lambda: _ReadOutput(output) == "second-value")
+    finally:
+        stopEvent.set()
+        thread.join(TIMEOUT)
+
+    assert not thread.is_alive()
@@ -0,0 +1,114 @@
+import os
+import time
+from pyfakefs.fake_filesystem import FakeFilesystem
+from ntt_autogen.utils import (
+    StampManifest,
+    IsFileModified,
+    UpdateFileStamp,
+    ClearCache,
+    GetManifestFilePath,
+)
+
+
+def test_manifest_tracks_file_changes(fs: FakeFilesystem) -> None:
+    fs.create_file("/project/include/a.h", contents="int a;")  # type: ignore
+
+    assert IsFileModified("include/a.h", "/project", "temp")
+
+    UpdateFileStamp("include/a.h", "/project", "temp")
+
+    assert os.path.exists(GetManifestFilePath("/project", "temp"))
+    assert not IsFileModified("include/a.h", "/project", "temp")
+
+    time.sleep(0.01)
+    with open("/project/include/a.h", "w") as f:
+        f.write("int a, b;")
+
+    assert IsFileModified("include/a.h", "/project", "temp")
+
+
+def test_manifest_is_saved_once(fs: FakeFilesystem) -> None:
+    for index in range(10):
+        fs.create_file(f"/project/include/{index}.h")  # type: ignore
+
+    manifest = StampManifest.Load("/project", "temp")
+    for index in range(10):
+        manifest.Update(f"include/{index}.h")
+
+    assert not os.path.exists(GetManifestFilePath("/project", "temp"))
+
+    manifest.Save()
+
+    assert os.listdir("/project/temp") == ["stamps.json"]
+
+    reloaded = StampManifest.Load("/project", "temp")
+    assert not any(reloaded.IsModified(f"include/{index}.h") for index in range(10))
+
+
+def test_clear_cache_removes_manifest(fs: FakeFilesystem) -> None:
+    fs.create_file("/project/a.h")  # type: ignore
+    UpdateFileStamp("a.h", "/project", "temp")
+
+    ClearCache("/project", "temp")
+
+    assert not os.path.exists(GetManifestFilePath("/project", "temp"))
+    assert IsFileModified("a.h", "/project", "temp")
+
+
+def test_hash_mode_ignores_touched_files(fs: FakeFilesystem) -> None:
+    fs.create_file("/project/a.h", contents="int a;")  # type: ignore
+
+    manifest = StampManifest.Load("/project", "temp", "hash")
+    manifest.Update("a.h")
+    manifest.Save()
+
+    stat = os.stat("/project/a.h")
+    os.utime("/project/a.h", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    manifest = StampManifest.Load("/project", "temp", "hash")
+    assert not manifest.IsModified("a.h"), "Touched file should not be modified."
+
+    with open("/project/a.h", "w") as f:
+        f.write("int b;")
+
+    assert manifest.IsModified("a.h"), "Same size but new content is a modification."
+
+    mtimeManifest = StampManifest.Load("/project", "temp", "mtime")
+    assert mtimeManifest.IsModified("a.h")
+
+
+def test_entries_record_their_own_inputs(fs: FakeFilesystem) -> None:
+    fs.create_file("/project/shared.h", contents="int a;")  # type: ignore
+    fs.create_file("/project/other.h", contents="int b;")  # type: ignore
+
+    manifest = StampManifest.Load("/project", "temp")
+    manifest.UpdateEntry("first", ["shared.h"])
+    manifest.UpdateEntry("second", ["shared.h", "other.h"])
+    manifest.Save()
+
+    time.sleep(0.01)
+    with open("/project/shared.h", "w") as f:
+        f.write("int a, b;")
+
+    manifest = StampManifest.Load("/project", "temp")
+    assert manifest.IsEntryModified("first")
+    manifest.UpdateEntry("first", ["shared.h"])
+
+    # the new record of the first entry does not hide the change from the second one
+    assert not manifest.IsEntryModified("first")
+    assert manifest.IsEntryModified("second")
+    assert manifest.IsEntryModified("unknown")
+
+
+def test_entries_updates_are_merged(fs: FakeFilesystem) -> None:
+    fs.create_file("/project/a.h", contents="int a;")  # type: ignore
+
+    manifest = StampManifest.Load("/project", "temp")
+    workerManifest = StampManifest.Load("/project", "temp")
+    workerManifest.UpdateEntry("entry", ["a.h"])
+
+    manifest.Merge(workerManifest.TakeUpdates())
+    manifest.Save()
+
+    assert not StampManifest.Load("/project", "temp").IsEntryModified("entry")
+    assert not workerManifest.TakeUpdates().entries
@@ -0,0 +1,67 @@
+import os
+from pyfakefs.fake_filesystem import FakeFilesystem
+from ntt_autogen.utils import (
+    AllDependenciesFiles,
+    DependencyScanCache,
+    ScanDependencies,
+)
+
+
+def test_scan_nested_dependencies(fs: FakeFilesystem) -> None:
+    fs.create_file("/project/include/a.h", contents="int a;")  # type: ignore
+    fs.create_file("/project/include/sub/b.h", contents="int bb;")  # type: ignore
+    fs.create_file("/project/include/sub/deep/c.h")  # type: ignore
+    fs.create_file("/project/include/sub/deep/ignored.txt")  # type: ignore
+
+    files = ScanDependencies(["include"], [".h"], "/project")
+
+    assert [file.path for file in files] == [
+        os.path.join("include", "a.h"),
+        os.path.join("include", "sub", "b.h"),
+        os.path.join("include", "sub", "deep", "c.h"),
+    ]
+    assert files[0].size == 6
+    assert files[1].size == 7
+    assert files[0].mtimeNs == os.stat("/project/include/a.h").st_mtime_ns
+
+
+def test_scan_overlapping_dependencies(fs: FakeFilesystem) -> None:
+    fs.create_file("/project/include/a.h")  # type: ignore
+    fs.create_file("/project/include/sub/b.h")  # type: ignore
+
+    files = AllDependenciesFiles(["include", "include/sub"], [".h"], "/project")
+
+    assert files == [
+        os.path.join("include", "a.h"),
+        os.path.join("include", "sub", "b.h"),
+    ]
+
+
+def test_scan_missing_dependency_folder(fs: FakeFilesystem) -> None:
+    fs.makedir("/project")  # type: ignore
+
+    assert ScanDependencies(["missing"], [".h"], "/project") == []
+
+
+def test_scan_cache_takes_stats_per_run(fs: FakeFilesystem) -> None:
+    fs.create_file("/project/include/a.h", contents="int a;")  # type: ignore
+    os.utime("/project/include/a.h", ns=(1_000_000_000, 1_000_000_000))
+
+    scanCache = DependencyScanCache()
+    scanCache.NewRun()
+    ScanDependencies(["include"], [".h"], "/project", scanCache)
+
+    # edited in place, the listing of the folder does not change
+    with open("/project/include/a.h", "w") as f:
+        f.write("int edited;")
+    os.utime("/project/include/a.h", ns=(2_000_000_000, 2_000_000_000))
+
+    files = ScanDependencies(["include"], [".h"], "/project", scanCache)
+    assert files[0].mtimeNs == 1_000_000_000, "The stats are kept within a run."
+
+    scanCache.NewRun()
+    files = ScanDependencies(["include"], [".h"], "/project", scanCache)
+
+    assert scanCache.misses == 1, "The listing should be reused across runs."
+    assert files[0].mtimeNs == 2_000_000_000
+    assert files[0].size == 11
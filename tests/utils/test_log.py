@@ -0,0 +1,53 @@
+import logging
+import pytest  # type: ignore
+from typing import Any, Iterator
+from ntt_autogen.utils import (
+    logger,
+    LazyMessage,
+    SetLogLevel,
+    BackgroundLogging,
+    ForegroundLogging,
+)
+
+
+@pytest.fixture(autouse=True)
+def restoreLevel() -> Iterator[None]:
+    level = logger.level
+    yield
+    logger.setLevel(level)
+
+
+def test_lazy_message_only_built_when_enabled(capsys: Any) -> None:
+    calls: list[int] = []
+
+    def BuildPayload() -> str:
+        calls.append(1)
+        return "payload"
+
+    SetLogLevel("info")
+    logger.debug("Files: %s", LazyMessage(BuildPayload))
+    assert calls == [], "The payload should not be built for a disabled level."
+
+    SetLogLevel(logging.DEBUG)
+    logger.debug("Files: %s", LazyMessage(BuildPayload))
+    assert calls == [1]
+    assert "Files: payload" in capsys.readouterr().out
+
+
+def test_background_logging_writes_pending_records(capsys: Any) -> None:
+    handlers = list(logger.handlers)
+
+    with BackgroundLogging():
+        with BackgroundLogging():
+            for index in range(100):
+                logger.info("record %d", index)
+        assert logger.handlers != handlers, "The outer block should keep the thread."
+
+        with ForegroundLogging():
+            assert logger.handlers == handlers
+            logger.info("direct")
+
+    assert logger.handlers == handlers
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 101
+    assert [line for line in lines if "record" in line][-1].endswith("record 99\x1b[0m")
@@ -0,0 +1,76 @@
+import json
+from pyfakefs.fake_filesystem import FakeFilesystem
+from ntt_autogen.utils import Metrics
+
+
+def test_metrics_sum_phases_and_counters() -> None:
+    metrics = Metrics()
+
+    for index in range(3):
+        with metrics.Phase("render", f"output{index}.txt"):
+            metrics.Count("outputs.written")
+    metrics.Count("render.characters", 42)
+
+    report = metrics.Report()
+    assert report["phases"]["render"]["count"] == 3
+    assert report["phases"]["render"]["totalMs"] >= 0
+    assert report["counters"] == {"outputs.written": 3, "render.characters": 42}
+
+    metrics.Reset()
+    assert metrics.Report()["phases"] == {}
+    assert metrics.Report()["counters"] == {}
+
+
+def test_metrics_merge_worker_data() -> None:
+    parent = Metrics()
+    worker = Metrics()
+
+    with parent.Phase("parse"):
+        parent.Count("parse.runs")
+    with worker.Phase("parse"):
+        worker.Count("parse.runs", 2)
+
+    parent.Merge(worker.Take())
+
+    report = parent.Report()
+    assert report["phases"]["parse"]["count"] == 2
+    assert report["counters"] == {"parse.runs": 3}
+    assert worker.Report()["counters"] == {}, "Taken data should not be sent twice."
+
+
+def test_metrics_write_trace(fs: FakeFilesystem) -> None:
+    metrics = Metrics(trace=True)
+    with metrics.Phase("entry", "template:a.txt.in"):
+        metrics.Count("templates.generated")
+
+    metrics.WriteTrace("/reports/trace.json")
+
+    with open("/reports/trace.json", "r") as f:
+        events = json.load(f)["traceEvents"]
+
+    assert events[0]["name"] == "entry"
+    assert events[0]["ph"] == "X"
+    assert events[0]["args"] == {"detail": "template:a.txt.in"}
+    assert events[1]["ph"] == "C"
+    assert events[1]["args"] == {"templates.generated": 1}
+
+
+def test_metrics_trace_events_only_when_tracing() -> None:
+    metrics = Metrics()
+    for index in range(3):
+        with metrics.Phase("render", f"output{index}.txt"):
+            pass
+
+    data = metrics.Take()
+    assert data.phases["render"][0] == 3
+    assert data.events == [], "The trace events should not pile up when not tracing."
+
+    metrics.Reset(trace=True)
+    with metrics.Phase("render", "output.txt"):
+        pass
+    assert len(metrics.Take().events) == 1
+
+    metrics.Reset()
+    with metrics.Phase("render", "output.txt"):
+        pass
+    assert metrics.Take().events == []
@@ -0,0 +1,84 @@
+import os
+import pytest  # type: ignore
+from typing import Iterator
+from pathlib import Path
+from pyfakefs.fake_filesystem import FakeFilesystem
+from ntt_autogen.utils import OutputWriter, IOPool
+
+
+def test_write_outputs_feeds_all_outputs(fs: FakeFilesystem) -> None:
+    content = OutputWriter().Write(
+        iter(["Hello", ", ", "World"]),
+        ["/project/a.txt", "/project/generated/b.txt"],
+    )
+
+    assert content is None
+    for outputPath in ("/project/a.txt", "/project/generated/b.txt"):
+        with open(outputPath, "r") as f:
+            assert f.read() == "Hello, World"
+
+
+def test_write_outputs_keeps_content(fs: FakeFilesystem) -> None:
+    content = OutputWriter().Write(
+        iter(["Hello", "World"]), ["/a.txt"], keepContent=True
+    )
+
+    assert content == "HelloWorld"
+
+
+def test_write_outputs_failure_keeps_previous_output(fs: FakeFilesystem) -> None:
+    fs.create_file("/project/a.txt", contents="previous")  # type: ignore
+
+    def _FailingChunks() -> Iterator[str]:
+        yield "partial"
+        raise ZeroDivisionError()
+
+    with pytest.raises(ZeroDivisionError):
+        OutputWriter().Write(_FailingChunks(), ["/project/a.txt"])
+
+    with open("/project/a.txt", "r") as f:
+        assert f.read() == "previous"
+    assert os.listdir("/project") == ["a.txt"]
+
+
+def test_write_outputs_keeps_unchanged_outputs(fs: FakeFilesystem) -> None:
+    fs.create_file("/project/same.txt", contents="Hello")  # type: ignore
+    fs.create_file("/project/sameSize.txt", contents="World")  # type: ignore
+    os.utime("/project/same.txt", ns=(0, 0))
+    os.utime("/project/sameSize.txt", ns=(0, 0))
+
+    writer = OutputWriter()
+    writer.Write(
+        iter(["Hel", "lo"]),
+        ["/project/same.txt", "/project/sameSize.txt", "/project/new.txt"],
+    )
+
+    assert (writer.written, writer.unchanged) == (2, 1)
+    assert os.stat("/project/same.txt").st_mtime_ns == 0
+    assert os.stat("/project/sameSize.txt").st_mtime_ns != 0
+    with open("/project/sameSize.txt", "r") as f:
+        assert f.read() == "Hello"
+    assert sorted(os.listdir("/project")) == ["new.txt", "same.txt", "sameSize.txt"]
+
+
+def test_write_outputs_in_io_pool(tmp_path: Path) -> None:
+    (tmp_path / "same.txt").write_text("Hello")
+    (tmp_path / "folder").mkdir()
+    (tmp_path / "folder" / "file.txt").write_text("")
+
+    with IOPool(2) as ioPool:
+        writer = OutputWriter(ioPool)
+        writer.Write(iter(["Hel", "lo"]), [str(tmp_path / "same.txt")])
+        writer.Write(iter(["World"]), [str(tmp_path / "folder")])
+        writer.Write(iter(["World"]), [str(tmp_path / "new.txt")])
+
+        # the outputs are only counted once waited for
+        assert (writer.written, writer.unchanged) == (0, 0)
+        with pytest.raises(OSError):
+            writer.Flush()
+
+    # the failed output does not prevent the next ones
+    assert (writer.written, writer.unchanged) == (1, 1)
+    assert (tmp_path / "new.txt").read_text() == "World"
+    assert (tmp_path / "folder").is_dir()
+    assert sorted(os.listdir(tmp_path)) == ["folder", "new.txt", "same.txt"]